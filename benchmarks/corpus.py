@@ -0,0 +1,209 @@
+"""
+Deterministic synthetic job descriptions for the extraction benchmarks.
+
+Three flavours mirror what the spiders hand to the pipeline:
+- linkedin: plain text joined from the description's text nodes
+- glassdoor: the JobDescriptionContainer HTML block
+- wwr: the HTML body of a We Work Remotely RSS item
+
+The text deliberately mixes in the hard cases of scraper_service.utils:
+C++/C#/.NET, Java vs JavaScript, negated skills, money next to "users" or
+"hours", period suffixes, and "reporting to" seniority mentions.
+"""
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT / 'scraper_service') not in sys.path:
+    sys.path.insert(0, str(ROOT / 'scraper_service'))
+
+from scraper_service.constants import TECH_KEYWORDS  # noqa: E402
+
+FLAVOURS = ('linkedin', 'glassdoor', 'wwr')
+
+TITLES = [
+    "Senior Python Developer", "Backend Engineer", "Lead Data Engineer", "Junior Frontend Developer",
+    "Staff Engineer, Platform", "Sr. DevOps Engineer", "Mid-Level Full Stack Developer",
+    "Software Engineer", "Machine Learning Engineer", "Head of Engineering", "Graduate Software Engineer",
+    "Principal Architect", "Jr. QA Automation Engineer", "Engineering Manager", "iOS Developer",
+    "Intern - Data Science", "Associate Cloud Engineer", "Entry-Level Support Engineer", "Medior Java Developer",
+]
+
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech",
+    "Vandelay Industries", "Soylent", "Cyberdyne Systems", "Tyrell Corp", "Aperture Science",
+]
+
+INTROS = [
+    "{company} is a fast-growing startup trusted by 250,000 users in 40 countries.",
+    "At {company} we build tools that help 3,500 customers ship software faster.",
+    "{company} is hiring! Our team of 120 people works remotely across 12 time zones.",
+    "Join {company}, a profitable SaaS company serving 1.2k enterprise clients.",
+    "We process 10,000 requests per second and handle 5 million downloads a month.",
+]
+
+REQUIREMENTS = [
+    "{n}+ years of professional experience with {skill}.",
+    "Strong knowledge of {skill} and {skill2}.",
+    "Hands-on experience building services in {skill}, ideally with {skill2}.",
+    "You have shipped production systems using {skill}.",
+    "Deep understanding of {skill}; familiarity with {skill2} and {skill3}.",
+    "Comfortable working with {skill} on a daily basis.",
+    "Experience with {skill} or {skill2} (we use both).",
+]
+
+NEGATED = [
+    "No experience with {skill} required - we will teach you.",
+    "Knowledge of {skill} is a plus.",
+    "{skill} is not mandatory.",
+    "Exposure to {skill} would be an asset.",
+    "You don't need {skill} experience to apply.",
+    "{skill} experience is desirable but not essential.",
+    "Familiarity with {skill} is advantageous.",
+]
+
+SALARIES = [
+    "Salary: ${lo}k - ${hi}k per year.",
+    "Compensation: ${lo},000 - ${hi},000 + equity.",
+    "The base salary range is €{lo},000–€{hi},000 annually.",
+    "We pay £{mo},000 per month.",
+    "Hourly rate: ${hr}/hr depending on experience.",
+    "Daily rate of €{day} per day for contractors.",
+    "OTE up to {hi}k.",
+    "Pay: {lo}-{hi}k AUD plus super.",
+    "Package: {lo}k to {hi}k CAD.",
+    "Monthly gross salary of {mo},500 BGN.",
+    "You will join a team of {n} engineers and work {hr} hours per week.",
+]
+
+SENIORITY_LINES = [
+    "You will be reporting to the Senior Engineering Manager.",
+    "This role reports to the Head of Product.",
+    "You'll be supervised by a principal engineer during onboarding.",
+    "We are looking for an experienced engineer to own our platform.",
+    "This is an entry-level position with mentoring from senior staff.",
+    "Ideal for a mid-level developer looking to grow.",
+    "You will mentor junior developers and interns.",
+    "As a lead, you will set technical direction.",
+    "Perfect for a graduate or apprentice.",
+    "An intermediate level of English is required.",
+]
+
+FILLER = [
+    "We value ownership, clear writing and kindness.",
+    "You will collaborate with product, design and customer success.",
+    "Our stack runs in the cloud and we deploy many times a day.",
+    "We offer flexible hours, a home-office budget and 30 days of paid leave.",
+    "Our interview process has three steps and takes about two weeks.",
+    "We care about code review, testing and observability.",
+    "You will help shape our engineering culture and hiring process.",
+    "Benefits include private health insurance and a yearly learning budget of $2,000.",
+]
+
+# "Posted" labels as each source shows them (LinkedIn cards, Glassdoor badges, RSS pubDate)
+POSTED = {
+    'linkedin': ["Just now", "{n} minutes ago", "{n} hours ago", "1 day ago", "{n} days ago", "1 week ago",
+                 "{n} weeks ago", "1 month ago", "Reposted {n} weeks ago", "30+ days ago"],
+    'glassdoor': ["24h", "{n}d", "30d+", "Today", "{n} days ago"],
+    'wwr': ["Mon, 0{n} Oct 2025 14:00:00 +0000", "Fri, 1{n} Sep 2025 09:30:00 +0000"],
+}
+
+# Phrases around the keyword list that trip naive matchers
+TRICKY = [
+    "Our frontend is JavaScript (not Java) and TypeScript.",
+    "Experience with C++ or C# is helpful; we also use .NET Core and ASP.NET.",
+    "Our apps are written in React Native, and the web uses Next.js with Node.js.",
+    "We run CI/CD on GitHub Actions and GitLab CI.",
+    "Data lives in PostgreSQL, SQL Server and a bit of SQLite.",
+    "Go, Rust and R are used by different teams.",
+    "Scikit-learn, Pandas and NumPy power our analytics; Power BI for dashboards.",
+    "Ruby on Rails monolith, moving to microservices on Kubernetes.",
+]
+
+
+def _skill(rng):
+    return rng.choice(TECH_KEYWORDS)
+
+
+def _sentence(rng, templates, company):
+    return rng.choice(templates).format(
+        company=company, skill=_skill(rng), skill2=_skill(rng), skill3=_skill(rng),
+        n=rng.randint(1, 8), lo=rng.randint(40, 150), hi=rng.randint(150, 250),
+        mo=rng.randint(2, 9), hr=rng.randint(20, 120), day=rng.randint(200, 900),
+    )
+
+
+def _paragraphs(rng, company, target_size, skill_density):
+    size, paragraphs = 0, []
+    while size < target_size:
+        sentences = []
+        for _ in range(rng.randint(3, 7)):
+            roll = rng.random()
+            if roll < skill_density:
+                templates = NEGATED if rng.random() < 0.2 else REQUIREMENTS
+            elif roll < skill_density + 0.08:
+                templates = SALARIES
+            elif roll < skill_density + 0.16:
+                templates = SENIORITY_LINES
+            elif roll < skill_density + 0.22:
+                templates = TRICKY
+            elif roll < skill_density + 0.27:
+                templates = INTROS
+            else:
+                templates = FILLER
+            sentences.append(_sentence(rng, templates, company))
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 1
+    return paragraphs
+
+
+def _render(rng, flavour, paragraphs):
+    if flavour == 'linkedin':
+        return "\n".join(paragraphs)
+
+    if flavour == 'glassdoor':
+        parts = ['<div id="JobDescriptionContainer" class="jobDescriptionContent desc">']
+        for paragraph in paragraphs:
+            if rng.random() < 0.4:
+                items = "".join(f"<li>{s.strip()}.</li>" for s in paragraph.split(". ") if s.strip())
+                parts.append(f"<ul>{items}</ul>")
+            else:
+                parts.append(f"<p>{paragraph}</p>")
+        parts.append("</div>")
+        return "".join(parts)
+
+    # wwr
+    parts = [f"<p><strong>Headquarters:</strong> {rng.choice(['Remote', 'Berlin', 'New York'])}<br />"
+             f"<strong>URL:</strong> <a href=\"https://example.com\">https://example.com</a></p>"]
+    for paragraph in paragraphs:
+        parts.append(f"<p>{paragraph}</p><br />")
+    return "\n".join(parts)
+
+
+def make_job(rng, flavour=None, target_size=3000, skill_density=0.35):
+    """One job as a dict with title, company, description and the raw "posted" label."""
+    flavour = flavour or rng.choice(FLAVOURS)
+    company = rng.choice(COMPANIES)
+    paragraphs = _paragraphs(rng, company, target_size, skill_density)
+    return {
+        'flavour': flavour,
+        'title': rng.choice(TITLES),
+        'company': company,
+        'description': _render(rng, flavour, paragraphs),
+        'posted': rng.choice(POSTED[flavour]).format(n=rng.randint(2, 9)),
+    }
+
+
+def make_corpus(count=3000, seed=42, target_size=None, skill_density=0.35):
+    """
+    `count` jobs across all flavours. Sizes follow a long tail (0.3 KB - 20 KB)
+    unless `target_size` pins them.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for index in range(count):
+        size = target_size or int(min(20000, max(300, rng.lognormvariate(8.0, 0.8))))
+        jobs.append(make_job(rng, FLAVOURS[index % len(FLAVOURS)], size, skill_density))
+    return jobs
@@ -0,0 +1,110 @@
+"""
+Requests per second of one worker on /api/jobs/ pages (20 jobs): the .values() +
+orjson fast path vs ModelSerializer + DRF's JSONRenderer.
+
+Inserts --rows synthetic jobs inside a transaction that is rolled back at the
+end, then calls JobListAPI in a loop for --seconds per mode, one request at a
+time like a sync gunicorn worker. Throttles and the response cache are off, so
+every request builds its page. Also checks that both modes return the same bytes.
+
+    docker compose run --rm web python benchmarks/fast_serialization.py
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from jobs.views import JobListAPI  # noqa: E402
+
+BENCH_URL = "https://bench.invalid/"
+
+SYNTHETIC_JOBS_SQL = """
+INSERT INTO jobs_job (title, company, location, url, source, posted_at, created_at,
+                      description, description_snippet, skills, seniority, salary_min, salary_max,
+                      currency, content_hash)
+SELECT
+    'Senior Python Developer ' || i,
+    'Company ' || substr(md5(i::text), 1, 8),
+    'Berlin, Germany',
+    %s || i,
+    'LinkedIn',
+    current_date - (i %% 30),
+    now() - (i || ' minutes')::interval,
+    '',
+    'We are looking for a senior engineer to build and run our data platform on Python, Django and '
+        || 'PostgreSQL. You will own services end to end, from design to on-call.',
+    '["Python", "Django", "PostgreSQL", "Docker", "AWS", "Kubernetes"]'::jsonb,
+    'Senior',
+    60000 + i %% 40000,
+    90000 + i %% 40000,
+    'EUR',
+    ''
+FROM generate_series(1, %s) AS i
+"""
+
+CASES = {
+    'page 1': {},
+    'page 20': {'page': 20},
+    'search': {'search': "python developer"},
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def requests_per_second(view, params, seconds):
+    factory = APIRequestFactory()
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        view(factory.get("/api/jobs/", params, HTTP_ACCEPT="application/json")).render()
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    fast = JobListAPI.as_view(throttle_classes=[], fast_serialization=True)
+    stock = JobListAPI.as_view(throttle_classes=[], fast_serialization=False)
+    factory = APIRequestFactory()
+
+    try:
+        with transaction.atomic(), override_settings(RESPONSE_CACHE_TTL=0):
+            with connection.cursor() as cursor:
+                cursor.execute(SYNTHETIC_JOBS_SQL, [BENCH_URL, args.rows])
+                cursor.execute("ANALYZE jobs_job")
+            print(f"Inserted {args.rows} synthetic jobs")
+
+            print(f"{'case':<8} {'serializer req/s':>17} {'fast req/s':>11} {'speedup':>8}")
+            for label, params in CASES.items():
+                request = factory.get("/api/jobs/", params, HTTP_ACCEPT="application/json")
+                same = fast(request).render().content == stock(request).render().content
+                before = requests_per_second(stock, params, args.seconds)
+                after = requests_per_second(fast, params, args.seconds)
+                print(f"{label:<8} {before:>17.0f} {after:>11.0f} {after / before:>7.1f}x"
+                      f"{'' if same else '  OUTPUT DIFFERS'}")
+            raise Rollback
+    except Rollback:
+        print("Rolled back the synthetic jobs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+JobFilter on a synthetic jobs_job of --rows rows: indexed plans vs sequential scans.
+
+Inserts the rows inside a transaction that is rolled back at the end, so the
+table is left as it was. Then, for each filter, runs the queryset JobFilter
+builds (count + first page, as the API does):
+- with the trigram / prefix indexes of migration 0009;
+- with index scans disabled, i.e. the sequential scan every filter did before.
+
+Prints the median time of both and the indexes the planner picked. Needs the
+Postgres database from docker-compose:
+
+    docker compose run --rm web python benchmarks/filter_indexes.py --rows 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+
+from jobs.filters import JobFilter  # noqa: E402
+from jobs.models import Job  # noqa: E402
+
+BENCH_URL = "https://bench.invalid/"
+
+SYNTHETIC_JOBS_SQL = """
+INSERT INTO jobs_job (title, company, location, url, source, posted_at, created_at,
+                      description, description_snippet, skills, seniority, content_hash)
+SELECT
+    (ARRAY['Senior', 'Junior', 'Lead', 'Staff', 'Principal', ''])[1 + i %% 6] || ' '
+        || (ARRAY['Python', 'Java', 'Go', 'Rust', 'Data', 'Frontend', 'Backend', 'DevOps', 'ML', 'Mobile'])[1 + (i / 7) %% 10]
+        || ' ' || (ARRAY['Engineer', 'Developer', 'Architect', 'Analyst', 'Scientist'])[1 + (i / 3) %% 5],
+    'Company ' || substr(md5(i::text), 1, 8),
+    (ARRAY['Remote', 'Berlin, Germany', 'London, UK', 'New York, NY', 'Sofia, Bulgaria',
+           'Amsterdam, Netherlands', 'Toronto, Canada', 'Austin, TX'])[1 + (i / 11) %% 8],
+    %s || i,
+    (ARRAY['LinkedIn', 'Glassdoor', 'Indeed', 'WeWorkRemotely', 'RemoteOK', 'TheMuse', 'PyJobs'])[1 + i %% 7],
+    current_date - (i %% 30),
+    now(),
+    '',
+    '',
+    '[]'::jsonb,
+    (ARRAY['Senior', 'Mid-Level', 'Junior', 'Lead', 'Not Specified'])[1 + (i / 5) %% 5],
+    ''
+FROM generate_series(1, %s) AS i
+"""
+
+# label -> JobFilter query parameters
+CASES = {
+    'company, 1 row': {'company': 'c4ca4238'},  # md5('1')
+    'company, ~0.4%': {'company': 'ny 00'},
+    'title, ~10%': {'title': 'rust'},
+    'location, ~12%': {'location': 'sofia'},
+    'source prefix, ~14%': {'source': 'linked'},
+    'seniority prefix, ~20%': {'seniority': 'lead'},
+    'title + location': {'title': 'rust', 'location': 'sofia'},
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def filtered(params):
+    return JobFilter(data=params, queryset=Job.objects.order_by('-posted_at')).qs
+
+
+def time_page(params, repeat):
+    """Median seconds for count() + the first page of 20, like a paginated API call."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        queryset = filtered(params)
+        queryset.count()
+        list(queryset[:20])
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def indexes_used(params):
+    """Indexes in the plans of the count (no ORDER BY) and of the first page."""
+    queryset = filtered(params)
+    names = []
+    for plan in (queryset.order_by().explain(), queryset[:20].explain()):
+        names += [word for word in plan.split() if word.startswith('jobs_job_') and word not in names]
+    return ", ".join(names) or "seq scan"
+
+
+def set_index_scans(enabled):
+    value = 'on' if enabled else 'off'
+    with connection.cursor() as cursor:
+        for setting in ('enable_indexscan', 'enable_bitmapscan', 'enable_indexonlyscan'):
+            cursor.execute(f"SET LOCAL {setting} = {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(SYNTHETIC_JOBS_SQL, [BENCH_URL, args.rows])
+                cursor.execute("ANALYZE jobs_job")
+            print(f"Inserted {args.rows} synthetic jobs in {time.perf_counter() - started:.0f}s")
+
+            print(f"{'filter':<24} {'rows':>8} {'indexed ms':>11} {'seq ms':>9} {'speedup':>8}  indexes")
+            for label, params in CASES.items():
+                set_index_scans(True)
+                rows = filtered(params).count()
+                indexed = time_page(params, args.repeat)
+                index = indexes_used(params)
+                set_index_scans(False)
+                sequential = time_page(params, args.repeat)
+                print(f"{label:<24} {rows:>8} {indexed * 1000:>11.1f} {sequential * 1000:>9.1f} "
+                      f"{sequential / indexed:>7.1f}x  {index}")
+            raise Rollback
+    except Rollback:
+        print("Rolled back the synthetic jobs")
+
+
+if __name__ == '__main__':
+    main()
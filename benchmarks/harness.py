@@ -0,0 +1,60 @@
+"""
+Small helpers shared by the extractor benchmarks: timing and oracle checks.
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT / 'scraper_service') not in sys.path:
+    sys.path.insert(0, str(ROOT / 'scraper_service'))
+
+
+def job_text(job):
+    """The string the pipeline scans: f"{title} {company} {description}"."""
+    return f"{job['title']} {job['company']} {job['description']}"
+
+
+def time_per_call(func, args_list, repeat=3):
+    """
+    Best-of-`repeat` wall time in seconds for each call, in input order,
+    plus the outputs of the first round.
+    """
+    timings = [float('inf')] * len(args_list)
+    outputs = []
+    for round_index in range(repeat):
+        for index, args in enumerate(args_list):
+            started = time.perf_counter()
+            output = func(*args)
+            timings[index] = min(timings[index], time.perf_counter() - started)
+            if round_index == 0:
+                outputs.append(output)
+    return timings, outputs
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def compare(label, reference_func, func, args_list, repeat=3, normalize=lambda value: value, megabytes=None):
+    """
+    Times `func` against `reference_func` on the same inputs, prints both
+    (plus MB/s when the input size is given) and returns (speedup, mismatch_count).
+    """
+    before, expected = time_per_call(reference_func, args_list, repeat)
+    after, actual = time_per_call(func, args_list, repeat)
+    bad = sum(1 for old, new in zip(expected, actual) if normalize(old) != normalize(new))
+
+    per_doc = 1000 / len(args_list)
+    speedup = sum(before) / sum(after) if sum(after) else float('inf')
+    print(
+        f"{label:<24} before {sum(before) * per_doc:8.3f} ms/doc   after {sum(after) * per_doc:8.3f} ms/doc   "
+        f"x{speedup:5.1f}   {bad} mismatches / {len(args_list)}"
+    )
+    if megabytes:
+        print(f"{'':<24} {megabytes:.2f} MB: before {megabytes / sum(before):6.2f} MB/s   "
+              f"after {megabytes / sum(after):6.2f} MB/s")
+    return speedup, bad
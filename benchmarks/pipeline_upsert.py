@@ -0,0 +1,103 @@
+"""
+Per-item vs buffered upserts in ScraperServicePipeline.
+
+Feeds N synthetic jobs through the real pipeline three times with each mode
+(insert, update with new content, unchanged re-scrape) and deletes them afterwards.
+Needs the Postgres database from docker-compose:
+
+    docker compose run --rm web python benchmarks/pipeline_upsert.py --items 1000 --workers 2
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / 'scraper_service')]
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from jobs.models import Job  # noqa: E402
+from scraper_service.pipelines import ScraperServicePipeline  # noqa: E402
+
+BENCH_URL = "https://bench.invalid/"
+
+DESCRIPTION = (
+    "We are hiring a Senior Python Developer to build data pipelines with Django, "
+    "PostgreSQL and Docker on AWS. Salary: $120k - $150k per year. "
+    "Experience with Kubernetes is a plus. "
+) * 20
+
+
+class FakeSpider:
+    logger = logging.getLogger('benchmark')
+
+
+def make_items(run_id, count, revision=0):
+    return [
+        {
+            'url': f"{BENCH_URL}{run_id}/job/{i}",
+            'title': f"Senior Python Developer #{i}",
+            'company': f"Company {i % 50}",
+            'location': "Remote",
+            'source': "Benchmark",
+            'description': f"{DESCRIPTION} Revision {revision}.",
+        }
+        for i in range(count)
+    ]
+
+
+async def crawl(items, batch_size, workers):
+    """One simulated crawl: open, feed every item concurrently, close."""
+    pipeline = ScraperServicePipeline(batch_size=batch_size, analysis_workers=workers)
+    spider = FakeSpider()
+    pipeline.open_spider(spider)
+    await asyncio.gather(*(pipeline.process_item(item, spider) for item in items))
+    await pipeline.close_spider(spider)
+
+
+def measure(label, items, batch_size, workers):
+    started = time.perf_counter()
+    asyncio.run(crawl(items, batch_size, workers))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<20} {elapsed * 1000:10.1f} ms  {len(items) / elapsed:8.0f} items/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=0, help="ANALYSIS_WORKERS (0 = analyse in a thread)")
+    args = parser.parse_args()
+
+    single_run, bulk_run = uuid.uuid4().hex, uuid.uuid4().hex
+    single_items, single_edited = make_items(single_run, args.items), make_items(single_run, args.items, 1)
+    bulk_items, bulk_edited = make_items(bulk_run, args.items), make_items(bulk_run, args.items, 1)
+
+    print(f"{args.items} items, batch size {args.batch_size}, {args.workers} analysis workers")
+    try:
+        single_insert = measure("per-item insert", single_items, 0, args.workers)
+        single_update = measure("per-item update", single_edited, 0, args.workers)
+        single_same = measure("per-item unchanged", single_edited, 0, args.workers)
+        bulk_insert = measure("bulk insert", bulk_items, args.batch_size, args.workers)
+        bulk_update = measure("bulk update", bulk_edited, args.batch_size, args.workers)
+        bulk_same = measure("bulk unchanged", bulk_edited, args.batch_size, args.workers)
+    finally:
+        Job.objects.filter(url__startswith=BENCH_URL).delete()
+
+    print(
+        f"speedup: insert x{single_insert / bulk_insert:.1f}, update x{single_update / bulk_update:.1f}, "
+        f"unchanged x{single_same / bulk_same:.1f}"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+AdaptiveThrottle against a local stub server that rate-limits like a job board.
+
+The stub answers GET /page/N after --latency seconds and allows --rate requests
+per second. Above that it answers 429 with "Retry-After: --retry-after". A
+spider then crawls --pages pages through it with the project's throttle
+settings and this domain's profile (--concurrency, --delay). No network, no
+database: the pipeline and the DB-backed middlewares are switched off.
+
+Reports the throughput, the share of 429s and the largest delay the throttle
+reached. Exits non-zero if more than --max-429-share of the responses were 429s,
+or if a page was never scraped.
+
+    python benchmarks/rate_limit_stub.py --rate 5 --concurrency 4 --delay 0.1
+    python benchmarks/rate_limit_stub.py --rate 5 --concurrency 4 --delay 0.1 --no-throttle
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / 'scraper_service')]
+os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'scraper_service.settings')
+
+import scrapy  # noqa: E402
+from scrapy.crawler import CrawlerProcess  # noqa: E402
+from scrapy.utils.project import get_project_settings  # noqa: E402
+
+
+class RateLimitedServer(ThreadingHTTPServer):
+    """Sliding one-second window of accepted requests, shared by every handler thread."""
+    daemon_threads = True
+
+    def __init__(self, address, rate, latency, retry_after):
+        super().__init__(address, StubHandler)
+        self.rate, self.latency, self.retry_after = rate, latency, retry_after
+        self.accepted = []
+        self.lock = threading.Lock()
+
+    def allow(self):
+        now = time.monotonic()
+        with self.lock:
+            self.accepted = [t for t in self.accepted if now - t < 1.0]
+            if len(self.accepted) >= self.rate:
+                return False
+            self.accepted.append(now)
+            return True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if not self.server.allow():
+            self.send_response(429)
+            self.send_header('Retry-After', str(self.server.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        time.sleep(self.server.latency)
+        body = f"<html><h1>{self.path}</h1></html>".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubSpider(scrapy.Spider):
+    name = "rate_limit_stub"
+
+    def __init__(self, base_url, pages, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.base_url, self.pages = base_url, pages
+        self.scraped = set()
+
+    async def start(self):
+        for page in range(self.pages):
+            yield scrapy.Request(f"{self.base_url}/page/{page}", callback=self.parse, cb_kwargs={'page': page})
+
+    def parse(self, response, page):
+        self.scraped.add(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--rate', type=float, default=5, help="requests per second the stub allows")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the stub takes per page")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=4, help="profile concurrency of the stub domain")
+    parser.add_argument('--delay', type=float, default=0.1, help="profile delay (the throttle's floor)")
+    parser.add_argument('--recovery', type=float, help="THROTTLE_RECOVERY (default: the project's)")
+    parser.add_argument('--no-throttle', action='store_true', help="fixed profile, no feedback or backoff")
+    parser.add_argument('--max-429-share', type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = RateLimitedServer(('127.0.0.1', 0), args.rate, args.latency, args.retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+
+    settings = get_project_settings()
+    settings.setdict({
+        'DOWNLOAD_SLOTS': {host: {'concurrency': args.concurrency, 'delay': args.delay}},
+        'THROTTLE_ENABLED': not args.no_throttle,
+        # Plain HTTP to localhost: no impersonation, no database
+        'DOWNLOAD_HANDLERS': {},
+        'ITEM_PIPELINES': {},
+        'DOWNLOADER_MIDDLEWARES': {
+            'scraper_service.middlewares.KnownJobMiddleware': None,
+            'scraper_service.middlewares.ConditionalFeedMiddleware': None,
+        },
+        'RETRY_TIMES': 20,
+        'LOG_LEVEL': 'ERROR',
+    }, priority='cmdline')
+    if args.recovery is not None:
+        settings.set('THROTTLE_RECOVERY', args.recovery, priority='cmdline')
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(StubSpider)
+    started = time.monotonic()
+    process.crawl(crawler, base_url=f"http://{host}:{port}", pages=args.pages)
+    process.start()
+    elapsed = time.monotonic() - started
+    server.shutdown()
+
+    stats = crawler.stats.get_stats()
+    ok = stats.get('downloader/response_status_count/200', 0)
+    limited = stats.get('downloader/response_status_count/429', 0)
+    share = limited / max(ok + limited, 1)
+    max_delay = stats.get(f'throttle/max_delay/{host}', args.delay)
+    scraped = len(crawler.spider.scraped)
+
+    print(f"{'throttle' if not args.no_throttle else 'fixed profile'}: {scraped}/{args.pages} pages "
+          f"in {elapsed:.1f}s ({scraped / elapsed:.1f} pages/s, stub allows {args.rate:g}/s)")
+    print(f"429s: {limited} ({share:.0%} of responses), largest delay {max_delay:.2f}s")
+
+    if scraped < args.pages:
+        sys.exit(f"{args.pages - scraped} pages were never scraped")
+    if share > args.max_429_share:
+        sys.exit(f"{share:.0%} of the responses were 429s (allowed {args.max_429_share:.0%})")
+
+
+if __name__ == '__main__':
+    main()
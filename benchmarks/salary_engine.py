@@ -0,0 +1,45 @@
+"""
+parse_salary: compiled salary engine vs the original per-call patterns.
+
+Checks that the engine returns exactly the reference (min, max, currency) on the
+golden corpus, then reports throughput in MB of description text per second
+on the long-tail corpus and on ~10 KB descriptions. Exits non-zero on any
+mismatch or if the speedup is below --min-speedup.
+
+    python benchmarks/salary_engine.py --golden 2000 --min-speedup 2
+"""
+import argparse
+import sys
+
+import corpus
+import reference
+from harness import compare, job_text
+
+from scraper_service.utils import parse_salary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--golden', type=int, default=2000, help="jobs in the equivalence corpus")
+    parser.add_argument('--docs', type=int, default=200, help="10 KB jobs to time")
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--min-speedup', type=float, default=2.0)
+    args = parser.parse_args()
+
+    golden = [(job_text(job),) for job in corpus.make_corpus(args.golden, seed=11)]
+    sized = [(job_text(job),) for job in corpus.make_corpus(args.docs, seed=2, target_size=args.size)]
+
+    bad_total, speedup = 0, None
+    for label, args_list in (("golden corpus", golden), (f"{args.size // 1000} KB descriptions", sized)):
+        megabytes = sum(len(text.encode()) for text, in args_list) / 1e6
+        speedup, bad = compare(label, reference.parse_salary, parse_salary, args_list, 3, megabytes=megabytes)
+        bad_total += bad
+
+    if bad_total:
+        sys.exit("parse_salary output differs from the reference")
+    if speedup < args.min_speedup:
+        sys.exit(f"speedup x{speedup:.1f} is below x{args.min_speedup}")
+
+
+if __name__ == '__main__':
+    main()
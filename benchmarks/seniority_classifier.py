@@ -0,0 +1,53 @@
+"""
+extract_seniority: combined-alternation classifier vs the original per-pattern loop.
+
+Checks that the classifier returns exactly the reference level on the golden
+corpus, then times both on ~10 KB descriptions with the title left out, so the
+description scan (and its "reporting to" check) always runs. Most of those
+mention a Lead keyword, where the old loop stops after its first pattern, so
+they are timed once more with the Lead keywords rewritten: the case where the
+old loop runs every pattern over the whole text. Exits non-zero on any
+mismatch or if that worst-case speedup is below --min-speedup.
+
+    python benchmarks/seniority_classifier.py --docs 200 --min-speedup 3
+"""
+import argparse
+import re
+import sys
+
+import corpus
+import reference
+from harness import compare
+
+from scraper_service.constants import SENIORITY_MAP
+from scraper_service.utils import extract_seniority
+
+LEAD_KEYWORDS = re.compile(r'\b(?:' + '|'.join(SENIORITY_MAP['Lead']) + r')\b', re.IGNORECASE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--golden', type=int, default=2000, help="jobs in the equivalence corpus")
+    parser.add_argument('--docs', type=int, default=200, help="10 KB jobs to time")
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--min-speedup', type=float, default=3.0)
+    args = parser.parse_args()
+
+    golden = [(job['title'], job['description']) for job in corpus.make_corpus(args.golden, seed=13)]
+    untitled = [("", job['description']) for job in corpus.make_corpus(args.docs, seed=3, target_size=args.size)]
+    no_lead = [("", LEAD_KEYWORDS.sub("owner", description)) for _, description in untitled]
+
+    _, bad_golden = compare("golden corpus", reference.extract_seniority, extract_seniority, golden, 1)
+    _, bad_untitled = compare(f"{args.size // 1000} KB, no title", reference.extract_seniority,
+                              extract_seniority, untitled, 3)
+    speedup, bad_no_lead = compare(f"{args.size // 1000} KB, no Lead words", reference.extract_seniority,
+                                   extract_seniority, no_lead, 3)
+
+    if bad_golden or bad_untitled or bad_no_lead:
+        sys.exit("extract_seniority output differs from the reference")
+    if speedup < args.min_speedup:
+        sys.exit(f"speedup x{speedup:.1f} is below x{args.min_speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+extract_skills: single-pass matcher vs the original per-skill regex loop.
+
+Checks that the new matcher returns exactly the reference skills on the golden
+corpus, then times both on ~10 KB descriptions and on skill-dense ones (most
+sentences name skills, many of them negated), where the negation check dominates
+the per-hit work. Exits non-zero on any mismatch or if the speedup is below --min-speedup.
+
+    python benchmarks/skill_matcher.py --docs 100 --min-speedup 10
+"""
+import argparse
+import sys
+
+import corpus
+import reference
+from harness import compare, job_text
+
+from scraper_service.utils import extract_skills
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--golden', type=int, default=1000, help="jobs in the equivalence corpus")
+    parser.add_argument('--docs', type=int, default=100, help="10 KB jobs to time")
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--dense', type=float, default=0.8, help="share of skill sentences in the dense corpus")
+    parser.add_argument('--min-speedup', type=float, default=10.0)
+    args = parser.parse_args()
+
+    # The original returns list(set()), so skill order is arbitrary: compare sorted
+    golden = [(job_text(job),) for job in corpus.make_corpus(args.golden, seed=7)]
+    sized = [(job_text(job),) for job in corpus.make_corpus(args.docs, seed=1, target_size=args.size)]
+    dense = [(job_text(job),) for job in corpus.make_corpus(args.docs, seed=5, target_size=args.size,
+                                                           skill_density=args.dense)]
+
+    _, bad_golden = compare("golden corpus", reference.extract_skills, extract_skills, golden, 1, sorted)
+    speedup, bad_sized = compare(f"{args.size // 1000} KB descriptions", reference.extract_skills,
+                                 extract_skills, sized, 3, sorted)
+    _, bad_dense = compare("skill-dense descriptions", reference.extract_skills, extract_skills, dense, 3, sorted)
+
+    if bad_golden or bad_sized or bad_dense:
+        sys.exit("extract_skills output differs from the reference")
+    if speedup < args.min_speedup:
+        sys.exit(f"speedup x{speedup:.1f} is below x{args.min_speedup}")
+
+
+if __name__ == '__main__':
+    main()
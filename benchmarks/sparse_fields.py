@@ -0,0 +1,121 @@
+"""
+Payload size and latency of /api/jobs/ pages: full descriptions vs the default
+snippet vs a sparse fieldset.
+
+Inserts --rows synthetic jobs with HTML descriptions of --description-kb KB
+(Glassdoor / WWR postings are often 10-30 KB) inside a transaction that is
+rolled back at the end. Then requests pages of 20 and 50 jobs through
+JobListAPI, without throttles and without the response cache, for:
+- full: ?fields= every field, description included (what every page returned before);
+- default: no parameters, the description_snippet instead of the description;
+- sparse: ?fields=title,company,url,skills,salary_min,salary_max.
+
+Needs the Postgres database from docker-compose:
+
+    docker compose run --rm web python benchmarks/sparse_fields.py --rows 20000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from jobs.pagination import JobPageNumberPagination  # noqa: E402
+from jobs.serializers import JobSerializer  # noqa: E402
+from jobs.views import JobListAPI  # noqa: E402
+
+BENCH_URL = "https://bench.invalid/"
+
+SYNTHETIC_JOBS_SQL = """
+INSERT INTO jobs_job (title, company, location, url, source, posted_at, created_at,
+                      description, description_snippet, skills, seniority, content_hash)
+SELECT
+    'Senior Python Developer ' || i,
+    'Company ' || substr(md5(i::text), 1, 8),
+    'Remote',
+    %s || i,
+    'Glassdoor',
+    current_date - (i %% 30),
+    now(),
+    d.html,
+    left(regexp_replace(d.html, '<[^>]+>', ' ', 'g'), 280),
+    '["Python", "Django", "PostgreSQL", "Docker", "AWS"]'::jsonb,
+    'Senior',
+    ''
+FROM generate_series(1, %s) AS i,
+LATERAL (SELECT repeat('<p>We are looking for an engineer to build and run our data platform. '
+                       || i || '</p><ul><li>Python</li><li>Django</li></ul>', %s) AS html) AS d
+"""
+
+VARIANTS = {
+    'full': {'fields': ",".join(JobSerializer.Meta.fields)},
+    'default': {},
+    'sparse': {'fields': "title,company,url,skills,salary_min,salary_max"},
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def fetch(view, params, repeat):
+    """(median seconds, bytes) of one rendered page."""
+    factory = APIRequestFactory()
+    timings = []
+    for _ in range(repeat):
+        request = factory.get("/api/jobs/", params, HTTP_ACCEPT="application/json")
+        started = time.perf_counter()
+        response = view(request)
+        response.render()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--description-kb', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    view = JobListAPI.as_view(throttle_classes=[])
+    # ~120 bytes per repeat of the paragraph
+    repeats = args.description_kb * 1024 // 120
+
+    try:
+        with transaction.atomic(), override_settings(RESPONSE_CACHE_TTL=0):
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(SYNTHETIC_JOBS_SQL, [BENCH_URL, args.rows, repeats])
+                cursor.execute("ANALYZE jobs_job")
+            print(f"Inserted {args.rows} synthetic jobs ({args.description_kb} KB descriptions) "
+                  f"in {time.perf_counter() - started:.0f}s")
+
+            print(f"{'variant':<8} {'page':>5} {'KB':>9} {'ms':>8}")
+            # Clients can't pick a page size: 50 shows how the payload grows with a bigger page
+            for page_size in (20, 50):
+                for label, params in VARIANTS.items():
+                    with patch.object(JobPageNumberPagination, 'page_size', page_size):
+                        seconds, size = fetch(view, params, args.repeat)
+                    print(f"{label:<8} {page_size:>5} {size / 1024:>9.1f} {seconds * 1000:>8.1f}")
+            raise Rollback
+    except Rollback:
+        print("Rolled back the synthetic jobs")
+
+
+if __name__ == '__main__':
+    main()
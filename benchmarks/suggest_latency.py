@@ -0,0 +1,124 @@
+"""
+Latency of /api/suggest/ lookups: p50 / p99 per prefix length.
+
+Inserts --rows synthetic jobs (varied titles, companies and skills) inside a
+transaction that is rolled back at the end, builds the suggest index from
+them, then calls SuggestAPI (no throttles) --lookups times with prefixes of
+the indexed terms: 1 to 8 characters, as typed. Also times the index build
+and reports queries per lookup, which must be 0.
+
+    docker compose run --rm web python benchmarks/suggest_latency.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from jobs.suggest import SuggestIndex, rebuild_suggest_index, suggest_index  # noqa: E402
+from jobs.views import SuggestAPI  # noqa: E402
+
+BENCH_URL = "https://bench.invalid/"
+
+# Titles like "Senior Python Developer 17": a few thousand distinct ones, as in a real feed
+SYNTHETIC_JOBS_SQL = """
+INSERT INTO jobs_job (title, company, location, url, source, posted_at, created_at,
+                      description, description_snippet, skills, seniority, content_hash)
+SELECT
+    (ARRAY['Senior', 'Junior', 'Lead', 'Staff', 'Principal'])[1 + i %% 5] || ' '
+        || (ARRAY['Python', 'Java', 'Go', 'React', 'Data', 'DevOps', 'Backend', 'Frontend'])[1 + i %% 8] || ' '
+        || (ARRAY['Developer', 'Engineer', 'Architect', 'Consultant'])[1 + i %% 4] || ' ' || (i %% 97),
+    'Company ' || substr(md5((i %% 5000)::text), 1, 8),
+    'Remote',
+    %s || i,
+    'LinkedIn',
+    current_date,
+    now(),
+    '',
+    '',
+    jsonb_build_array(
+        (ARRAY['Python', 'Django', 'PostgreSQL', 'Docker', 'AWS', 'Kubernetes', 'React'])[1 + i %% 7],
+        (ARRAY['Go', 'Rust', 'Java', 'Kotlin', 'TypeScript', 'Terraform'])[1 + i %% 6],
+        'Skill ' || (i %% 700)
+    ),
+    'Senior',
+    ''
+FROM generate_series(1, %s) AS i
+"""
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(values, fraction):
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--lookups', type=int, default=20_000)
+    args = parser.parse_args()
+
+    view = SuggestAPI.as_view(throttle_classes=[])
+    factory = APIRequestFactory()
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(SYNTHETIC_JOBS_SQL, [BENCH_URL, args.rows])
+                cursor.execute("ANALYZE jobs_job")
+            print(f"Inserted {args.rows} synthetic jobs")
+
+            started = time.perf_counter()
+            stored = rebuild_suggest_index()
+            built = time.perf_counter()
+            SuggestIndex(stored['terms'])
+            print(f"Index: {len(stored['terms'])} terms, built from Postgres in {built - started:.2f}s, "
+                  f"loaded by a web process in {time.perf_counter() - built:.2f}s")
+
+            index = suggest_index()
+            random.seed(1)
+            texts = [term[1] for term in index.terms]
+            timings = {}
+            queries = 0
+            for _ in range(args.lookups):
+                text = random.choice(texts)
+                length = random.randint(1, 8)
+                prefix = text[:length]
+                request = factory.get("/api/suggest/", {'q': prefix}, HTTP_ACCEPT="application/json")
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    view(request).render()
+                    timings.setdefault(len(prefix), []).append(time.perf_counter() - started)
+                queries += len(captured)
+
+            print(f"{'prefix':>6} {'lookups':>8} {'p50 ms':>7} {'p99 ms':>7}")
+            for length, values in sorted(timings.items()):
+                print(f"{length:>6} {len(values):>8} {statistics.median(values) * 1000:>7.2f} "
+                      f"{percentile(values, 0.99) * 1000:>7.2f}")
+            every = [value for values in timings.values() for value in values]
+            print(f"{'all':>6} {len(every):>8} {statistics.median(every) * 1000:>7.2f} "
+                  f"{percentile(every, 0.99) * 1000:>7.2f}   queries: {queries}")
+            raise Rollback
+    except Rollback:
+        print("Rolled back the synthetic jobs")
+
+
+if __name__ == '__main__':
+    main()
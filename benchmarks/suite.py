@@ -0,0 +1,176 @@
+"""
+Offline benchmark suite for scraper_service.utils.
+
+Runs extract_skills, parse_salary, extract_seniority and parse_relative_date
+over a corpus of job postings: generated by corpus.py (LinkedIn plain text,
+Glassdoor and WWR HTML), or loaded with --corpus from a JSON list of
+{title, company, description, posted} objects. Then it:
+
+- checks every output against the golden outputs and fails on any drift
+  (--update-golden records them again after an intended behaviour change);
+- reports throughput (docs/s, MB/s) and p50 / p99 time per document;
+- with --baseline, fails when a function's throughput or p99 is more than
+  --max-regression worse than a run saved with --save-baseline.
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --save-baseline /tmp/before.json
+    python benchmarks/suite.py --baseline /tmp/before.json --max-regression 0.1
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+import corpus
+from harness import job_text, percentile, time_per_call
+
+from scraper_service.utils import extract_seniority, extract_skills, parse_relative_date, parse_salary
+
+GOLDEN_PATH = Path(__file__).resolve().parent / 'golden.json.gz'
+
+# name -> (function, job -> call arguments, output -> JSON-comparable value)
+EXTRACTORS = {
+    'extract_skills': (extract_skills, lambda job: (job_text(job),), sorted),
+    'parse_salary': (parse_salary, lambda job: (job_text(job),), list),
+    'extract_seniority': (extract_seniority, lambda job: (job['title'], job['description']), str),
+    # Stored as "days ago" so the golden file does not depend on the day it was recorded
+    'parse_relative_date': (parse_relative_date, lambda job: (job['posted'],),
+                            lambda posted: (date.today() - posted).days),
+}
+
+
+def load_corpus(args):
+    if args.corpus:
+        with open(args.corpus, encoding='utf-8') as f:
+            jobs = json.load(f)
+        fields = ('title', 'company', 'description', 'posted')
+        return [{field: job.get(field) or "" for field in fields} for job in jobs]
+    return corpus.make_corpus(args.count, seed=args.seed)
+
+
+def corpus_digest(jobs):
+    digest = hashlib.sha256()
+    for job in jobs:
+        for field in ('title', 'company', 'description', 'posted'):
+            digest.update(job[field].encode('utf-8') + b'\x1f')
+    return digest.hexdigest()
+
+
+def run(jobs, repeat):
+    """name -> (normalized outputs, per-document timings, MB of input text)"""
+    results = {}
+    for name, (func, make_args, normalize) in EXTRACTORS.items():
+        args_list = [make_args(job) for job in jobs]
+        timings, outputs = time_per_call(func, args_list, repeat)
+        megabytes = sum(len(arg.encode('utf-8')) for args in args_list for arg in args) / 1e6
+        results[name] = ([normalize(output) for output in outputs], timings, megabytes)
+    return results
+
+
+def summarize(timings, megabytes):
+    total = sum(timings)
+    return {
+        'docs_per_s': len(timings) / total,
+        'mb_per_s': megabytes / total,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+    }
+
+
+def check_golden(results, golden, digest):
+    """Prints the drift per function and returns the number of differing outputs."""
+    if golden['corpus_sha256'] != digest:
+        sys.exit("Golden outputs were recorded for a different corpus: rerun with --update-golden")
+
+    drifted = 0
+    for name, (outputs, _, _) in results.items():
+        expected = golden['outputs'][name]
+        bad = [index for index, (old, new) in enumerate(zip(expected, outputs)) if old != new]
+        drifted += len(bad)
+        for index in bad[:3]:
+            print(f"  {name} doc #{index}: expected {expected[index]!r}, got {outputs[index]!r}")
+        if len(bad) > 3:
+            print(f"  {name}: ... {len(bad) - 3} more")
+    return drifted
+
+
+def check_baseline(summary, baseline, max_regression):
+    """Returns the names of the functions slower than the baseline by more than max_regression."""
+    slower = []
+    for name, now in summary.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        throughput_drop = 1 - now['docs_per_s'] / before['docs_per_s']
+        p99_rise = now['p99_ms'] / before['p99_ms'] - 1
+        print(f"{name:<22} throughput {-throughput_drop:+7.1%}   p99 {p99_rise:+7.1%}")
+        if throughput_drop > max_regression or p99_rise > max_regression:
+            slower.append(name)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help="JSON list of jobs to use instead of the generated corpus")
+    parser.add_argument('--count', type=int, default=3000, help="generated jobs")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help="best-of-N timing per document")
+    parser.add_argument('--golden', default=str(GOLDEN_PATH))
+    parser.add_argument('--update-golden', action='store_true', help="record the current outputs as golden")
+    parser.add_argument('--baseline', help="timings saved by an earlier --save-baseline run")
+    parser.add_argument('--save-baseline', help="write this run's timings here")
+    parser.add_argument('--max-regression', type=float, default=0.15,
+                        help="allowed throughput drop / p99 rise against --baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    jobs = load_corpus(args)
+    digest = corpus_digest(jobs)
+    megabytes = sum(len(job_text(job).encode('utf-8')) for job in jobs) / 1e6
+    print(f"{len(jobs)} jobs, {megabytes:.1f} MB of text, best of {args.repeat}")
+
+    results = run(jobs, args.repeat)
+    summary = {name: summarize(timings, size) for name, (_, timings, size) in results.items()}
+
+    print(f"{'':<22} {'docs/s':>9} {'MB/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, stats in summary.items():
+        print(f"{name:<22} {stats['docs_per_s']:9.0f} {stats['mb_per_s']:8.2f} "
+              f"{stats['p50_ms']:8.3f} {stats['p99_ms']:8.3f}")
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(summary, indent=2))
+        print(f"Saved timings to {args.save_baseline}")
+
+    if args.update_golden:
+        golden = {
+            'corpus_sha256': digest,
+            'outputs': {name: outputs for name, (outputs, _, _) in results.items()},
+        }
+        # mtime=0 keeps the file byte-identical when nothing changed
+        with open(args.golden, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(golden, separators=(',', ':')).encode('utf-8'))
+        print(f"Recorded golden outputs in {args.golden}")
+        return
+
+    failures = []
+    if not Path(args.golden).exists():
+        sys.exit(f"No golden outputs at {args.golden}: record them with --update-golden")
+    with gzip.open(args.golden, 'rt', encoding='utf-8') as f:
+        drifted = check_golden(results, json.load(f), digest)
+    if drifted:
+        failures.append(f"{drifted} outputs differ from the golden file")
+
+    if args.baseline:
+        slower = check_baseline(summary, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        if slower:
+            failures.append(f"slower than the baseline by more than {args.max_regression:.0%}: {', '.join(slower)}")
+
+    if failures:
+        sys.exit("; ".join(failures))
+    print("No drift from the golden outputs")
+
+
+if __name__ == '__main__':
+    main()
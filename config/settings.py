@@ -169,6 +169,63 @@ app.autodiscover_tasks()
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
+# Results are needed by the chord that aggregates the bulk scrape's crawls
+CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_RESULT_EXPIRES = 60 * 60 * 24
+
+# Shared cache on the same Redis (db 1), visible to web and every Celery worker
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get("CACHE_URL", CELERY_BROKER_URL.rsplit('/', 1)[0] + '/1'),
+    }
+}
+
+# Bulk scrape fan-out: at most this many crawls of a spider run at once across ALL workers.
+# More workers make the scrape faster, not LinkedIn more suspicious.
+SCRAPE_SLOTS_PER_SPIDER = {
+    'linkedin': 3,
+}
+
+# Job counts (jobs/counts.py): sets the planner expects to be smaller than this are
+# counted exactly, bigger ones report the estimate. Either way cached for COUNT_CACHE_TTL seconds.
+EXACT_COUNT_LIMIT = 10_000
+COUNT_CACHE_TTL = 300
+
+# /api/jobs/ response cache (jobs/response_cache.py): entries live RESPONSE_CACHE_TTL seconds, but only
+# until the next data version. A stale entry younger than RESPONSE_CACHE_STALE_TTL is still served
+# while one request rebuilds it. The hit ratio is logged every RESPONSE_CACHE_REPORT_EVERY lookups.
+RESPONSE_CACHE_TTL = 600
+RESPONSE_CACHE_STALE_TTL = 120
+RESPONSE_CACHE_REPORT_EVERY = 1000
+
+# HTTP caching (jobs/http_cache.py): Cache-Control per response type. 'public' responses may be kept
+# by the CDN until the pipeline purges their surrogate keys (jobs/cdn.py); 'private' ones only by the
+# browser, which revalidates them with their ETag; 'stale' ones (old copies served while the response
+# cache rebuilds them) by nobody
+CACHE_CONTROL = {
+    'api': {'public': True, 'max_age': 60, 's_maxage': 600, 'stale_while_revalidate': 60},
+    'sitemap': {'public': True, 'max_age': 3600, 's_maxage': 86400},
+    'suggest': {'public': True, 'max_age': 300, 's_maxage': 300},
+    'private': {'private': True, 'no_cache': True},
+    'stale': {'private': True, 'no_store': True},
+}
+
+# Surrogate-key purges go through the Cloudflare API when a zone is configured; otherwise they are only logged
+CLOUDFLARE_ZONE_ID = os.environ.get('CLOUDFLARE_ZONE_ID', '')
+CLOUDFLARE_API_TOKEN = os.environ.get('CLOUDFLARE_API_TOKEN', '')
+CDN_PURGE_CLIENT = 'jobs.cdn.CloudflarePurgeClient' if CLOUDFLARE_ZONE_ID else 'jobs.cdn.LocalPurgeClient'
+
+# /api/jobs/export/: rows per server-side cursor fetch, and the requests one export costs
+# against the daily rate (Business 10,000/day -> 100 exports, Pro 10, Free none)
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_THROTTLE_COST = 100
+
+# /api/suggest/ (jobs/suggest.py): suggestions per lookup, and how often (seconds) each web process
+# checks whether a rebuilt index was published
+SUGGEST_LIMIT = 8
+SUGGEST_CHECK_INTERVAL = 30
 
 REST_FRAMEWORK = {
     # 1. Allow everyone in (Public API)
@@ -184,7 +241,7 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'jobs.pagination.JobPageNumberPagination',  # Page numbers, cached/estimated count
     'PAGE_SIZE': 20,  # Increase default slightly (optional)
     'PAGE_SIZE_QUERY_PARAM': 'page_size',  # Allow users to control it
     'MAX_PAGE_SIZE': 50,
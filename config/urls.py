@@ -1,8 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from django.contrib.sitemaps.views import sitemap
-from jobs.sitemaps import JobSitemap
+from jobs.sitemaps import JobSitemap, sitemap
 from django.views.generic import TemplateView
 
 sitemaps = {
@@ -1,24 +1,29 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import condition, require_POST
 from django.contrib.auth import login
 from django.contrib import messages
 from django.http import HttpResponse
-from django.core.paginator import Paginator
 from django.db.models import Q
 from rest_framework_api_key.models import APIKey
 
 from .forms import RegisterForm  # Assuming you renamed your form or use the one from before
 from .models import JobAlert, SavedJob
+from jobs.counts import total_jobs
+from jobs.http_cache import http_cache, job_etag
 from jobs.models import Job
+from jobs.pagination import InvalidCursor, keyset_page, next_page_url
 
 
 # --- 1. Main Pages ---
 
 def index(request):
     """The Landing Page (Public)"""
-    job_count = Job.objects.count()
-    return render(request, 'core/index.html', {'job_count': job_count})
+    job_count = total_jobs()  # Cached, no COUNT(*) per visit
+    return render(request, 'core/index.html', {
+        'job_count': job_count.value,
+        'job_count_approximate': job_count.approximate,
+    })
 
 
 def developer_guide(request):
@@ -65,12 +70,16 @@ def register(request):
 
 def job_list(request):
     """
-    Searchable, paginated job board with 'Saved' status checking.
+    Searchable job board with infinite scroll and 'Saved' status checking.
+    Pages are keyset pages (jobs.pagination): each one ends with a trigger
+    that loads the next page, after the last job shown, when it scrolls into view.
     """
     query = request.GET.get('q', '')
     location = request.GET.get('loc', '')
+    cursor = request.GET.get('cursor')
 
-    jobs = Job.objects.all().order_by('-posted_at')
+    # The cards never show the description: don't load it
+    jobs = Job.objects.defer('description', 'search_vector', 'skill_tags').order_by('-posted_at', '-id')
 
     if query:
         jobs = jobs.filter(
@@ -81,9 +90,12 @@ def job_list(request):
     if location:
         jobs = jobs.filter(location__icontains=location)
 
-    paginator = Paginator(jobs, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    try:
+        page, next_cursor = keyset_page(jobs, cursor, 20)
+    except InvalidCursor:
+        # Like Paginator.get_page: a broken link shows the first page
+        cursor = None
+        page, next_cursor = keyset_page(jobs, None, 20)
 
     # Get IDs of jobs saved by this user (efficient lookup)
     saved_job_ids = []
@@ -91,19 +103,27 @@ def job_list(request):
         saved_job_ids = list(SavedJob.objects.filter(user=request.user).values_list('job_id', flat=True))
 
     context = {
-        'page_obj': page_obj,
+        'jobs': page,
+        'next_url': next_page_url(request.path, next_cursor, q=query, loc=location) if next_cursor else None,
         'query': query,
         'location': location,
         'saved_job_ids': saved_job_ids,
     }
 
-    # If this is an HTMX request (pagination or search), render just the results
+    # Infinite scroll: just the next cards, appended in place of the trigger
+    if request.headers.get('HX-Request') and cursor:
+        return render(request, 'core/partials/job_cards.html', context)
+
+    # If this is an HTMX request (search), render just the results
     if request.headers.get('HX-Request'):
         return render(request, 'core/partials/job_results.html', context)
 
     return render(request, 'core/job_list.html', context)
 
 
+# The page embeds the visitor's CSRF token and account: browsers may keep it, the CDN may not
+@http_cache('private')
+@condition(etag_func=job_etag)
 def job_detail(request, pk):
     """SEO landing page for a single job."""
     job = get_object_or_404(Job, pk=pk)
@@ -0,0 +1,91 @@
+"""
+Surrogate keys and CDN purging.
+
+Responses the edge may cache carry surrogate keys (cache tags) naming what
+they were built from:
+- every /api/jobs/ page: JOB_LIST_TAG, its query_tag() and the job_tag() of each job on it;
+- the sitemap: SITEMAP_TAG;
+- /api/suggest/: SUGGEST_TAG.
+
+After a write the pipeline and the janitor purge exactly those keys (the
+suggestions go when their index is rebuilt), so the edge can keep public
+responses for long and still never serve them stale for long. The purge client
+is pluggable (CDN_PURGE_CLIENT): LocalPurgeClient only logs,
+CloudflarePurgeClient calls the Cloudflare API.
+"""
+import logging
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+JOB_LIST_TAG = 'jobs-list'
+SITEMAP_TAG = 'sitemap'
+SUGGEST_TAG = 'suggest'
+
+
+def job_tag(pk):
+    return f'job-{pk}'
+
+
+def query_tag(digest):
+    return f'jobs-query-{digest}'
+
+
+class LocalPurgeClient:
+    """For development and tests: nothing in front of the app, so purging only logs."""
+
+    # The header the CDN reads the keys from, and how it separates them
+    header = 'Surrogate-Key'
+    separator = ' '
+
+    def purge(self, tags):
+        logger.info(f"🧹 CDN purge (local, nothing sent): {' '.join(sorted(tags))}")
+
+
+class CloudflarePurgeClient(LocalPurgeClient):
+    """Purge by Cache-Tag through the Cloudflare API (CLOUDFLARE_ZONE_ID, CLOUDFLARE_API_TOKEN)."""
+
+    header = 'Cache-Tag'
+    separator = ','
+    # The API takes at most 30 tags per purge request
+    tags_per_request = 30
+
+    def __init__(self):
+        self.url = f"https://api.cloudflare.com/client/v4/zones/{settings.CLOUDFLARE_ZONE_ID}/purge_cache"
+        self.headers = {'Authorization': f"Bearer {settings.CLOUDFLARE_API_TOKEN}"}
+
+    def purge(self, tags):
+        tags = sorted(tags)
+        for start in range(0, len(tags), self.tags_per_request):
+            response = requests.post(
+                self.url, json={'tags': tags[start:start + self.tags_per_request]}, headers=self.headers, timeout=10,
+            )
+            response.raise_for_status()
+        logger.info(f"🧹 CDN purge: {len(tags)} tags")
+
+
+def purge_client():
+    return import_string(settings.CDN_PURGE_CLIENT)()
+
+
+def tag_response(response, tags):
+    """Sets the surrogate keys of a response the edge may cache."""
+    client = purge_client()
+    response[client.header] = client.separator.join(tags)
+
+
+def purge(tags):
+    """
+    Drops every edge copy tagged with one of `tags`. A failed purge is logged,
+    never raised: a write must not fail over it, and the copies expire anyway.
+    """
+    tags = set(tags)
+    if not tags:
+        return
+    try:
+        purge_client().purge(tags)
+    except Exception as e:
+        logger.error(f"❌ CDN purge of {len(tags)} tags failed: {e}")
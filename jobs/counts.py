@@ -0,0 +1,102 @@
+"""
+Job counts without a COUNT(*) on every request.
+
+- total_jobs(): the size of the whole table. Cached; on a miss it comes from
+  the planner statistics (pg_class.reltuples), or from a real count while the
+  table is small. Between refreshes the pipeline and the janitor adjust the
+  cached total as they insert and delete jobs.
+- count_jobs(queryset): the size of a filtered set. The planner's row estimate
+  (EXPLAIN) decides: below EXACT_COUNT_LIMIT rows a real count is cheap and is
+  used, above it the estimate is returned. Cached per query and data version
+  for COUNT_CACHE_TTL.
+
+Both return a JobCount, whose `approximate` says whether to show "about N".
+"""
+import hashlib
+import json
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .data_version import data_version
+from .models import Job
+
+TOTAL_KEY = 'job-count:total'
+TOTAL_APPROXIMATE_KEY = 'job-count:total-approximate'
+
+
+class JobCount(NamedTuple):
+    value: int
+    approximate: bool
+
+
+def exact_count_limit():
+    return getattr(settings, 'EXACT_COUNT_LIMIT', 10_000)
+
+
+def count_cache_ttl():
+    return getattr(settings, 'COUNT_CACHE_TTL', 300)
+
+
+def table_estimate():
+    """Rows in jobs_job according to the last ANALYZE/VACUUM, or None if it never ran."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [Job._meta.db_table])
+        row = cursor.fetchone()
+    # -1: never analyzed (Postgres 14+), 0: maybe never analyzed either
+    return int(row[0]) if row and row[0] > 0 else None
+
+
+def plan_estimate(queryset):
+    """The planner's estimate of the rows `queryset` returns (no query is run)."""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def total_jobs():
+    """Every job in the table."""
+    # Two keys, so the pipeline can cache.incr() the total atomically
+    cached = cache.get_many([TOTAL_KEY, TOTAL_APPROXIMATE_KEY])
+    if TOTAL_KEY in cached:
+        return JobCount(cached[TOTAL_KEY], cached.get(TOTAL_APPROXIMATE_KEY, True))
+
+    estimate = table_estimate()
+    if estimate is None or estimate < exact_count_limit():
+        total = JobCount(Job.objects.count(), False)
+    else:
+        total = JobCount(estimate, True)
+    cache.set_many({TOTAL_KEY: total.value, TOTAL_APPROXIMATE_KEY: total.approximate}, count_cache_ttl())
+    return total
+
+
+def count_jobs(queryset):
+    """Jobs in `queryset`: exact while that is cheap, the planner's estimate otherwise."""
+    if not queryset.query.where:
+        return total_jobs()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    # Per data version: a crawl or the janitor changing jobs makes the counts stale
+    key = f'job-count:{data_version()}:' + hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    cached = cache.get(key)
+    if cached is not None:
+        return JobCount(*cached)
+
+    estimate = plan_estimate(queryset)
+    if estimate < exact_count_limit():
+        result = JobCount(queryset.count(), False)
+    else:
+        result = JobCount(estimate, True)
+    cache.set(key, tuple(result), count_cache_ttl())
+    return result
+
+
+def adjust_total_jobs(delta):
+    """Jobs were inserted (delta > 0) or deleted (delta < 0): keep the cached total in step."""
+    if not delta:
+        return
+    try:
+        cache.incr(TOTAL_KEY, delta)
+    except ValueError:
+        pass  # Nothing cached: the next total_jobs() counts afresh
@@ -0,0 +1,52 @@
+"""
+A global version number for the job data.
+
+Everything that changes jobs (the scraper pipeline, the janitor) bumps it.
+Caches built from job data key or tag their entries with the version they saw:
+after a bump those entries no longer match and are never served as fresh, with
+no scan-and-delete. They simply expire.
+"""
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db.models import Max
+
+from .models import Job
+
+VERSION_KEY = 'jobs:data-version'
+CHANGED_AT_KEY = 'jobs:data-changed-at'
+
+
+def data_version():
+    """The current version. Starts from a timestamp, so a flushed cache never reuses an old number."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_data_version():
+    """Jobs were inserted, updated or deleted: invalidate everything cached for the old version."""
+    cache.set(CHANGED_AT_KEY, time.time(), timeout=None)
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        return data_version()
+
+
+def data_changed_at():
+    """
+    When the job data last changed (an aware datetime, or None without jobs):
+    the Last-Modified of responses built from all of it. Recorded by every
+    bump; until the first one, the newest created_at stands in.
+    """
+    changed_at = cache.get(CHANGED_AT_KEY)
+    if changed_at is not None:
+        return datetime.fromtimestamp(changed_at, tz=timezone.utc)
+
+    newest = Job.objects.aggregate(newest=Max('created_at'))['newest']
+    if newest is not None:
+        cache.add(CHANGED_AT_KEY, newest.timestamp(), timeout=None)
+    return newest
@@ -0,0 +1,66 @@
+"""
+Streaming bulk export: every job of a query as NDJSON or CSV.
+
+Rows are read through a Postgres server-side cursor (.iterator(chunk_size))
+and written out as they arrive, so memory stays flat however many jobs match.
+With gzip the stream is compressed on the fly, chunk by chunk.
+"""
+import csv
+import zlib
+
+import orjson
+
+from .serializers import iter_job_values
+
+# Rows encoded per yielded chunk: big enough to keep the socket busy, small enough to stay flat
+ROWS_PER_CHUNK = 500
+
+
+def batched(jobs, size=ROWS_PER_CHUNK):
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_chunks(rows, fields):
+    """One JSON object per line, with the same keys and formats as /api/jobs/."""
+    for batch in batched(iter_job_values(rows, fields)):
+        yield b"".join(orjson.dumps(job) + b"\n" for job in batch)
+
+
+class Echo:
+    """csv.writer target that hands back each line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)  # skills
+    return value
+
+
+def csv_chunks(rows, fields):
+    """A header row, then one row per job; skills are joined with ", "."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields).encode()
+    for batch in batched(iter_job_values(rows, fields)):
+        yield "".join(writer.writerow([csv_value(job[name]) for name in fields]) for job in batch).encode()
+
+
+def gzip_chunks(chunks, level=6):
+    """Compresses a stream of byte chunks into one gzip stream."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip header and trailer
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
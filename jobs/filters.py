@@ -1,32 +1,49 @@
 import django_filters
-import re
+from django.db.models import Q
 from .models import Job
 
 class JobFilter(django_filters.FilterSet):
-    # Standard text searches
+    # Substring searches, served by the trigram indexes on UPPER(title/company/location)
     title = django_filters.CharFilter(lookup_expr='icontains')
     company = django_filters.CharFilter(lookup_expr='icontains')
     location = django_filters.CharFilter(lookup_expr='icontains')
-    seniority = django_filters.CharFilter(lookup_expr='icontains')
-    source = django_filters.CharFilter(lookup_expr='icontains')
+    # Few distinct values ("LinkedIn", "Senior"...): case-insensitive prefix match,
+    # served by the text_pattern_ops indexes on UPPER(source/seniority)
+    seniority = django_filters.CharFilter(lookup_expr='istartswith')
+    source = django_filters.CharFilter(lookup_expr='istartswith')
 
     # Salary Filter (Greater than or equal to)
     salary_min = django_filters.NumberFilter(field_name='salary_min', lookup_expr='gte')
 
-    # Custom Skills Filter (Search inside JSON List)
+    # Skills Filters (exact skill names, case-insensitive, comma-separated)
+    # ?skills=python,django -> jobs with ALL of them; ?skills_any=go,rust -> jobs with ANY of them
     skills = django_filters.CharFilter(method='filter_skills')
+    skills_any = django_filters.CharFilter(method='filter_skills_any')
 
     class Meta:
         model = Job
-        fields = ['title', 'company', 'location', 'skills', 'seniority', 'salary_min', 'source']
+        fields = ['title', 'company', 'location', 'skills', 'skills_any', 'seniority', 'salary_min', 'source']
+
+    @staticmethod
+    def skill_tags(value):
+        return [tag.strip().lower() for tag in value.split(',') if tag.strip()]
 
     def filter_skills(self, queryset, name, value):
         """
-        Searches for a specific skill inside the JSONField list.
+        Matches whole skills inside the normalized skill_tags list (JSONB @>, GIN-indexed).
         Example: Searching for 'Java' matches ["Java", "Python"] but NOT ["JavaScript"].
         """
-        if not value:
+        tags = self.skill_tags(value)
+        if not tags:
             return queryset
+        return queryset.filter(skill_tags__contains=tags)
 
-        # We search for the exact string wrapped in quotes inside the JSON structure
-        return queryset.filter(skills__iregex=f'"{re.escape(value)}"')
\ No newline at end of file
+    def filter_skills_any(self, queryset, name, value):
+        """Jobs with at least one of the skills: one indexed @> per skill, OR-ed together."""
+        tags = self.skill_tags(value)
+        if not tags:
+            return queryset
+        condition = Q()
+        for tag in tags:
+            condition |= Q(skill_tags__contains=[tag])
+        return queryset.filter(condition)
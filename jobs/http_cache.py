@@ -0,0 +1,101 @@
+"""
+Conditional GET and Cache-Control for public job responses.
+
+Validators, checked by django.views.decorators.http.condition before the view
+runs, so a client or the edge revalidating an unchanged response gets a 304
+without a single query:
+- /api/jobs/ pages and the sitemap are built from all jobs: their ETag is the
+  data version (jobs.data_version) plus the query, their Last-Modified is when
+  the data last changed.
+- a job page has its own version: its content fingerprint and posting date.
+
+Cache-Control comes from the CACHE_CONTROL setting, per response type. Public
+responses also carry surrogate keys (jobs.cdn), so the edge keeps them until
+the pipeline purges what changed. A STALE copy from the response cache is built
+from older data than its validators say: it goes out without them, never stored.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+
+from .cdn import tag_response
+from .data_version import data_changed_at, data_version
+from .models import Job
+from .response_cache import cache_key
+
+
+def digest(value):
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def per_visitor(request):
+    """/api/jobs/ as HTML for a logged-in user: the cards show their saved jobs, for them alone."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    return renderer is not None and renderer.format == 'html' and request.user.is_authenticated
+
+
+def list_etag(request, *args, **kwargs):
+    """/api/jobs/: same data version, same query, same representation -> same bytes."""
+    if per_visitor(request):
+        return None
+    return digest(f"{data_version()}:{cache_key(request)}")
+
+
+def sitemap_etag(request, *args, **kwargs):
+    return digest(f"{data_version()}:{request.get_full_path()}")
+
+
+def list_last_modified(request, *args, **kwargs):
+    if per_visitor(request):
+        return None
+    return data_changed_at()
+
+
+def data_last_modified(request, *args, **kwargs):
+    return data_changed_at()
+
+
+def job_etag(request, pk):
+    """
+    A job page for logged-out visitors (search engines, mostly): it changes with
+    the job and with the visitor's CSRF cookie, whose token the page embeds.
+    Logged-in pages show the account too and get no validator.
+    """
+    if request.user.is_authenticated:
+        return None
+    job = Job.objects.filter(pk=pk).values_list('content_hash', 'posted_at').first()
+    if job is None:
+        return None  # The view answers 404
+    content_hash, posted_at = job
+    return digest(f"{pk}:{content_hash}:{posted_at}:{request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')}")
+
+
+def is_public(kind):
+    return settings.CACHE_CONTROL[kind].get('public', False)
+
+
+def apply_http_cache(response, kind, tags=()):
+    """Cache-Control of `kind` on a 200 or 304, plus the surrogate keys when the edge may keep it."""
+    if response.status_code not in (200, 304):
+        return response
+    patch_cache_control(response, **settings.CACHE_CONTROL[kind])
+    if tags and is_public(kind):
+        tag_response(response, tags)
+    return response
+
+
+def http_cache(kind, tags=None):
+    """
+    View decorator for apply_http_cache. `tags` is a list of surrogate keys or
+    a function of the view arguments returning one.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            response_tags = tags(request, *args, **kwargs) if callable(tags) else tags or ()
+            return apply_http_cache(response, kind, response_tags)
+        return wrapper
+    return decorator
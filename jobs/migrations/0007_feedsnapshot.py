@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=2048, unique=True)),
+                ('etag', models.CharField(blank=True, default='', max_length=500)),
+                ('last_modified', models.CharField(blank=True, default='', max_length=100)),
+                ('body_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('body_size', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
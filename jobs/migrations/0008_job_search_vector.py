@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Adding a stored generated column rewrites jobs_job under an ACCESS EXCLUSIVE lock:
+    # reads and writes of jobs wait until every row's vector is computed, minutes on a
+    # large table. Run it in a maintenance window, with the scrapers stopped. The GIN
+    # index then builds CONCURRENTLY, so only the column add blocks.
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0007_feedsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('company', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('skills', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector(django.db.models.functions.text.Left('description', 100000), config='english', weight='D'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobs_job_search_vector_gin'),
+        ),
+    ]
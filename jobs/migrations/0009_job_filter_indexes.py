@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:38
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY: the job board keeps serving while the indexes build
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0008_job_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='jobs_job_title_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('company'), name='gin_trgm_ops'), name='jobs_job_company_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('location'), name='gin_trgm_ops'), name='jobs_job_location_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('source'), name='text_pattern_ops'), name='jobs_job_source_prefix'),
+        ),
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('seniority'), name='text_pattern_ops'), name='jobs_job_seniority_prefix'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:44
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='skill_tags',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.text.Lower(django.db.models.functions.comparison.Cast('skills', models.TextField())), models.JSONField()), output_field=models.JSONField()),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skill_tags'], name='jobs_job_skill_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:49
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY: the job board keeps serving while the index builds
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0010_job_skill_tags'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(fields=['-posted_at', '-id'], name='jobs_job_posted_at_id'),
+        ),
+    ]
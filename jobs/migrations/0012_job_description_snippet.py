@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:57
+
+import html
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+BATCH_SIZE = 2000
+SNIPPET_LENGTH = 280
+
+
+def make_snippet(description):
+    """
+    Frozen copy of jobs.models.make_snippet as of this migration: later changes
+    to the model helper must not change what this backfill wrote.
+    """
+    # A space before every tag, so "<li>one</li><li>two</li>" becomes "one two", not "onetwo"
+    text = " ".join(html.unescape(strip_tags((description or "").replace("<", " <"))).split())
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+
+def backfill_snippets(apps, schema_editor):
+    """Snippets for the jobs scraped before the column existed; new ones get theirs from the pipeline."""
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.only('id', 'description').iterator(chunk_size=BATCH_SIZE):
+        job.description_snippet = make_snippet(job.description)
+        batch.append(job)
+        if len(batch) == BATCH_SIZE:
+            Job.objects.bulk_update(batch, ['description_snippet'])
+            batch = []
+    Job.objects.bulk_update(batch, ['description_snippet'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_posted_at_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='description_snippet',
+            field=models.CharField(blank=True, default='', max_length=300),
+        ),
+        migrations.RunPython(backfill_snippets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Nullable, no default: a catalog-only change, no table rewrite. Jobs stored before it
+    # count as checked when they were created (see scraper_service.known_jobs).
+
+    dependencies = [
+        ('jobs', '0012_job_description_snippet'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
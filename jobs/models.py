@@ -1,5 +1,25 @@
+import html
+
 from django.db import models
-from django.contrib.postgres.indexes import GinIndex
+from django.db.models.functions import Cast, Left, Lower, Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.utils.html import strip_tags
+
+# Text search configuration of the stored search_vector; queries must use the same one
+SEARCH_CONFIG = 'english'
+
+SNIPPET_LENGTH = 280
+
+
+def make_snippet(description):
+    """The start of the description as plain text: at most SNIPPET_LENGTH characters, cut at a word."""
+    # A space before every tag, so "<li>one</li><li>two</li>" becomes "one two", not "onetwo"
+    text = " ".join(html.unescape(strip_tags((description or "").replace("<", " <"))).split())
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
 
 class Job(models.Model):
     title = models.CharField(max_length=500)
@@ -9,17 +29,74 @@ class Job(models.Model):
     source = models.CharField(max_length=50, db_index=True)
     posted_at = models.DateField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # When the scraper last read the whole posting (detail page included). Detail pages of
+    # jobs checked in the last KNOWN_JOB_FRESHNESS_DAYS days are not downloaded again.
+    checked_at = models.DateTimeField(null=True, blank=True)
     description = models.TextField(null=True, blank=True)
+    # Plain-text start of the description for list pages, which no longer load the full text
+    description_snippet = models.CharField(max_length=300, blank=True, default="")
     skills = models.JSONField(default=list, blank=True)
     seniority = models.CharField(max_length=50, default="Not Specified")
     salary_min = models.IntegerField(null=True, blank=True)
     salary_max = models.IntegerField(null=True, blank=True)
     currency = models.CharField(max_length=10, null=True, blank=True)
+    # SHA-256 of the normalized title/company/location/description.
+    # The scraper pipeline compares it to skip re-analysing and rewriting unchanged jobs.
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    # Full-text search document, computed by Postgres on every insert/update:
+    # title (A) > company, skills (B) > description (D).
+    # The description is capped so a huge posting cannot exceed the 1 MB tsvector limit.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('company', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('skills', weight='B', config=SEARCH_CONFIG)
+            + SearchVector(Left('description', 100000), weight='D', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # `skills` lowercased (["python", "c++"]), computed by Postgres on every write.
+    # The skills filter matches it with JSONB containment (@>) through a GIN index.
+    skill_tags = models.GeneratedField(
+        expression=Cast(Lower(Cast('skills', models.TextField())), models.JSONField()),
+        output_field=models.JSONField(),
+        db_persist=True,
+    )
 
     class Meta:
         indexes = [
             models.Index(fields=['-posted_at', 'title']),
+            # Keyset pages of the default ordering: seek on (posted_at, id), read just the page
+            models.Index(fields=['-posted_at', '-id'], name='jobs_job_posted_at_id'),
+            GinIndex(fields=['search_vector'], name='jobs_job_search_vector_gin'),
+            GinIndex(fields=['skill_tags'], opclasses=['jsonb_path_ops'], name='jobs_job_skill_tags_gin'),
+            # JobFilter substring filters (icontains = UPPER(col) LIKE '%X%'): trigram indexes
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='jobs_job_title_trgm'),
+            GinIndex(OpClass(Upper('company'), name='gin_trgm_ops'), name='jobs_job_company_trgm'),
+            GinIndex(OpClass(Upper('location'), name='gin_trgm_ops'), name='jobs_job_location_trgm'),
+            # JobFilter prefix filters (istartswith = UPPER(col) LIKE 'X%'): pattern B-trees
+            models.Index(OpClass(Upper('source'), name='text_pattern_ops'), name='jobs_job_source_prefix'),
+            models.Index(OpClass(Upper('seniority'), name='text_pattern_ops'), name='jobs_job_seniority_prefix'),
         ]
 
     def __str__(self):
-        return f"{self.title} at {self.company}"
\ No newline at end of file
+        return f"{self.title} at {self.company}"
+
+
+class FeedSnapshot(models.Model):
+    """
+    Validators of the last full download of a feed URL (RSS feed, JSON API page).
+    The scraper sends them back as a conditional GET and skips parsing a feed that did not change.
+    """
+    url = models.URLField(unique=True, max_length=2048)
+    etag = models.CharField(max_length=500, blank=True, default="")
+    last_modified = models.CharField(max_length=100, blank=True, default="")
+    # SHA-256 of the body, for servers that send no validators (or always answer 200)
+    body_hash = models.CharField(max_length=64, blank=True, default="")
+    body_size = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.url
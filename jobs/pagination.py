@@ -0,0 +1,238 @@
+"""
+Pagination for the job lists.
+
+JobPageNumberPagination is the default: page numbers, with the total from the
+count service (jobs.counts) instead of a COUNT(*) per request.
+
+KeysetPagination is the opt-in keyset (cursor) pagination.
+
+Page N of PageNumberPagination costs a COUNT(*) over the filtered set plus an
+OFFSET that reads and throws away every row before it. A keyset page instead
+remembers the sort key of the last row it returned and asks for the rows after
+it, e.g. for the default ordering (-posted_at, -id):
+
+    WHERE (posted_at, id) < (:posted_at, :id)
+    ORDER BY posted_at DESC, id DESC LIMIT 21
+
+which the (posted_at, id) index answers by starting its scan at the cursor,
+however deep the page. The cursor is that sort key, base64-encoded: clients pass it back as is.
+There is no count, and rows inserted meanwhile never shift a page.
+
+The queryset must be ordered by descending keys only, ending with the unique
+'-id'. NULLs sort first in a descending Postgres index and are handled as such.
+"""
+import base64
+import json
+import operator
+from functools import reduce
+from urllib.parse import urlencode
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import F, Field, Func, Q, Value
+from django.db.models.lookups import LessThan
+from rest_framework.exceptions import NotFound
+from django.utils.functional import cached_property
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .counts import count_jobs
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def ordering_keys(queryset):
+    """['-posted_at', '-id'] -> ['posted_at', 'id']"""
+    ordering = list(queryset.query.order_by)
+    if not ordering or ordering[-1] not in ('-id', '-pk') or any(not key.startswith('-') for key in ordering):
+        raise ValueError(f"Keyset pagination needs a descending ordering ending with '-id', got {ordering}")
+    return [key[1:] for key in ordering]
+
+
+def encode_cursor(values):
+    data = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(queryset, keys, cursor):
+    """The cursor's values, converted back to the Python types of their fields."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor(cursor)
+
+    decoded = []
+    for key, value in zip(keys, values):
+        try:
+            field = queryset.model._meta.get_field(key)
+        except FieldDoesNotExist:
+            field = None  # An annotation, like the search rank: a plain JSON number
+        try:
+            decoded.append(field.to_python(value) if field is not None and value is not None else value)
+        except ValidationError:
+            raise InvalidCursor(cursor)
+    return decoded
+
+
+class Row(Func):
+    """ROW(a, b, ...): compared field by field, left to right, like a sort key."""
+    function = 'ROW'
+    output_field = Field()
+
+
+def after(keys, values):
+    """Rows that come after `values` in a descending ordering on `keys`."""
+    if None not in values:
+        # (posted_at, id) < (:posted_at, :id) is one range on the (posted_at, id)
+        # index: the scan starts at the cursor and reads just the page
+        return LessThan(Row(*(F(key) for key in keys)), Row(*(Value(value) for value in values)))
+
+    # A NULL makes the row comparison NULL: spell it out key by key instead
+    branches = []
+    equal = Q()
+    for key, value in zip(keys, values):
+        if value is None:
+            # NULLs come first: every non-NULL value is after them
+            branches.append(equal & Q(**{f'{key}__isnull': False}))
+            equal &= Q(**{f'{key}__isnull': True})
+        else:
+            branches.append(equal & Q(**{f'{key}__lt': value}))
+            equal &= Q(**{key: value})
+    return reduce(operator.or_, branches)
+
+
+def keyset_page(queryset, cursor=None, page_size=20):
+    """
+    One page of `queryset` after `cursor` (None: the first page).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    keys = ordering_keys(queryset)
+    if cursor:
+        queryset = queryset.filter(after(keys, decode_cursor(queryset, keys, cursor)))
+
+    # One extra row tells whether there is a next page, without a count
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    # Model instances, or dicts from .values()
+    values = [last[key] for key in keys] if isinstance(last, dict) else [getattr(last, key) for key in keys]
+    return rows, encode_cursor(values)
+
+
+def next_page_url(url, cursor, **params):
+    """`url` with the current filters (`params`) and the next cursor."""
+    return f"{url}?{urlencode({**params, 'cursor': cursor})}"
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF side of keyset_page: {"next": url or null, "results": [...]}.
+    The next link is the current URL with its cursor replaced.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 20
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = request.query_params.get(self.cursor_query_param)
+        try:
+            rows, self.next_cursor = keyset_page(queryset, cursor, self.page_size)
+        except InvalidCursor:
+            raise NotFound(self.invalid_cursor_message)
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class EstimatedPage(Page):
+    """A page that knows from its own rows whether another one follows."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountedPaginator(Paginator):
+    """
+    Paginator whose count comes from count_jobs(). While that count is only an
+    estimate, page numbers are not checked against it: each page reads one
+    extra row instead, to tell whether there is a next one.
+    """
+
+    @cached_property
+    def job_count(self):
+        return count_jobs(self.object_list)
+
+    @cached_property
+    def count(self):
+        return self.job_count.value
+
+    def validate_number(self, number):
+        if not self.job_count.approximate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if not self.job_count.approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return EstimatedPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class JobPageNumberPagination(PageNumberPagination):
+    """
+    Page numbers as before; `count` comes from the count service and
+    `count_approximate` says when it is the planner's estimate.
+    """
+    django_paginator_class = CountedPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_approximate': self.page.paginator.job_count.approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_approximate'] = {'type': 'boolean', 'example': False}
+        return response_schema
@@ -0,0 +1,132 @@
+"""
+Response cache for /api/jobs/.
+
+Most traffic is a few hundred repeated queries (?search=python, ?skills=React&page=1).
+Their rendered responses are cached per normalized query string and renderer,
+together with the data version (jobs.data_version) they were built from:
+
+- HIT: the entry was built from the current data version.
+- STALE: the data changed since, but the entry is younger than
+  RESPONSE_CACHE_STALE_TTL and another request is already rebuilding it
+  (stale-while-revalidate): serve the old copy instead of piling onto Postgres.
+- MISS: build the response; the first request to miss takes the rebuild lock.
+
+Responses with no results are not cached: they trigger the on-demand scraper.
+Hits, stale hits and misses are counted; every RESPONSE_CACHE_REPORT_EVERY
+lookups the hit ratio is logged.
+"""
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .cdn import purge_client
+from .data_version import data_version
+
+logger = logging.getLogger(__name__)
+
+STATS_KEYS = {'HIT': 'api-cache:hits', 'STALE': 'api-cache:stale', 'MISS': 'api-cache:misses'}
+LOOKUPS_KEY = 'api-cache:lookups'
+
+
+def response_cache_ttl():
+    return getattr(settings, 'RESPONSE_CACHE_TTL', 600)
+
+
+def stale_ttl():
+    return getattr(settings, 'RESPONSE_CACHE_STALE_TTL', 120)
+
+
+def query_digest(request):
+    """Same filters in any order, with or without empty parameters -> same digest."""
+    params = sorted(
+        (name, value.strip())
+        for name, values in request.query_params.lists()
+        for value in values
+        if value.strip()
+    )
+    return hashlib.md5(f"{request.path}?{urlencode(params)}".encode()).hexdigest()
+
+
+def cache_key(request):
+    renderer = request.accepted_renderer.format
+    if request.headers.get('HX-Request') == 'true':
+        renderer += '+htmx'
+    return f'api-cache:{renderer}:{query_digest(request)}'
+
+
+def incr(key):
+    if cache.add(key, 1, timeout=None):
+        return 1
+    return cache.incr(key)
+
+
+def count(outcome):
+    incr(STATS_KEYS[outcome])
+    if incr(LOOKUPS_KEY) % getattr(settings, 'RESPONSE_CACHE_REPORT_EVERY', 1000) == 0:
+        stats = response_cache_stats()
+        logger.info(f"📊 Response cache: {stats['hit_ratio']:.0%} hit ratio "
+                    f"({stats['hits']} hits, {stats['stale']} stale, {stats['misses']} misses)")
+
+
+def response_cache_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    hits, stale, misses = (values.get(STATS_KEYS[outcome], 0) for outcome in ('HIT', 'STALE', 'MISS'))
+    lookups = hits + stale + misses
+    return {
+        'hits': hits,
+        'stale': stale,
+        'misses': misses,
+        'hit_ratio': (hits + stale) / lookups if lookups else 0.0,
+    }
+
+
+class ResponseCache:
+    """One lookup: `get()` an entry, or build the response and `store()` it."""
+
+    def __init__(self, request):
+        self.key = cache_key(request)
+        self.lock_key = f'{self.key}:rebuild'
+        self.version = data_version()
+
+    def get(self):
+        """A cached HttpResponse (with its X-Cache header), or None: build the response and store() it."""
+        entry = cache.get(self.key)
+        if entry is not None and entry['version'] == self.version:
+            return self.respond(entry, 'HIT')
+
+        # Stale-while-revalidate: one request rebuilds, the others get the old copy meanwhile
+        fresh_enough = entry is not None and time.time() - entry['stored_at'] < stale_ttl()
+        if fresh_enough and not cache.add(self.lock_key, 1, timeout=30):
+            return self.respond(entry, 'STALE')
+
+        count('MISS')
+        return None
+
+    def store(self, response, cacheable=True):
+        """Marks a freshly built response as a MISS and caches it if it is a cacheable 200."""
+        response['X-Cache'] = 'MISS'
+        if cacheable and response.status_code == 200:
+            response.render()
+            cache.set(self.key, {
+                'version': self.version,
+                'stored_at': time.time(),
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'tags': response.get(purge_client().header),
+            }, response_cache_ttl())
+        # Either way the rebuild is over: the next request may try again
+        cache.delete(self.lock_key)
+        return response
+
+    def respond(self, entry, outcome):
+        count(outcome)
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        if entry.get('tags'):
+            response[purge_client().header] = entry['tags']
+        response['X-Cache'] = outcome
+        return response
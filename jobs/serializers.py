@@ -1,7 +1,98 @@
-from rest_framework import serializers
+from datetime import date
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from .models import Job
 
+
 class JobSerializer(serializers.ModelSerializer):
+    """
+    Pass `fields` to return only some of the fields (sparse fieldsets);
+    JobListAPI takes them from ?fields= / ?exclude=.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Job
-        fields = '__all__'  # Returns all fields (title, company, url, etc.)
\ No newline at end of file
+        # Listed explicitly: new internal columns (search vectors, hashes) never leak into the API
+        fields = [
+            'id', 'title', 'company', 'location', 'url', 'source', 'posted_at', 'created_at',
+            'description', 'description_snippet', 'skills', 'seniority',
+            'salary_min', 'salary_max', 'currency',
+        ]
+
+
+# List pages return the snippet; the full description only when asked for (?fields=description,...)
+DEFAULT_LIST_FIELDS = [name for name in JobSerializer.Meta.fields if name != 'description']
+
+
+def requested_fields(query_params):
+    """
+    ?fields=title,url -> just those; ?exclude=skills -> the defaults without them.
+    Unknown names are a 400, so a typo doesn't silently return everything.
+    """
+    def names(param):
+        return [name.strip() for name in query_params.get(param, '').split(',') if name.strip()]
+
+    fields, excluded = names('fields'), names('exclude')
+    unknown = sorted(set(fields + excluded) - set(JobSerializer.Meta.fields))
+    if unknown:
+        raise serializers.ValidationError({
+            'fields': f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(JobSerializer.Meta.fields)}"
+        })
+    selected = fields or DEFAULT_LIST_FIELDS
+    return [name for name in JobSerializer.Meta.fields if name in selected and name not in excluded]
+
+
+@lru_cache(maxsize=None)
+def date_columns():
+    """Names of the serializer's date and datetime fields: the only ones job_values() must format."""
+    fields = JobSerializer().fields
+    return (
+        {name for name, field in fields.items() if isinstance(field, serializers.DateField)},
+        {name for name, field in fields.items() if isinstance(field, serializers.DateTimeField)},
+    )
+
+
+def iso_datetime(value, tz):
+    """DateTimeField.to_representation() for the default ISO 8601 format, with the timezone looked up once."""
+    value = value.astimezone(tz).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def job_values(rows, fields):
+    """
+    Fast path for lists: JobSerializer's output built straight from .values()
+    rows, without model instances and field-by-field serializer calls.
+    Same keys in the same order, same formats: only dates and datetimes need
+    DRF's formatting, every other column already is what the serializer returns.
+    """
+    return list(iter_job_values(rows, fields))
+
+
+def iter_job_values(rows, fields):
+    """job_values() one row at a time, for streams of any length."""
+    dates, datetimes = date_columns()
+    if settings.USE_TZ and api_settings.DATETIME_FORMAT == ISO_8601 and api_settings.DATE_FORMAT == ISO_8601:
+        tz = timezone.get_current_timezone()
+        converters = {name: date.isoformat for name in dates}
+        converters.update({name: partial(iso_datetime, tz=tz) for name in datetimes})
+    else:
+        serializer_fields = JobSerializer().fields
+        converters = {name: serializer_fields[name].to_representation for name in dates | datetimes}
+    plan = [(name, converters.get(name)) for name in fields]
+
+    for row in rows:
+        job = {}
+        for name, convert in plan:
+            value = row[name]
+            job[name] = convert(value) if convert is not None and value is not None else value
+        yield job
@@ -1,5 +1,9 @@
 from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps import views as sitemap_views
 from django.urls import reverse
+from django.views.decorators.http import condition
+from .cdn import SITEMAP_TAG
+from .http_cache import data_last_modified, http_cache, sitemap_etag
 from .models import Job
 
 class JobSitemap(Sitemap):
@@ -17,4 +21,14 @@ class JobSitemap(Sitemap):
 
     def location(self, obj):
         # Returns the URL for each specific job
-        return reverse('job_detail', args=[obj.pk])
\ No newline at end of file
+        return reverse('job_detail', args=[obj.pk])
+
+
+@http_cache('sitemap', tags=[SITEMAP_TAG])
+@condition(etag_func=sitemap_etag, last_modified_func=data_last_modified)
+def sitemap(request, sitemaps, **kwargs):
+    """Django's sitemap view, revalidated against the data version and purged with the job list."""
+    response = sitemap_views.sitemap(request, sitemaps, **kwargs)
+    # Its own Last-Modified is the newest posted_at, blind to deletions: ours replaces it
+    del response['Last-Modified']
+    return response
@@ -0,0 +1,158 @@
+"""
+Typeahead suggestions for the search box: job titles, companies and skills.
+
+The index is built away from requests, after each ingest (rebuild_suggest_index):
+every distinct term with the number of jobs it appears in, and its lookup keys,
+one per word start, lowercased ("Senior Python Developer" is found by "sen",
+"pyth" and "dev"). The keys are kept in one sorted list, so the terms of a prefix
+are a bisect range. The top SUGGEST_LIMIT terms of every prefix up to
+TOP_PREFIX_LENGTH characters, the ranges too big to rank per request, are ranked
+at build time.
+
+The built index is stored in the cache with the data version it was built
+from. Each web process keeps a copy in memory and checks the stored version
+every SUGGEST_CHECK_INTERVAL seconds, so a lookup touches neither Postgres nor
+Redis.
+"""
+import heapq
+import logging
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from .data_version import data_version
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = 'suggest:index'
+INDEX_VERSION_KEY = 'suggest:index-version'
+
+# Prefixes up to this length have their top terms ranked at build time
+TOP_PREFIX_LENGTH = 3
+# Lookup keys are cut here: nobody types further into a suggestion
+KEY_LENGTH = 60
+
+WORD_START = re.compile(r'(?<!\w)\w')
+
+KINDS = ('title', 'company', 'skill')
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def lookup_keys(text):
+    """The normalized text from each word start: every way to type towards the term."""
+    text = normalize(text)
+    return {text[match.start():match.start() + KEY_LENGTH] for match in WORD_START.finditer(text)}
+
+
+def suggest_limit():
+    return getattr(settings, 'SUGGEST_LIMIT', 8)
+
+
+def term_counts():
+    """(kind, display text, jobs) of every distinct title, company and skill, case-insensitively."""
+    counts = {kind: Counter() for kind in KINDS}
+    for kind, column in (('title', 'title'), ('company', 'company')):
+        for value, jobs in Job.objects.values_list(column).annotate(jobs=Count('id')).order_by():
+            counts[kind][value] += jobs
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT skill, count(*) FROM {Job._meta.db_table}, jsonb_array_elements_text(skills) AS skill "
+            f"WHERE jsonb_typeof(skills) = 'array' GROUP BY skill"
+        )
+        counts['skill'].update(dict(cursor.fetchall()))
+
+    terms = []
+    for kind, counter in counts.items():
+        # "Python Developer" and "python developer" are one term, shown as the commonest spelling
+        merged, display = Counter(), {}
+        for value, jobs in counter.most_common():
+            key = normalize(value)
+            if key:
+                merged[key] += jobs
+                display.setdefault(key, value.strip())
+        terms.extend((kind, display[key], jobs) for key, jobs in merged.items())
+    return terms
+
+
+class SuggestIndex:
+    def __init__(self, terms, version=None, limit=None):
+        """`terms`: (kind, text, weight) tuples, e.g. from term_counts()."""
+        self.version = version
+        self.limit = limit or suggest_limit()
+        # Heaviest first: then every ranking below is a stable, in-order pick
+        self.terms = sorted(terms, key=lambda term: (-term[2], term[1].casefold(), term[0]))
+
+        pairs = sorted((key, index) for index, term in enumerate(self.terms) for key in lookup_keys(term[1]))
+        self.keys = [key for key, _ in pairs]
+        self.refs = [index for _, index in pairs]
+
+        self.top = {}
+        for index, term in enumerate(self.terms):
+            for key in lookup_keys(term[1]):
+                for length in range(1, min(len(key), TOP_PREFIX_LENGTH) + 1):
+                    ranked = self.top.setdefault(key[:length], [])
+                    if len(ranked) < self.limit and (not ranked or ranked[-1] != index):
+                        ranked.append(index)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, prefix, limit=None):
+        """The most frequent terms with a word starting with `prefix`, as dicts."""
+        prefix = normalize(prefix)[:KEY_LENGTH]
+        limit = min(limit or self.limit, self.limit)
+        if not prefix:
+            return []
+
+        if len(prefix) <= TOP_PREFIX_LENGTH:
+            indexes = self.top.get(prefix, [])[:limit]
+        else:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + '\U0010ffff', start)
+            # Lower index = heavier term
+            indexes = heapq.nsmallest(limit, set(self.refs[start:end]))
+
+        return [{'text': self.terms[i][1], 'kind': self.terms[i][0], 'jobs': self.terms[i][2]} for i in indexes]
+
+
+def rebuild_suggest_index():
+    """Builds the index from the current jobs and publishes it to every web process."""
+    started = time.monotonic()
+    stored = {'version': data_version(), 'terms': term_counts()}
+    cache.set(INDEX_KEY, stored, timeout=None)
+    cache.set(INDEX_VERSION_KEY, stored['version'], timeout=None)
+    logger.info(f"🔎 Suggest index rebuilt: {len(stored['terms'])} terms in {time.monotonic() - started:.1f}s")
+    return stored
+
+
+# This process's copy of the index, and when the stored version was last checked
+_loaded = {'index': None, 'checked_at': 0.0}
+
+
+def suggest_index():
+    """The current index, from memory; reloaded when a rebuild published a new one."""
+    index = _loaded['index']
+    now = time.monotonic()
+    if index is not None and now - _loaded['checked_at'] < getattr(settings, 'SUGGEST_CHECK_INTERVAL', 30):
+        return index
+    _loaded['checked_at'] = now
+
+    stored_version = cache.get(INDEX_VERSION_KEY)
+    if index is not None and stored_version == index.version:
+        return index
+
+    # Nothing published yet (first deploy, flushed cache): build it once here
+    stored = cache.get(INDEX_KEY) or rebuild_suggest_index()
+    _loaded['index'] = SuggestIndex(stored['terms'], version=stored['version'])
+    return _loaded['index']
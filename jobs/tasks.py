@@ -1,13 +1,38 @@
+import json
 import logging
+import os
 import subprocess
-from celery import shared_task
+import sys
+import tempfile
+import time
+from celery import chord, shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from .cdn import JOB_LIST_TAG, SITEMAP_TAG, SUGGEST_TAG, purge
+from .counts import adjust_total_jobs
+from .data_version import bump_data_version, data_version
 from .models import Job
+from .suggest import INDEX_VERSION_KEY, rebuild_suggest_index
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
 
+SCRAPER_DIR = "/app/scraper_service"
+
+# LinkedIn searches of the bulk scrape: every keyword in every region
+BULK_TECH_STACK = ["Python", "JavaScript", "React", "DevOps", "Java"]
+BULK_REGIONS = ["Remote", "Europe", "United States"]
+
+# Fan-out subtasks: limits on top of each crawl's own time budget, retries per crawl
+# and how often a crawl waiting for a LinkedIn slot checks again (seconds)
+CRAWL_SOFT_LIMIT_GRACE = 90
+CRAWL_HARD_LIMIT_GRACE = 120
+CRAWL_RETRIES = 2
+SCRAPE_SLOT_WAIT = 30
+
 
 @shared_task
 def run_scrapers(keyword='Python', location='Europe'):
@@ -56,84 +81,182 @@ def run_scrapers(keyword='Python', location='Europe'):
     except Exception as e:
         logger.error(f"❌ LinkedIn Scrape Failed: {str(e)}")
 
+    refresh_suggestions()
     return f"Scraping Finished. Sources: {', '.join(results)}"
 
 
-@shared_task
-def run_bulk_scrape():
+def run_crawl_batch(crawls):
     """
-    Scheduled Task: Runs periodically (e.g., every 6 hours).
-    Populates the database with a wide variety of jobs from ALL sources.
+    Runs all `crawls` side by side in ONE child process (scraper_service.runner)
+    and returns its per-crawl results. A fresh process per batch is needed
+    because a Twisted reactor cannot be restarted inside the same worker.
+    Its logs go straight to the worker's stderr instead of being buffered here.
     """
-    results = []
+    # Hard limit: the old serial worst case. The runner closes each crawl on its own budget well before that.
+    hard_limit = sum(crawl['timeout'] for crawl in crawls) + 60
 
-    # Define a helper to run scrapers safely
-    def run_spider(spider_name, timeout=120):
-        try:
-            logger.info(f"🚀 [Bulk] Starting {spider_name}...")
-            # Capture output to prevent log flooding, but check for errors
-            subprocess.run(
-                ["scrapy", "crawl", spider_name],
-                cwd="/app/scraper_service",
-                timeout=timeout,
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            results.append(spider_name)
-            logger.info(f"✅ [Bulk] {spider_name} Finished")
-        except subprocess.TimeoutExpired:
-            logger.error(f"⚠️ [Bulk] {spider_name} Timed Out")
-        except subprocess.CalledProcessError as e:
-            # Decode stderr safely to log the actual error message
-            error_msg = e.stderr.decode(errors='replace') if e.stderr else "Unknown error"
-            logger.error(f"❌ [Bulk] {spider_name} Failed: {error_msg}")
+    with tempfile.TemporaryDirectory() as tmp:
+        crawls_path, results_path = os.path.join(tmp, 'crawls.json'), os.path.join(tmp, 'results.json')
+        with open(crawls_path, 'w', encoding='utf-8') as f:
+            json.dump(crawls, f)
 
+        subprocess.run(
+            [sys.executable, "-m", "scraper_service.runner", crawls_path, results_path],
+            cwd=SCRAPER_DIR,
+            timeout=hard_limit,
+            check=True,
+        )
+        with open(results_path, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def bulk_scrape_crawls():
+    """Every crawl of the scheduled bulk scrape, with its time budget in seconds."""
     # --- PART 1: The Reliable APIs (FAST & SAFE) ---
     # These use public APIs or RSS feeds. They almost never fail.
-    run_spider("wwr")        # We Work Remotely
-    run_spider("remoteok")   # RemoteOK
-    run_spider("pyjobs")     # PyJobs
-    run_spider("themuse")    # <--- NEW: The Muse (High quality, API-based)
-    run_spider("glassdoor", timeout=600)
+    crawls = [
+        {'name': 'wwr', 'spider': 'wwr', 'timeout': 120},            # We Work Remotely
+        {'name': 'remoteok', 'spider': 'remoteok', 'timeout': 120},  # RemoteOK
+        {'name': 'pyjobs', 'spider': 'pyjobs', 'timeout': 120},      # PyJobs
+        {'name': 'themuse', 'spider': 'themuse', 'timeout': 120},    # The Muse (High quality, API-based)
+        {'name': 'glassdoor', 'spider': 'glassdoor', 'timeout': 600, 'retries': 1},
+    ]
     # --- PART 2: The "Hard" Scrapers (Browser Automation) ---
     # These often require residential proxies or get IP-blocked on cloud servers.
-    # We disable them by default to ensure the bulk task finishes successfully.
-    # If you buy a proxy service later, you can uncomment these.
-    # run_spider("glassdoor", timeout=180)
-    # run_spider("indeed", timeout=180)
+    # Indeed stays disabled; add {'name': 'indeed', 'spider': 'indeed', 'timeout': 180} with a proxy service.
 
     # --- PART 3: LinkedIn (The Heavy Lifter) ---
     # LinkedIn is tougher than APIs but easier than Indeed. We keep it active.
-    tech_stack = ["Python", "JavaScript", "React", "DevOps", "Java"]
-    regions = ["Remote", "Europe", "United States"]
-
-    for tech in tech_stack:
-        for region in regions:
-            task_name = f"LI:{tech}-{region}"
-            try:
-                # logger.info(f"🔎 [Bulk] LinkedIn: {tech} in {region}")
-                subprocess.run(
-                    [
-                        "scrapy", "crawl", "linkedin",
-                        "-a", f"keyword={tech}",
-                        "-a", f"location={region}"
-                    ],
-                    cwd="/app/scraper_service",
-                    timeout=120,
-                    check=True,
-                    stdout=subprocess.DEVNULL, # Silence standard output
-                    stderr=subprocess.PIPE     # Capture errors only
-                )
-                results.append(task_name)
-            except Exception as e:
-                # We log strictly errors to keep the console clean
-                # logger.error(f"❌ Failed {task_name}: {e}")
-                pass # Fail silently for individual keywords to speed up the loop
-
-    final_report = f"Bulk Scrape Complete. Covered: {', '.join(results)}"
-    logger.info(final_report)
-    return final_report
+    # CONCURRENT_CRAWLS_PER_SPIDER caps how many of these run at once.
+    for tech in BULK_TECH_STACK:
+        for region in BULK_REGIONS:
+            crawls.append({
+                'name': f"LI:{tech}-{region}",
+                'spider': 'linkedin',
+                'kwargs': {'keyword': tech, 'location': region},
+                'timeout': 120,
+            })
+    return crawls
+
+
+def report_bulk_scrape(results, started):
+    covered = [result['name'] for result in results if not result['error']]
+    failed = [result['name'] for result in results if result['error']]
+    items = sum(result['items'] for result in results)
+    logger.info(
+        f"Bulk Scrape Complete in {time.time() - started:.0f}s: {items} items. "
+        f"Covered: {', '.join(covered)}" + (f". Failed: {', '.join(failed)}" if failed else "")
+    )
+    refresh_suggestions()
+    return results
+
+
+def failed_crawl_result(crawl, error, started):
+    """Same shape as a runner result, for a crawl whose process never reported back."""
+    return {
+        'name': crawl['name'], 'spider': crawl['spider'], 'items': 0, 'errors': 1,
+        'inserted': 0, 'updated': 0, 'refreshed': 0, 'unchanged': 0,
+        'finish_reason': 'error', 'duration': round(time.monotonic() - started, 1), 'error': error,
+    }
+
+
+def acquire_scrape_slot(spider, ttl):
+    """
+    Takes one of the SCRAPE_SLOTS_PER_SPIDER slots of `spider` in the shared cache
+    and returns its key, or None when all of them are busy. cache.add is atomic
+    in Redis, so two workers never get the same slot. Slots expire after `ttl`
+    seconds so a killed worker cannot hold one forever.
+    """
+    for slot in range(settings.SCRAPE_SLOTS_PER_SPIDER[spider]):
+        key = f"scrape-slot:{spider}:{slot}"
+        if cache.add(key, 1, timeout=ttl):
+            return key
+    return None
+
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
+def run_crawl(self, crawl, failures=0):
+    """
+    Fan-out subtask of the bulk scrape: one crawl in its own child process.
+    - Waits for a free slot (by retrying) when its spider is capped in SCRAPE_SLOTS_PER_SPIDER.
+    - Retries a failed crawl up to crawl['retries'] times with exponential backoff.
+    - Always ends with a result, even a failed one, so the chord callback still runs.
+    """
+    slot = None
+    if crawl['spider'] in settings.SCRAPE_SLOTS_PER_SPIDER:
+        slot = acquire_scrape_slot(crawl['spider'], ttl=crawl['timeout'] + CRAWL_HARD_LIMIT_GRACE)
+        if slot is None:
+            raise self.retry(countdown=SCRAPE_SLOT_WAIT)  # Waiting for a slot is not a failure
+
+    started = time.monotonic()
+    try:
+        result = run_crawl_batch([crawl])[0]
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, SoftTimeLimitExceeded) as e:
+        # subprocess.run kills the crawl process before these reach us
+        result = failed_crawl_result(crawl, f"{type(e).__name__}: {e}", started)
+    finally:
+        if slot:
+            cache.delete(slot)
+
+    if result['error'] and failures < crawl.get('retries', CRAWL_RETRIES):
+        logger.warning(f"⚠️ [Bulk] {crawl['name']} failed ({result['error']}), retry {failures + 1}")
+        # A retry reuses the request's positional args unless given new ones: crawl goes there, not in kwargs
+        raise self.retry(args=[crawl], kwargs={'failures': failures + 1}, countdown=60 * 2 ** failures)
+    return result
+
+
+@shared_task
+def summarize_bulk_scrape(results, started):
+    """Chord callback: every crawl of the bulk scrape has reported."""
+    return report_bulk_scrape(results, started)
+
+
+@shared_task
+def run_bulk_scrape(fan_out=True):
+    """
+    Scheduled Task: Runs periodically (e.g., every 6 hours).
+    Populates the database with a wide variety of jobs from ALL sources.
+
+    fan_out=True: one run_crawl subtask per source and per LinkedIn (keyword, region),
+    dispatched as a chord, so every free worker picks up crawls; summarize_bulk_scrape
+    aggregates their results. Each subtask has its own time limits and retries.
+    fan_out=False: all crawls run concurrently in one process on this worker and
+    the per-crawl results are returned directly.
+    """
+    crawls = bulk_scrape_crawls()
+    started = time.time()
+
+    if not fan_out:
+        try:
+            results = run_crawl_batch(crawls)
+        except subprocess.TimeoutExpired:
+            logger.error("⚠️ [Bulk] Crawl runner Timed Out")
+            raise
+        except subprocess.CalledProcessError as e:
+            logger.error(f"❌ [Bulk] Crawl runner Failed with exit code {e.returncode}")
+            raise
+        return report_bulk_scrape(results, started)
+
+    subtasks = [
+        run_crawl.s(crawl).set(
+            soft_time_limit=crawl['timeout'] + CRAWL_SOFT_LIMIT_GRACE,
+            time_limit=crawl['timeout'] + CRAWL_HARD_LIMIT_GRACE,
+        )
+        for crawl in crawls
+    ]
+    result = chord(subtasks)(summarize_bulk_scrape.s(started))
+    logger.info(f"🚀 [Bulk] Dispatched {len(crawls)} crawls")
+    return result.id
+
+
+@shared_task
+def refresh_suggestions():
+    """After an ingest: rebuilds the typeahead index (jobs.suggest) if the jobs changed since the last build."""
+    if cache.get(INDEX_VERSION_KEY) == data_version():
+        return "Suggest index up to date"
+    rebuild_suggest_index()
+    purge([SUGGEST_TAG])
+    return "Suggest index rebuilt"
 
 
 @shared_task
@@ -142,7 +265,13 @@ def cleanup_old_jobs():
     Janitor Task: Deletes jobs posted more than 30 days ago.
     """
     cutoff_date = timezone.now().date() - timedelta(days=30)
-    deleted_count, _ = Job.objects.filter(posted_at__lt=cutoff_date).delete()
+    deleted_count, deleted_per_model = Job.objects.filter(posted_at__lt=cutoff_date).delete()
+    # Cascaded SavedJob rows are in deleted_count too: only jobs leave the total
+    adjust_total_jobs(-deleted_per_model.get(Job._meta.label, 0))
+    if deleted_count:
+        bump_data_version()  # Cached API responses may list the deleted jobs
+        purge([JOB_LIST_TAG, SITEMAP_TAG])  # And so may the CDN's copies
+        refresh_suggestions()
 
     msg = f"🧹 Janitor: Deleted {deleted_count} jobs older than {cutoff_date}"
     logger.info(msg)
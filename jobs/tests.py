@@ -1,3 +1,1240 @@
-from django.test import TestCase
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+import re
+import subprocess
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.parse import urlencode
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from celery.exceptions import SoftTimeLimitExceeded
+from twisted.internet.defer import fail, succeed
+from twisted.python.failure import Failure
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from scrapy import Request
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import HtmlResponse, Response
+from scrapy.settings import Settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request as APIRequest
+from scrapy.utils.test import get_crawler
+
+from jobs.cdn import CloudflarePurgeClient
+from jobs.counts import adjust_total_jobs, count_jobs, total_jobs
+from jobs.data_version import bump_data_version, data_version
+from jobs.filters import JobFilter
+from jobs.models import SNIPPET_LENGTH, FeedSnapshot, Job, make_snippet
+from jobs.renderers import ORJSONRenderer
+from jobs.pagination import JobPageNumberPagination, KeysetPagination, after, decode_cursor, keyset_page
+from jobs.response_cache import ResponseCache, response_cache_stats
+from jobs import suggest
+from jobs.suggest import SuggestIndex, suggest_index
+from jobs import tasks
+from jobs.tasks import (
+    acquire_scrape_slot, cleanup_old_jobs, refresh_suggestions, report_bulk_scrape, run_bulk_scrape, run_crawl,
+)
+from jobs.views import JobExportAPI, JobListAPI
+from scraper_service.scraper_service.items import JobItem
+from scraper_service.scraper_service.middlewares import ConditionalFeedMiddleware, KnownJobMiddleware
+from scraper_service.scraper_service.pipelines import ScraperServicePipeline
+from scraper_service.scraper_service.runner import run_crawls
+from scraper_service.scraper_service.spiders.linkedin import LinkedInSpider
+from scraper_service.scraper_service.throttle import AdaptiveThrottle, retry_after_seconds
+
+
+class FakeStats(dict):
+    def inc_value(self, key, count=1):
+        self[key] = self.get(key, 0) + count
+
+
+class FakeSpider:
+    logger = logging.getLogger(__name__)
+
+
+def make_item(**overrides):
+    item = {
+        'url': "https://example.com/jobs/1",
+        'title': "Senior Python Developer",
+        'company': "Acme Corp",
+        'location': "Remote",
+        'source': "LinkedIn",
+        'posted_at': date(2026, 1, 5),
+        'description': "We use Django and PostgreSQL. Salary: $120k - $150k per year.",
+    }
+    item.update(overrides)
+    return item
+
+
+class PipelineTestMixin:
+    """Runs the real pipeline against the test database; subclasses pick the mode."""
+    batch_size = 0
+
+    def crawl(self, *items, freshness_days=0):
+        """One simulated crawl: open, feed the items in order, close. Returns the stats."""
+        stats = FakeStats()
+        pipeline = ScraperServicePipeline(stats=stats, batch_size=self.batch_size, freshness_days=freshness_days)
+        spider = FakeSpider()
+
+        async def run():
+            pipeline.open_spider(spider)
+            for item in items:
+                await pipeline.process_item(item, spider)
+            await pipeline.close_spider(spider)
+
+        async_to_sync(run)()
+        return stats
+
+    def test_insert(self):
+        stats = self.crawl(make_item())
+
+        job = Job.objects.get(url="https://example.com/jobs/1")
+        self.assertEqual(job.seniority, "Senior")
+        self.assertEqual((job.salary_min, job.salary_max, job.currency), (120000, 150000, "USD"))
+        self.assertIn("Django", job.skills)
+        self.assertEqual(len(job.content_hash), 64)
+        self.assertEqual(job.description_snippet, "We use Django and PostgreSQL. Salary: $120k - $150k per year.")
+        self.assertEqual(stats['pipeline/jobs_inserted'], 1)
+
+    def test_update(self):
+        self.crawl(make_item())
+        created_at = Job.objects.get().created_at
+
+        stats = self.crawl(make_item(description="We use Java and Kubernetes."))
+
+        job = Job.objects.get()
+        self.assertIn("Java", job.skills)
+        self.assertNotIn("Django", job.skills)
+        self.assertIsNone(job.salary_min)
+        self.assertEqual(job.created_at, created_at)
+        self.assertEqual(stats['pipeline/jobs_updated'], 1)
+
+    def test_unchanged_job_is_not_rewritten(self):
+        self.crawl(make_item())
+        Job.objects.update(skills=["Sentinel"])  # Would be overwritten by a re-analysis
+
+        stats = self.crawl(make_item(description="  We use Django and PostgreSQL.\nSalary: $120k - $150k per year. "))
+
+        self.assertEqual(Job.objects.get().skills, ["Sentinel"])
+        self.assertEqual(stats['pipeline/jobs_unchanged'], 1)
+        self.assertFalse(stats.get('pipeline/jobs_updated'))
+
+    def test_recased_job_is_rewritten(self):
+        self.crawl(make_item())
+
+        stats = self.crawl(make_item(title="Senior PYTHON Developer"))
+
+        self.assertEqual(Job.objects.get().title, "Senior PYTHON Developer")
+        self.assertEqual(stats['pipeline/jobs_updated'], 1)
+
+    def test_unchanged_job_gets_new_posted_at(self):
+        self.crawl(make_item())
+        Job.objects.update(skills=["Sentinel"])
+
+        stats = self.crawl(make_item(posted_at=date(2026, 2, 1)))
+
+        job = Job.objects.get()
+        self.assertEqual(job.posted_at, date(2026, 2, 1))
+        self.assertEqual(job.skills, ["Sentinel"])  # Metadata-only: no re-analysis
+        self.assertEqual(stats['pipeline/jobs_refreshed'], 1)
+
+    def test_card_of_a_known_job_only_refreshes_it(self):
+        self.crawl(make_item())
+        Job.objects.update(skills=["Sentinel"], checked_at=timezone.now() - timedelta(days=30))
+
+        card = make_item(title="Python", description=None, posted_at=date(2026, 2, 1), refresh_only=True)
+        stats = self.crawl(card, freshness_days=7)
+
+        job = Job.objects.get()
+        self.assertEqual((job.title, job.posted_at, job.skills), ("Senior Python Developer", date(2026, 2, 1), ["Sentinel"]))
+        self.assertIn("Django", job.description)
+        self.assertLess(job.checked_at, timezone.now() - timedelta(days=29))  # The posting was not read
+        self.assertEqual(stats['pipeline/jobs_refreshed'], 1)
+
+    def test_card_of_an_unknown_job_is_skipped(self):
+        stats = self.crawl(make_item(description=None, refresh_only=True))
+
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(stats['pipeline/jobs_skipped'], 1)
+
+    def test_unchanged_job_is_checked_once_per_window(self):
+        self.crawl(make_item())
+        self.assertIsNotNone(Job.objects.get().checked_at)
+
+        Job.objects.update(checked_at=timezone.now() - timedelta(days=30))
+        stats = self.crawl(make_item(), freshness_days=7)
+        self.assertGreater(Job.objects.get().checked_at, timezone.now() - timedelta(minutes=1))
+        self.assertEqual(stats['pipeline/jobs_unchanged'], 1)
+
+        checked_at = timezone.now() - timedelta(days=2)
+        Job.objects.update(checked_at=checked_at)
+        self.crawl(make_item(), freshness_days=7)
+        self.assertEqual(Job.objects.get().checked_at, checked_at)  # Still fresh: not rewritten
+
+    def test_duplicate_url_in_one_crawl(self):
+        self.crawl(
+            make_item(description="We use Django."),
+            make_item(description="We use Rust."),
+        )
+
+        skills = Job.objects.get().skills
+        self.assertIn("Rust", skills)  # The last version wins
+        self.assertNotIn("Django", skills)
+
+    def test_missing_url_is_skipped(self):
+        self.crawl(make_item(url=None), make_item(url=""))
+
+        self.assertFalse(Job.objects.exists())
+
+    def test_inserts_bump_the_cached_total(self):
+        cache.clear()
+        self.crawl(make_item())
+        self.assertEqual(total_jobs(), (1, False))
+
+        self.crawl(make_item(description="We use Rust."), make_item(url="https://example.com/jobs/2"))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(total_jobs(), (2, False))
+
+    def test_writes_bump_the_data_version(self):
+        version = data_version()
+        self.crawl(make_item())
+        self.assertGreater(data_version(), version)
+
+        version = data_version()
+        self.crawl(make_item())  # Unchanged: nothing to invalidate
+        self.assertEqual(data_version(), version)
+
+    @patch('scraper_service.scraper_service.pipelines.purge')
+    def test_writes_purge_the_cdn(self, purge):
+        self.crawl(make_item())
+        self.assertEqual(purge.call_args.args[0], {"jobs-list", "sitemap"})
+
+        pk = Job.objects.get().pk
+        self.crawl(make_item(description="We use Java."))  # Edited: only the pages showing it
+        self.assertEqual(purge.call_args.args[0], {f"job-{pk}"})
+
+        self.crawl(make_item(description="We use Java.", posted_at=date(2026, 1, 9)))  # Re-dated: moves up
+        self.assertEqual(purge.call_args.args[0], {f"job-{pk}", "jobs-list", "sitemap"})
+
+
+class PerItemPipelineTests(PipelineTestMixin, TestCase):
+    batch_size = 0
+
+
+class BulkPipelineTests(PipelineTestMixin, TestCase):
+    batch_size = 50
+
+    def test_duplicate_url_in_one_crawl(self):
+        stats = self.crawl(make_item(description="We use Django."), make_item(description="We use Rust."))
+
+        self.assertIn("Rust", Job.objects.get().skills)
+        self.assertNotIn("Django", Job.objects.get().skills)
+        self.assertEqual(stats['pipeline/jobs_inserted'], 1)
+        self.assertEqual(stats['pipeline/jobs_skipped'], 1)
+
+    def test_missing_url_is_skipped(self):
+        stats = self.crawl(make_item(url=None), make_item(url=""))
+
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(stats['pipeline/jobs_skipped'], 2)
+
+    def test_batches_are_flushed_by_size(self):
+        self.batch_size = 2
+        stats = self.crawl(*(make_item(url=f"https://example.com/jobs/{i}") for i in range(5)))
+
+        self.assertEqual(Job.objects.count(), 5)
+        self.assertEqual(stats['pipeline/flushes'], 3)  # 2 + 2 + the rest on close
+        self.assertEqual(stats['pipeline/jobs_inserted'], 5)
+
+    def test_a_bad_row_does_not_lose_the_batch(self):
+        items = [make_item(url=f"https://example.com/jobs/{i}") for i in range(3)]
+        items[1]['description'] = "Postgres refuses \x00 in text"
+
+        with self.assertLogs('scraper_service.scraper_service.pipelines', 'WARNING') as logs:
+            stats = self.crawl(*items)
+
+        self.assertEqual(sorted(Job.objects.values_list('url', flat=True)),
+                         ["https://example.com/jobs/0", "https://example.com/jobs/2"])
+        self.assertEqual(stats['pipeline/jobs_inserted'], 2)
+        self.assertEqual(stats['pipeline/jobs_failed'], 1)
+        self.assertEqual(total_jobs().value, 2)
+        self.assertIn("https://example.com/jobs/1 not saved", logs.output[-1])
+
+    def test_a_failed_batch_is_retried_in_url_order(self):
+        bulk_create = Job.objects.bulk_create
+        calls = []
+
+        def deadlock_once(jobs, **kwargs):
+            calls.append([job.url for job in jobs])
+            if len(calls) == 1:
+                raise OperationalError("deadlock detected")
+            return bulk_create(jobs, **kwargs)
+
+        items = [make_item(url=f"https://example.com/jobs/{i}") for i in (3, 1, 2)]
+        with patch.object(Job.objects, 'bulk_create', side_effect=deadlock_once), self.assertLogs(level='WARNING'):
+            stats = self.crawl(*items)
+
+        self.assertEqual(calls, [[f"https://example.com/jobs/{i}" for i in (1, 2, 3)]] * 2)
+        self.assertEqual(Job.objects.count(), 3)
+        self.assertEqual(stats['pipeline/jobs_inserted'], 3)
+
+
+def linkedin_page(job_ids, page_num=0, stale_pages=0):
+    cards = "".join(
+        f'<li><h3 class="base-search-card__title">Job {job_id}</h3>'
+        f'<a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/dev-{job_id}?ref=x"></a></li>'
+        for job_id in job_ids
+    )
+    request = Request("https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search", meta={
+        'keyword': "Python", 'location': "Remote", 'page_num': page_num, 'stale_pages': stale_pages,
+    })
+    return HtmlResponse(request.url, body=f"<ul>{cards}</ul>".encode(), encoding='utf-8', request=request)
+
+
+class LinkedInIncrementalTests(TestCase):
+    def parse(self, response, stale_pages_limit=2):
+        crawler = get_crawler(LinkedInSpider, {'INCREMENTAL_STALE_PAGES': stale_pages_limit})
+        spider = LinkedInSpider.from_crawler(crawler)
+
+        async def run():
+            return [output async for output in spider.parse_list(response)]
+
+        outputs = async_to_sync(run)()
+        next_pages = [output for output in outputs if isinstance(output, Request) and output.callback == spider.parse_list]
+        return next_pages, crawler.stats
+
+    def store(self, *job_ids):
+        for job_id in job_ids:
+            Job.objects.create(url=f"https://www.linkedin.com/jobs/view/dev-{job_id}", title="Job", company="Acme")
+
+    def test_page_with_new_jobs_resets_the_stale_count(self):
+        self.store(1, 2)
+        next_pages, stats = self.parse(linkedin_page([1, 2, 3], stale_pages=1))
+
+        self.assertEqual(next_pages[0].meta['stale_pages'], 0)
+        self.assertEqual(stats.get_value('incremental/new_urls'), 1)
+        self.assertEqual(stats.get_value('incremental/known_urls'), 2)
+
+    def test_stops_after_consecutive_known_pages(self):
+        self.store(1, 2)
+        next_pages, _ = self.parse(linkedin_page([1, 2], page_num=3))
+        self.assertEqual(next_pages[0].meta['stale_pages'], 1)
+
+        next_pages, stats = self.parse(linkedin_page([1, 2], page_num=4, stale_pages=1))
+        self.assertEqual(next_pages, [])
+        self.assertEqual(stats.get_value('incremental/stopped_at_page'), 4)
+
+    def test_full_crawl_ignores_known_jobs(self):
+        self.store(1, 2)
+        next_pages, stats = self.parse(linkedin_page([1, 2], stale_pages=5), stale_pages_limit=0)
+
+        self.assertEqual(len(next_pages), 1)
+        self.assertIsNone(stats.get_value('incremental/known_urls'))
+
+
+class KnownJobMiddlewareTests(TestCase):
+    def open_middleware(self):
+        crawler = get_crawler(LinkedInSpider, {'KNOWN_JOB_FRESHNESS_DAYS': 7})
+        middleware = KnownJobMiddleware.from_crawler(crawler)
+        async_to_sync(middleware.spider_opened)(FakeSpider())
+        return middleware, crawler.stats
+
+    def detail_request(self, job_url):
+        return Request("https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/1", meta={'job_url': job_url})
+
+    def test_recent_job_with_description_is_skipped(self):
+        Job.objects.create(url="https://example.com/jobs/1", title="Job", company="Acme", description="Django")
+        middleware, stats = self.open_middleware()
+
+        with self.assertRaises(IgnoreRequest):
+            middleware.process_request(self.detail_request("https://example.com/jobs/1"))
+        self.assertEqual(stats.get_value('known_jobs/skipped'), 1)
+
+    def test_new_stale_or_empty_jobs_are_fetched(self):
+        Job.objects.create(url="https://example.com/jobs/empty", title="Job", company="Acme", description="")
+        old = Job.objects.create(url="https://example.com/jobs/old", title="Job", company="Acme", description="Django")
+        Job.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        middleware, stats = self.open_middleware()
+
+        for url in ("https://example.com/jobs/new", "https://example.com/jobs/empty", "https://example.com/jobs/old"):
+            self.assertIsNone(middleware.process_request(self.detail_request(url)))
+        self.assertIsNone(middleware.process_request(Request("https://example.com/search")))
+        self.assertEqual(stats.get_value('known_jobs/fetched'), 3)
+
+    def test_freshness_counts_from_the_last_check(self):
+        long_ago = timezone.now() - timedelta(days=30)
+        rechecked = Job.objects.create(url="https://example.com/jobs/rechecked", title="Job", company="Acme",
+                                       description="Django", checked_at=timezone.now() - timedelta(days=1))
+        Job.objects.filter(pk=rechecked.pk).update(created_at=long_ago)
+        Job.objects.create(url="https://example.com/jobs/unchecked", title="Job", company="Acme",
+                           description="Django", checked_at=long_ago)
+        middleware, _ = self.open_middleware()
+
+        with self.assertRaises(IgnoreRequest):
+            middleware.process_request(self.detail_request("https://example.com/jobs/rechecked"))
+        self.assertIsNone(middleware.process_request(self.detail_request("https://example.com/jobs/unchecked")))
+
+    def test_skipped_detail_page_passes_the_card_on(self):
+        spider = LinkedInSpider.from_crawler(get_crawler(LinkedInSpider))
+        card = JobItem(url="https://www.linkedin.com/jobs/view/dev-1", posted_at=date(2026, 2, 1))
+        request, = spider.follow_card(card, "https://www.linkedin.com/jobs/view/dev-1?trk=x")
+
+        skipped = Failure(IgnoreRequest("Known job"))
+        skipped.request = request
+        item, = request.errback(skipped)
+        self.assertEqual((item['url'], item['refresh_only']), (card['url'], True))
+
+        timeout = Failure(TimeoutError())
+        timeout.request = request
+        self.assertIs(request.errback(timeout), timeout)
+
+
+class ConditionalFeedMiddlewareTests(TestCase):
+    feed_url = "https://weworkremotely.com/remote-jobs.rss"
+
+    def open_middleware(self):
+        crawler = get_crawler(LinkedInSpider)
+        middleware = ConditionalFeedMiddleware.from_crawler(crawler)
+        async_to_sync(middleware.spider_opened)(FakeSpider())
+        return middleware, crawler.stats
+
+    def fetch(self, middleware, status=200, body=b"<rss/>", headers=None):
+        request = Request(self.feed_url, meta={'conditional': True})
+        middleware.process_request(request)
+        response = Response(self.feed_url, status=status, body=body, headers=headers, request=request)
+        return request, middleware.process_response(request, response)
+
+    def test_validators_are_saved_when_the_crawl_finishes(self):
+        middleware, _ = self.open_middleware()
+        self.fetch(middleware, headers={'ETag': '"v1"', 'Last-Modified': "Sat, 11 Jan 2026 09:33:04 GMT"})
+        self.assertFalse(FeedSnapshot.objects.exists())
+
+        async_to_sync(middleware.spider_closed)(FakeSpider(), 'finished')
+        snapshot = FeedSnapshot.objects.get(url=self.feed_url)
+        self.assertEqual((snapshot.etag, snapshot.body_size), ('"v1"', 6))
+
+        middleware, _ = self.open_middleware()
+        request, _ = self.fetch(middleware, body=b"<rss>new</rss>")
+        self.assertEqual(request.headers['If-None-Match'], b'"v1"')
+        self.assertEqual(request.headers['If-Modified-Since'], b"Sat, 11 Jan 2026 09:33:04 GMT")
+
+    def test_not_modified_feed_is_not_parsed(self):
+        FeedSnapshot.objects.create(url=self.feed_url, etag='"v1"', body_size=6000)
+        middleware, stats = self.open_middleware()
+
+        with self.assertRaises(IgnoreRequest):
+            self.fetch(middleware, status=304, body=b"")
+        self.assertEqual(stats.get_value('conditional/not_modified'), 1)
+        self.assertEqual(stats.get_value('conditional/bytes_saved'), 6000)
+
+    def test_identical_body_is_not_parsed(self):
+        FeedSnapshot.objects.create(url=self.feed_url, body_hash=hashlib.sha256(b"<rss/>").hexdigest())
+        middleware, stats = self.open_middleware()
+
+        with self.assertRaises(IgnoreRequest):
+            self.fetch(middleware)
+        self.assertEqual(stats.get_value('conditional/unchanged_body'), 1)
+        self.assertEqual(stats.get_value('conditional/parses_saved'), 1)
+
+    def test_failed_crawl_keeps_the_old_snapshot(self):
+        middleware, _ = self.open_middleware()
+        _, response = self.fetch(middleware)
+        self.assertEqual(response.status, 200)
+
+        async_to_sync(middleware.spider_closed)(FakeSpider(), 'closespider_timeout')
+        self.assertFalse(FeedSnapshot.objects.exists())
+
+
+class AdaptiveThrottleTests(TestCase):
+    def setUp(self):
+        crawler = get_crawler(LinkedInSpider, {
+            'THROTTLE_ENABLED': True,
+            'DOWNLOAD_DELAY': 3,
+            'DOWNLOAD_SLOTS': {'api.example.com': {'concurrency': 4, 'delay': 0.25}},
+            'THROTTLE_MAX_DELAY': 60,
+        })
+        self.throttle = AdaptiveThrottle.from_crawler(crawler)
+
+    def test_delay_never_drops_below_the_domain_profile(self):
+        self.assertEqual(self.throttle.latency_delay(0.25, 'api.example.com', 0.1, 4), 0.25)
+        self.assertEqual(self.throttle.latency_delay(3, 'html.example.com', 0.1, 1), 3)
+
+    def test_slow_server_raises_the_delay_at_once(self):
+        self.assertEqual(self.throttle.latency_delay(0.25, 'api.example.com', 4.0, 4), 1.0)
+
+    def test_rate_limit_backs_off_and_raises_the_floor(self):
+        self.assertEqual(self.throttle.backoff_delay(0.25, 'api.example.com'), 0.5)
+        self.assertEqual(self.throttle.backoff_delay(0.5, 'api.example.com', retry_after=30), 30)
+        self.assertEqual(self.throttle.backoff_delay(50, 'api.example.com'), 60)
+        self.assertGreater(self.throttle.min_delay('api.example.com'), 0.25)
+
+    def test_recovery_is_gradual(self):
+        delay = self.throttle.latency_delay(10, 'api.example.com', 0.1, 4)
+        self.assertTrue(0.25 < delay < 10)
+
+    def test_retry_after(self):
+        def rate_limited(retry_after):
+            return Response("https://api.example.com", status=429, headers={'Retry-After': retry_after})
+
+        self.assertEqual(retry_after_seconds(rate_limited("120")), 120)
+        self.assertIsNone(retry_after_seconds(rate_limited("Wed, 21 Oct 2026 07:28:00 GMT")))
+
+
+class FakeCrawlerProcess:
+    """CrawlerProcess without a reactor: crawls end at once, "broken" ones fail, unknown spiders raise."""
+    spiders = ('linkedin', 'wwr')
+
+    def __init__(self, settings):
+        self.started = []
+
+    def create_crawler(self, spider):
+        if spider not in self.spiders:
+            raise KeyError(f"Spider not found: {spider}")
+        stats = FakeStats(item_scraped_count=3, finish_reason='finished')
+        return SimpleNamespace(settings=Settings(), stats=SimpleNamespace(get_stats=lambda: stats))
+
+    def crawl(self, crawler, **kwargs):
+        self.started.append(kwargs)
+        return fail(RuntimeError("boom")) if kwargs.get('broken') else succeed(None)
+
+    def start(self, stop_after_crawl=True):
+        pass
+
+
+@patch('twisted.internet.reactor.stop')
+@patch('scraper_service.scraper_service.runner.CrawlerProcess', FakeCrawlerProcess)
+class CrawlRunnerTests(TestCase):
+    settings = Settings({'CONCURRENT_CRAWLS_PER_SPIDER': {'linkedin': 1}})
+
+    def crawl(self, name, spider='linkedin', **kwargs):
+        return {'name': name, 'spider': spider, 'kwargs': kwargs, 'timeout': 60}
+
+    def test_every_crawl_gets_a_result(self, _):
+        results = run_crawls([self.crawl("LI:1"), self.crawl("LI:2"), self.crawl("WWR", 'wwr')], self.settings)
+        self.assertEqual([result['name'] for result in results], ["LI:1", "LI:2", "WWR"])
+        self.assertEqual([result['items'] for result in results], [3, 3, 3])
+        self.assertTrue(all(result['error'] is None for result in results))
+
+    def test_a_crawl_that_cannot_start_is_reported_failed(self, _):
+        results = run_crawls([self.crawl("Gone", 'gone'), self.crawl("LI")], self.settings)
+        self.assertIn("Spider not found", results[0]['error'])
+        self.assertEqual((results[0]['items'], results[0]['finish_reason']), (0, 'error'))
+        self.assertIsNone(results[1]['error'])
+
+        with self.assertLogs('jobs.tasks', 'INFO') as logs, patch('jobs.tasks.refresh_suggestions'):
+            report_bulk_scrape(results, 0)
+        self.assertIn("Failed: Gone", logs.output[0])
+
+    def test_a_failed_crawl_keeps_its_slot_from_blocking_the_others(self, _):
+        results = run_crawls([self.crawl("LI:1", broken=True), self.crawl("LI:2")], self.settings)
+        self.assertEqual(results[0]['error'], "boom")
+        self.assertIsNone(results[1]['error'])
+
+
+def runner_result(crawl, error=None):
+    return {
+        'name': crawl['name'], 'spider': crawl['spider'], 'items': 0 if error else 5, 'errors': int(bool(error)),
+        'inserted': 0 if error else 5, 'updated': 0, 'refreshed': 0, 'unchanged': 0,
+        'finish_reason': 'error' if error else 'finished', 'duration': 1.0, 'error': error,
+    }
+
+
+@override_settings(SCRAPE_SLOTS_PER_SPIDER={'linkedin': 1})
+class BulkScrapeTaskTests(TestCase):
+    """The fan-out tasks, run eagerly: run_crawl_batch (the child process) is mocked."""
+
+    def setUp(self):
+        cache.clear()  # Scrape slots
+        conf = run_crawl.app.conf
+        self.addCleanup(setattr, conf, 'task_always_eager', conf.task_always_eager)
+        conf.task_always_eager = True
+
+        self.crawl = {'name': "LI:Python-Remote", 'spider': 'linkedin', 'kwargs': {'keyword': "Python"}, 'timeout': 60}
+        self.retry = patch.object(run_crawl, 'retry', wraps=run_crawl.retry).start()
+        self.addCleanup(patch.stopall)
+
+    def run_crawl(self, crawl, batch):
+        with patch('jobs.tasks.run_crawl_batch', side_effect=batch) as run_crawl_batch:
+            result = run_crawl.apply(args=[crawl]).get()
+        return result, run_crawl_batch
+
+    def test_slots_are_exclusive_and_expire(self):
+        key = acquire_scrape_slot('linkedin', ttl=60)
+        self.assertEqual(key, "scrape-slot:linkedin:0")
+        self.assertIsNone(acquire_scrape_slot('linkedin', ttl=60))
+        cache.delete(key)
+        self.assertEqual(acquire_scrape_slot('linkedin', ttl=60), key)
+
+    def test_waits_for_a_slot_then_releases_it(self):
+        slots = [None, "scrape-slot:linkedin:0"]
+        with patch('jobs.tasks.acquire_scrape_slot', side_effect=lambda *_, **__: slots.pop(0)):
+            cache.set("scrape-slot:linkedin:0", 1)
+            result, run_crawl_batch = self.run_crawl(self.crawl, lambda crawls: [runner_result(crawls[0])])
+
+        self.assertIsNone(result['error'])
+        run_crawl_batch.assert_called_once_with([self.crawl])
+        # Waiting is not a failure: same attempt count, short fixed wait
+        self.retry.assert_called_once_with(countdown=tasks.SCRAPE_SLOT_WAIT)
+        self.assertIsNone(cache.get("scrape-slot:linkedin:0"))
+
+    def test_unlimited_spiders_take_no_slot(self):
+        crawl = {'name': "wwr", 'spider': 'wwr', 'timeout': 60}
+        with patch('jobs.tasks.acquire_scrape_slot') as acquire:
+            result, _ = self.run_crawl(crawl, lambda crawls: [runner_result(crawls[0])])
+        acquire.assert_not_called()
+        self.assertIsNone(result['error'])
+
+    def test_failed_crawl_is_retried_with_backoff(self):
+        outcomes = ["boom", "boom", None]
+        result, run_crawl_batch = self.run_crawl(
+            self.crawl, lambda crawls: [runner_result(crawls[0], error=outcomes.pop(0))],
+        )
+        self.assertIsNone(result['error'])
+        self.assertEqual(run_crawl_batch.call_count, 3)
+        self.assertEqual([call.kwargs['countdown'] for call in self.retry.call_args_list], [60, 120])
+        self.assertEqual([call.kwargs['kwargs']['failures'] for call in self.retry.call_args_list], [1, 2])
+        self.assertIsNone(cache.get("scrape-slot:linkedin:0"))
+
+    def test_gives_up_after_the_crawl_retries(self):
+        crawl = dict(self.crawl, retries=1)
+        result, run_crawl_batch = self.run_crawl(crawl, lambda crawls: [runner_result(crawls[0], error="boom")])
+        self.assertEqual(result['error'], "boom")
+        self.assertEqual(run_crawl_batch.call_count, 2)
+
+    def test_a_dead_crawl_process_still_gives_a_result(self):
+        crawl = dict(self.crawl, retries=0)
+        for error in (
+            subprocess.CalledProcessError(1, "runner"),
+            subprocess.TimeoutExpired("runner", 180),
+            SoftTimeLimitExceeded(),
+        ):
+            with self.subTest(error=type(error).__name__):
+                result, _ = self.run_crawl(crawl, error)
+                self.assertTrue(result['error'].startswith(type(error).__name__))
+                self.assertEqual((result['name'], result['items'], result['finish_reason']),
+                                 (crawl['name'], 0, 'error'))
+                self.assertIsNone(cache.get("scrape-slot:linkedin:0"))
+
+    @patch('jobs.tasks.refresh_suggestions')
+    def test_chord_aggregates_every_crawl(self, refresh):
+        crawls = [self.crawl, {'name': "wwr", 'spider': 'wwr', 'timeout': 60, 'retries': 0}]
+
+        def batch(crawls):
+            return [runner_result(crawls[0], error="boom" if crawls[0]['spider'] == 'wwr' else None)]
+
+        with patch('jobs.tasks.bulk_scrape_crawls', return_value=crawls), \
+                patch('jobs.tasks.run_crawl_batch', side_effect=batch), \
+                patch('jobs.tasks.report_bulk_scrape', wraps=report_bulk_scrape) as report:
+            run_bulk_scrape.apply().get()
+
+        results = report.call_args.args[0]
+        self.assertEqual([(result['name'], result['error']) for result in results],
+                         [("LI:Python-Remote", None), ("wwr", "boom")])
+        refresh.assert_called_once()
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()  # Throttle counters
+        Job.objects.create(url="https://example.com/1", title="Backend Engineer", company="Acme",
+                           description="We use Python every day.", posted_at=date(2026, 1, 9))
+        Job.objects.create(url="https://example.com/2", title="Senior Python Developer", company="Acme",
+                           posted_at=date(2026, 1, 1))
+        Job.objects.create(url="https://example.com/3", title="Frontend Engineer", company="Acme",
+                           skills=["React"], posted_at=date(2026, 1, 10))
+
+    def search(self, term):
+        response = self.client.get("/api/jobs/", {'search': term}, HTTP_ACCEPT="application/json")
+        return [job['url'] for job in response.json()['results']]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search("python"), ["https://example.com/2", "https://example.com/1"])
+
+    def test_search_uses_stemming_and_skills(self):
+        self.assertEqual(self.search("developers"), ["https://example.com/2"])
+        self.assertEqual(self.search("react"), ["https://example.com/3"])
+
+    def test_search_uses_the_gin_index(self):
+        view = JobListAPI()
+        view.request = APIRequest(RequestFactory().get("/api/jobs/", {'search': "python developer"}))
+        with connection.cursor() as cursor:
+            # Three rows are cheaper to scan than to look up: make the planner show its index path
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = view.get_queryset().explain()
+        self.assertIn("jobs_job_search_vector_gin", plan)
+
+
+class JobFilterTests(TestCase):
+    def setUp(self):
+        Job.objects.create(url="https://example.com/1", title="Senior Rust Engineer", company="Acme",
+                           location="Sofia, Bulgaria", source="LinkedIn", seniority="Senior")
+        Job.objects.create(url="https://example.com/2", title="Python Developer", company="Trusty Labs",
+                           location="Remote", source="RemoteOK", seniority="Mid-Level")
+
+    def filtered(self, **params):
+        return JobFilter(data=params, queryset=Job.objects.order_by('url')).qs
+
+    def urls(self, **params):
+        return [job.url for job in self.filtered(**params)]
+
+    def test_substring_filters(self):
+        self.assertEqual(self.urls(title="rust"), ["https://example.com/1"])
+        self.assertEqual(self.urls(company="RUST"), ["https://example.com/2"])
+        self.assertEqual(self.urls(location="bulg"), ["https://example.com/1"])
+
+    def test_prefix_filters(self):
+        self.assertEqual(self.urls(source="linked"), ["https://example.com/1"])
+        self.assertEqual(self.urls(seniority="mid"), ["https://example.com/2"])
+        self.assertEqual(self.urls(source="edin"), [])  # Prefix, not substring
+
+    def test_filters_use_their_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for params, index in (({'title': "rust"}, "jobs_job_title_trgm"),
+                              ({'company': "rust"}, "jobs_job_company_trgm"),
+                              ({'location': "sofia"}, "jobs_job_location_trgm"),
+                              ({'source': "linked"}, "jobs_job_source_prefix"),
+                              ({'seniority': "senior"}, "jobs_job_seniority_prefix")):
+            self.assertIn(index, self.filtered(**params).order_by().explain(), params)
+
+
+class SkillsFilterTests(TestCase):
+    def setUp(self):
+        for index, skills in enumerate((["Java", "Spring"], ["JavaScript", "React"], ["Python", "Django", "C++"],
+                                        ["python", "FastAPI"], [])):
+            Job.objects.create(url=f"https://example.com/{index}", title="Job", company="Acme", skills=skills)
+
+    def urls(self, **params):
+        return sorted(job.url for job in JobFilter(data=params, queryset=Job.objects.all()).qs)
+
+    def test_exact_skill_names(self):
+        self.assertEqual(self.urls(skills="java"), ["https://example.com/0"])
+        self.assertEqual(self.urls(skills="Python"), ["https://example.com/2", "https://example.com/3"])
+        self.assertEqual(self.urls(skills="c++"), ["https://example.com/2"])
+        self.assertEqual(self.urls(skills="Jav"), [])
+
+    def test_all_and_any(self):
+        self.assertEqual(self.urls(skills="python, django"), ["https://example.com/2"])
+        self.assertEqual(self.urls(skills_any="spring,react"), ["https://example.com/0", "https://example.com/1"])
+
+    def test_same_results_as_the_old_regex_filter(self):
+        for skill in ("Java", "javascript", "PYTHON", "Django", "C++", "Go"):
+            old = sorted(job.url for job in Job.objects.filter(skills__iregex=f'"{re.escape(skill)}"'))
+            self.assertEqual(self.urls(skills=skill), old, skill)
+
+    def test_skills_filter_uses_the_gin_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for params in ({'skills': "python,django"}, {'skills_any': "go,rust"}):
+            plan = JobFilter(data=params, queryset=Job.objects.all()).qs.explain()
+            self.assertIn("jobs_job_skill_tags_gin", plan)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()  # Throttle counters
+        # Ties on posted_at and a job without a date, which sorts first
+        for index, posted_at in enumerate([date(2026, 1, 10), date(2026, 1, 10), date(2026, 1, 9), None,
+                                           date(2026, 1, 10), date(2026, 1, 1), date(2026, 1, 9)]):
+            Job.objects.create(url=f"https://example.com/{index}", title=f"Python Developer {index}",
+                               company="Acme", posted_at=posted_at)
+
+    def walk(self, params, page_size=2):
+        """Follows the next links from the first page, returns every URL seen and the queries run."""
+        urls, queries = [], []
+        next_link = "/api/jobs/?" + urlencode({**params, 'pagination': 'cursor'})
+        while next_link:
+            with CaptureQueriesContext(connection) as captured, patch.object(KeysetPagination, 'page_size', page_size):
+                response = self.client.get(next_link, HTTP_ACCEPT="application/json")
+            self.assertEqual(response.status_code, 200)
+            urls += [job['url'] for job in response.json()['results']]
+            queries += [query['sql'] for query in captured.captured_queries]
+            next_link = response.json()['next']
+        return urls, queries
+
+    def test_walks_every_job_once_in_order(self):
+        urls, queries = self.walk({})
+        expected = [job.url for job in Job.objects.order_by('-posted_at', '-id')]
+        self.assertEqual(urls, expected)
+        self.assertEqual(urls[0], "https://example.com/3")  # NULL first, like ORDER BY posted_at DESC
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+        # Page size 1: the first cursor points at the job without a date
+        self.assertEqual(self.walk({}, page_size=1)[0], expected)
+
+    def test_page_size_is_not_a_client_parameter(self):
+        for params in ({'page_size': 1}, {'pagination': "cursor", 'page_size': 1}):
+            response = self.client.get("/api/jobs/", params, HTTP_ACCEPT="application/json")
+            self.assertEqual(len(response.json()['results']), 7)
+
+    def test_walks_search_results_by_rank(self):
+        urls, _ = self.walk({'search': "python"})
+        view = JobListAPI()
+        view.request = APIRequest(RequestFactory().get("/api/jobs/", {'search': "python"}))
+        self.assertEqual(urls, [job.url for job in view.get_queryset()])
+        self.assertEqual(len(urls), 7)
+
+    def test_page_numbers_stay_the_default(self):
+        response = self.client.get("/api/jobs/", HTTP_ACCEPT="application/json")
+        self.assertEqual(response.json()['count'], 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/jobs/", {'pagination': 'cursor', 'cursor': "garbage"},
+                                   HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 404)
+
+    def test_seeks_on_the_posted_at_id_index(self):
+        queryset = Job.objects.order_by('-posted_at', '-id')
+        _, cursor = keyset_page(queryset, None, 2)
+        with connection.cursor() as db:
+            db.execute("SET LOCAL enable_seqscan = off")
+        keys = ['posted_at', 'id']
+        plan = queryset.filter(after(keys, decode_cursor(queryset, keys, cursor)))[:3].explain()
+        self.assertIn("jobs_job_posted_at_id", plan)
+        self.assertIn("Index Cond: (ROW(posted_at, id) < ROW(", plan)
+
+    def test_job_board_infinite_scroll(self):
+        response = self.client.get("/jobs/", {'q': "python"})
+        self.assertEqual(len(response.context['jobs']), 7)
+        self.assertIsNone(response.context['next_url'])
+
+        for index in range(20):
+            Job.objects.create(url=f"https://example.com/more/{index}", title="Python Developer", company="Acme",
+                               posted_at=date(2025, 12, 1))
+        response = self.client.get("/jobs/", {'q': "python"})
+        self.assertEqual(len(response.context['jobs']), 20)
+        more = self.client.get(response.context['next_url'], HTTP_HX_REQUEST="true")
+        self.assertTemplateUsed(more, 'core/partials/job_cards.html')
+        self.assertTemplateNotUsed(more, 'core/partials/job_results.html')
+        self.assertEqual(len(more.context['jobs']), 7)
+        self.assertFalse({job.id for job in more.context['jobs']} & {job.id for job in response.context['jobs']})
+
+
+class JobCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(5):
+            Job.objects.create(url=f"https://example.com/{index}", title="Python Developer", company="Acme",
+                               source="LinkedIn" if index % 2 else "Indeed", posted_at=date.today())
+
+    def test_total_is_cached(self):
+        self.assertEqual(total_jobs(), (5, False))
+        with self.assertNumQueries(0):
+            self.assertEqual(total_jobs(), (5, False))
+        adjust_total_jobs(-2)
+        self.assertEqual(total_jobs(), (3, False))
+
+    def test_janitor_adjusts_the_total(self):
+        Job.objects.create(url="https://example.com/old", title="Old", company="Acme",
+                           posted_at=date.today() - timedelta(days=40))
+        self.assertEqual(total_jobs().value, 6)
+        cleanup_old_jobs()
+        with self.assertNumQueries(0):
+            self.assertEqual(total_jobs().value, 5)
+
+    def test_small_sets_are_counted_exactly(self):
+        self.assertEqual(count_jobs(Job.objects.filter(source="LinkedIn")), (2, False))
+
+    @override_settings(EXACT_COUNT_LIMIT=0)
+    def test_big_sets_report_the_planner_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE jobs_job")
+        count = count_jobs(Job.objects.filter(source="LinkedIn"))
+        self.assertTrue(count.approximate)
+        self.assertEqual(total_jobs(), (5, True))  # pg_class.reltuples
+
+    @override_settings(EXACT_COUNT_LIMIT=0)
+    @patch.object(JobPageNumberPagination, 'page_size', 2)
+    def test_pages_past_an_estimate_still_have_next_links(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE jobs_job")
+        cache.set('job-count:total', 1)  # An estimate far below the real total
+        urls, pages, next_link = [], 0, "/api/jobs/"
+        while next_link:
+            pages += 1
+            response = self.client.get(next_link, HTTP_ACCEPT="application/json")
+            self.assertTrue(response.json()['count_approximate'])
+            urls += [job['url'] for job in response.json()['results']]
+            next_link = response.json()['next']
+        self.assertEqual(len(urls), 5)
+        self.assertEqual(pages, 3)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Job.objects.create(url="https://example.com/1", title="Python Developer", company="Acme",
+                           skills=["Python"], posted_at=date.today())
+
+    def get(self, params):
+        return self.client.get("/api/jobs/", params, HTTP_ACCEPT="application/json")
+
+    def test_repeated_query_is_a_hit(self):
+        first = self.get({'search': "python", 'skills': "python"})
+        self.assertEqual(first['X-Cache'], "MISS")
+
+        # Same query: other parameter order, an empty parameter
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/jobs/?skills=python&title=&search=python", HTTP_ACCEPT="application/json")
+        self.assertEqual(second['X-Cache'], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], first['Content-Type'])
+        self.assertEqual(response_cache_stats()['hit_ratio'], 0.5)
+
+    def test_new_data_version_is_a_miss(self):
+        self.get({'search': "python"})
+        Job.objects.create(url="https://example.com/2", title="Python Engineer", company="Acme")
+        bump_data_version()
+
+        response = self.get({'search': "python"})
+        self.assertEqual(response['X-Cache'], "MISS")
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_stale_copy_while_another_request_rebuilds(self):
+        old = self.get({'search': "python"})
+        Job.objects.create(url="https://example.com/2", title="Python Engineer", company="Acme")
+        bump_data_version()
+
+        # The first request to see the new version misses and takes the rebuild lock...
+        rebuilding = APIRequest(RequestFactory().get("/api/jobs/", {'search': "python"}))
+        rebuilding.accepted_renderer = JSONRenderer()
+        self.assertIsNone(ResponseCache(rebuilding).get())
+        # ...the others get the old copy meanwhile
+        stale = self.get({'search': "python"})
+        self.assertEqual(stale['X-Cache'], "STALE")
+        self.assertEqual(stale.content, old.content)
+
+    @patch('jobs.views.run_scrapers')
+    def test_empty_results_are_not_cached(self, run_scrapers):
+        self.get({'search': "cobol"})
+        self.assertEqual(self.get({'search': "cobol"})['X-Cache'], "MISS")
+        run_scrapers.delay.assert_called_once()
+
+    def test_janitor_bumps_the_data_version(self):
+        version = data_version()
+        cleanup_old_jobs()  # Nothing old: nothing to invalidate
+        self.assertEqual(data_version(), version)
+
+        Job.objects.create(url="https://example.com/old", title="Old", company="Acme",
+                           posted_at=date.today() - timedelta(days=40))
+        cleanup_old_jobs()
+        self.assertGreater(data_version(), version)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        description = "<p>We build <b>APIs</b> &amp; data pipelines.</p>" + "<p>Details.</p>" * 2000
+        Job.objects.create(url="https://example.com/1", title="Python Developer", company="Acme",
+                           description=description, description_snippet=make_snippet(description),
+                           skills=["Python"], posted_at=date.today())
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/jobs/", params, HTTP_ACCEPT="application/json")
+        self.sql = " ".join(query['sql'] for query in captured.captured_queries)
+        return response
+
+    def test_snippet_instead_of_the_description_by_default(self):
+        job = self.get().json()['results'][0]
+        self.assertNotIn('description', job)
+        self.assertTrue(job['description_snippet'].startswith("We build APIs & data pipelines. Details."))
+        self.assertNotIn('"jobs_job"."description",', self.sql)
+        self.assertNotIn('content_hash', job)
+
+    def test_fields(self):
+        job = self.get(fields="url,title").json()['results'][0]
+        self.assertEqual(list(job), ['title', 'url'])
+        self.assertNotIn('"jobs_job"."company"', self.sql)
+
+        job = self.get(fields="title,description").json()['results'][0]
+        self.assertEqual(len(job['description']), len(Job.objects.get().description))
+
+    def test_exclude(self):
+        job = self.get(exclude="skills, description_snippet").json()['results'][0]
+        self.assertNotIn('skills', job)
+        self.assertNotIn('description_snippet', job)
+        self.assertIn('company', job)
+
+    def test_unknown_field_is_a_bad_request(self):
+        response = self.get(fields="title,salary")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("salary", response.json()['fields'])
+
+    def test_snippet_is_plain_text_cut_at_a_word(self):
+        self.assertEqual(make_snippet("<ul><li>Go</li><li>Rust</li></ul>"), "Go Rust")
+        self.assertEqual(make_snippet(None), "")
+        snippet = make_snippet("word " * 100)
+        self.assertLessEqual(len(snippet), SNIPPET_LENGTH + 1)
+        self.assertTrue(snippet.endswith("word…"))
+
+
+@override_settings(RESPONSE_CACHE_TTL=0)
+class FastSerializationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Job.objects.create(url="https://example.com/1", title="Python Entwickler (m/w/d) – München", company="Äcme",
+                           description="Line\u2028separator", skills=["Python", "C++"], salary_min=60000,
+                           salary_max=80000, currency="EUR", posted_at=date(2026, 1, 9))
+        Job.objects.create(url="https://example.com/2", title="Python Developer", company="Acme", location="Berlin",
+                           description=None, posted_at=None)
+        Job.objects.create(url="https://example.com/3", title="Rust Developer", company="Acme",
+                           posted_at=date(2026, 1, 10))
+
+    def render(self, fast, params, accept="application/json"):
+        view = JobListAPI.as_view(throttle_classes=[], fast_serialization=fast)
+        response = view(RequestFactory().get("/api/jobs/", params, HTTP_ACCEPT=accept))
+        response.render()
+        return response.content
+
+    @patch.object(KeysetPagination, 'page_size', 1)
+    @patch.object(JobPageNumberPagination, 'page_size', 2)
+    def test_same_bytes_as_the_serializer(self):
+        for params in ({}, {'search': "python"}, {'fields': "title,description,created_at,skills"},
+                       {'exclude': "skills"}, {'pagination': "cursor"}, {'page': 2}):
+            self.assertEqual(self.render(True, params), self.render(False, params), params)
+
+    def test_renderer_matches_drf(self):
+        data = {'when': timezone.now(), 'day': date(2026, 1, 1), 'text': "é\u2029", 1: None}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = "application/json; indent=4"
+        self.assertEqual(self.render(True, {}, accept=indented), self.render(False, {}, accept=indented))
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(60):
+            Job.objects.create(url=f"https://example.com/{index}", title=f"Python Developer {index}",
+                               company="Acme" if index % 3 else "Globex", skills=["Python", "Django"],
+                               posted_at=date.today() - timedelta(days=index % 5))
+
+    def export(self, params=None, view=None, **headers):
+        # A free-tier (IP) caller can't afford a real export: price these at one request
+        view = view or JobExportAPI.as_view(throttle_cost=1)
+        response = view(RequestFactory().get("/api/jobs/export/", params or {}, **headers))
+        if response.streaming:
+            return response, b"".join(response.streaming_content)
+        return response, response.render().content
+
+    def test_ndjson_has_every_job_like_the_list(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], "application/x-ndjson")
+        jobs = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(jobs), 60)
+
+        page = self.client.get("/api/jobs/", HTTP_ACCEPT="application/json").json()
+        self.assertEqual(jobs[:20], page['results'])
+
+    def test_no_conditional_get(self):
+        response, _ = self.export()
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        response, body = self.export(HTTP_IF_NONE_MATCH="*", HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(body.splitlines()), 60)
+
+    def test_csv_with_filters_and_fields(self):
+        response, body = self.export({'format': "csv", 'company': "globex", 'fields': "title,company,skills"})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="jobs.csv"')
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(rows[0], ["title", "company", "skills"])
+        self.assertEqual(len(rows), 1 + 20)
+        self.assertEqual(rows[1][1:], ["Globex", "Python, Django"])
+
+    def test_gzip(self):
+        _, plain = self.export()
+        response, body = self.export(HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response['Content-Encoding'], "gzip")
+        self.assertEqual(gzip.decompress(body), plain)
+
+    def test_the_free_tier_cannot_export(self):
+        self.assertEqual(self.export(view=JobExportAPI.as_view())[0].status_code, 429)
+
+    def test_an_export_costs_many_requests(self):
+        view = JobExportAPI.as_view(throttle_cost=8)
+        self.assertEqual(self.export(view=view)[0].status_code, 200)
+        self.assertEqual(self.export(view=view)[0].status_code, 200)
+        # 16 of the free tier's 20 requests used: a third export doesn't fit
+        response, body = self.export(view=view)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(b"throttled", body)
+
+
+class HttpCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.job = Job.objects.create(url="https://example.com/1", title="Python Developer", company="Acme",
+                                      posted_at=date.today(), content_hash="a" * 64)
+
+    def get(self, path, **headers):
+        return self.client.get(path, HTTP_ACCEPT="application/json", **headers)
+
+    def test_job_list_revalidates_without_queries(self):
+        response = self.get("/api/jobs/?search=python")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("s-maxage=600", response['Cache-Control'])
+        self.assertIn("public", response['Cache-Control'])
+        self.assertEqual(response['Surrogate-Key'].split(), [
+            "jobs-list", response['Surrogate-Key'].split()[1], f"job-{self.job.pk}",
+        ])
+        self.assertTrue(response['Surrogate-Key'].split()[1].startswith("jobs-query-"))
+
+        with self.assertNumQueries(0):
+            not_modified = self.get("/api/jobs/?search=python", HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+
+        # Another query or representation is another ETag
+        self.assertNotEqual(self.get("/api/jobs/?search=developer")['ETag'], response['ETag'])
+
+        bump_data_version()
+        self.assertEqual(self.get("/api/jobs/?search=python", HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_job_list_last_modified(self):
+        response = self.get("/api/jobs/")
+        since = self.get("/api/jobs/", HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_stale_copy_gets_no_validators(self):
+        old = self.get("/api/jobs/?search=python")
+        bump_data_version()
+        rebuilding = APIRequest(RequestFactory().get("/api/jobs/", {'search': "python"}))
+        rebuilding.accepted_renderer = JSONRenderer()
+        self.assertIsNone(ResponseCache(rebuilding).get())  # Takes the rebuild lock
+
+        stale = self.get("/api/jobs/?search=python", HTTP_IF_NONE_MATCH=old['ETag'])
+        self.assertEqual((stale.status_code, stale['X-Cache']), (200, "STALE"))
+        self.assertNotIn('ETag', stale)
+        self.assertNotIn('Last-Modified', stale)
+        self.assertEqual(stale['Cache-Control'], "private, no-store")
+
+        cache.delete(ResponseCache(rebuilding).lock_key)  # The rebuild is over
+        fresh = self.get("/api/jobs/?search=python")
+        self.assertEqual(fresh['X-Cache'], "MISS")
+        self.assertNotEqual(fresh['ETag'], old['ETag'])
+        self.assertEqual(self.get("/api/jobs/?search=python", HTTP_IF_NONE_MATCH=fresh['ETag']).status_code, 304)
+
+    def test_cached_responses_keep_their_surrogate_keys(self):
+        first = self.get("/api/jobs/")
+        second = self.get("/api/jobs/")
+        self.assertEqual(second['X-Cache'], "HIT")
+        self.assertEqual(second['Surrogate-Key'], first['Surrogate-Key'])
+
+    def test_job_detail(self):
+        path = f"/job/{self.job.pk}/"
+        response = self.client.get(path)
+        self.assertEqual(response['Cache-Control'], "private, no-cache")
+        self.assertNotIn("Surrogate-Key", response)
+
+        # The page embeds the token of the visitor's CSRF cookie: the first visit sets it
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        response = self.client.get(path)
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        Job.objects.filter(pk=self.job.pk).update(content_hash="b" * 64)
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_job_detail_for_users_has_no_validator(self):
+        user = get_user_model().objects.create_user(username="dev", email="dev@example.com", password="x")
+        self.client.force_login(user)
+        self.assertNotIn("ETag", self.client.get(f"/job/{self.job.pk}/"))
+
+    def test_sitemap(self):
+        response = self.client.get("/sitemap.xml")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Surrogate-Key'], "sitemap")
+        self.assertIn("s-maxage=86400", response['Cache-Control'])
+        self.assertEqual(self.client.get("/sitemap.xml", HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    @patch('jobs.tasks.purge')
+    def test_janitor_purges_the_cdn(self, purge):
+        Job.objects.create(url="https://example.com/old", title="Old", company="Acme",
+                           posted_at=date.today() - timedelta(days=40))
+        cleanup_old_jobs()
+        purge.assert_any_call(["jobs-list", "sitemap"])
+
+    @override_settings(CLOUDFLARE_ZONE_ID="zone", CLOUDFLARE_API_TOKEN="token")
+    @patch('jobs.cdn.requests.post')
+    def test_cloudflare_purges_30_tags_per_request(self, post):
+        CloudflarePurgeClient().purge({f"job-{pk}" for pk in range(45)})
+        self.assertEqual([len(call.kwargs['json']['tags']) for call in post.call_args_list], [30, 15])
+        self.assertEqual(post.call_args.args[0], "https://api.cloudflare.com/client/v4/zones/zone/purge_cache")
+
+
+@override_settings(SUGGEST_CHECK_INTERVAL=0)
+class SuggestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        suggest._loaded.update(index=None, checked_at=0.0)
+        jobs = [
+            ("Python Developer", "Acme", ["Python", "Django"]),
+            ("python developer", "Acme", ["Python"]),
+            ("Python Developer", "Globex", ["Python", "PostgreSQL"]),
+            ("Senior Python Engineer", "Pythonic Ltd", ["Python", "Django"]),
+            ("Data Engineer", "Globex", ["Spark"]),
+        ]
+        for index, (title, company, skills) in enumerate(jobs):
+            Job.objects.create(url=f"https://example.com/{index}", title=title, company=company, skills=skills)
+
+    def texts(self, prefix, **kwargs):
+        return [(s['text'], s['kind'], s['jobs']) for s in suggest_index().lookup(prefix, **kwargs)]
+
+    def test_most_frequent_first_across_kinds(self):
+        self.assertEqual(self.texts("py"), [
+            ("Python", "skill", 4),
+            ("Python Developer", "title", 3),
+            ("Pythonic Ltd", "company", 1),
+            ("Senior Python Engineer", "title", 1),
+        ])
+
+    def test_any_word_start_matches(self):
+        self.assertEqual(self.texts("eng"), [("Data Engineer", "title", 1), ("Senior Python Engineer", "title", 1)])
+        self.assertEqual(self.texts("ython"), [])
+
+    def test_long_prefixes_rank_like_short_ones(self):
+        self.assertEqual(self.texts("pyth"), self.texts("pyt"))
+        self.assertEqual(self.texts("python d"), [("Python Developer", "title", 3)])
+        self.assertEqual(self.texts("  PYTHON   De"), [("Python Developer", "title", 3)])
+        self.assertEqual(len(self.texts("pyth", limit=2)), 2)
+
+    def test_top_prefixes_keep_the_limit(self):
+        terms = [("skill", f"Skill {n:03}", n) for n in range(100)]
+        index = SuggestIndex(terms, limit=5)
+        self.assertEqual([s['text'] for s in index.lookup("sk")], [f"Skill {n:03}" for n in range(99, 94, -1)])
+        self.assertEqual([s['text'] for s in index.lookup("skill 0")], [f"Skill {n:03}" for n in range(99, 94, -1)])
+
+    def test_endpoint_reads_only_memory(self):
+        self.client.get("/api/suggest/", {'q': "py"}, HTTP_ACCEPT="application/json")
+        with override_settings(SUGGEST_CHECK_INTERVAL=60), self.assertNumQueries(0):
+            response = self.client.get("/api/suggest/", {'q': "dja", 'limit': 1}, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.json(), {
+            'query': "dja", 'suggestions': [{'text': "Django", 'kind': "skill", 'jobs': 2}],
+        })
+        self.assertEqual(response['Surrogate-Key'], "suggest")
+
+    def test_htmx_gets_datalist_options(self):
+        response = self.client.get("/api/suggest/", {'q': "glo"}, HTTP_HX_REQUEST="true")
+        self.assertContains(response, '<option value="Globex">Company &bull; 2 jobs</option>', html=True)
+
+    def test_rebuilt_after_ingest(self):
+        self.assertEqual(self.texts("rust"), [])
+        Job.objects.create(url="https://example.com/rust", title="Rust Developer", company="Acme", skills=["Rust"])
+        bump_data_version()
+        self.assertEqual(self.texts("rust"), [])  # Until the index is rebuilt
+
+        self.assertEqual(refresh_suggestions(), "Suggest index rebuilt")
+        self.assertEqual(self.texts("rust"), [("Rust", "skill", 1), ("Rust Developer", "title", 1)])
+        self.assertEqual(refresh_suggestions(), "Suggest index up to date")
@@ -6,13 +6,46 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
-class FreeTierThrottle(SimpleRateThrottle):
+
+class WeightedRateThrottle(SimpleRateThrottle):
+    """
+    A request costs `throttle_cost` units of the rate (1 unless the view sets more).
+    The bulk export sets EXPORT_THROTTLE_COST: one export reads as much as many pages.
+    """
+
+    def allow_request(self, request, view):
+        cost = getattr(view, 'throttle_cost', 1)
+        if cost == 1:
+            return super().allow_request(request, view)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.history = self.cache.get(self.key, [])
+        self.now = self.timer()
+        while self.history and self.history[-1] <= self.now - self.duration:
+            self.history.pop()
+        if len(self.history) + cost > self.num_requests:
+            return self.throttle_failure()
+
+        # One entry per unit, so the units expire like ordinary requests do
+        self.history[:0] = [self.now] * cost
+        self.cache.set(self.key, self.history, self.duration)
+        return True
+
+
+class FreeTierThrottle(WeightedRateThrottle):
     scope = 'free_tier'
     rate = '20/day'
 
     def get_cache_key(self, request, view):
         # 1. Check if it's a Browser/HTMX request (Allow)
-        if request.accepts('text/html') or request.headers.get('HX-Request') == 'true':
+        # Weighted views (the bulk export) are never browser pages: always count them
+        is_browser = request.accepts('text/html') or request.headers.get('HX-Request') == 'true'
+        if is_browser and getattr(view, 'throttle_cost', 1) == 1:
             return None
 
         ident = self.get_ident(request)  # Default to IP address
@@ -49,7 +82,7 @@ class FreeTierThrottle(SimpleRateThrottle):
             'ident': ident
         }
 
-class ProTierThrottle(SimpleRateThrottle):
+class ProTierThrottle(WeightedRateThrottle):
     """
     Limits: 1,000/day
     Applies ONLY if the user's Subscription is 'pro'
@@ -89,7 +122,7 @@ class ProTierThrottle(SimpleRateThrottle):
         return None
 
 
-class BusinessTierThrottle(SimpleRateThrottle):
+class BusinessTierThrottle(WeightedRateThrottle):
     """
     Limits: 10,000/day
     Applies ONLY if the user's Subscription is 'business'
@@ -1,10 +1,16 @@
 from django.urls import path
-from .views import JobListAPI, ScrapeTriggerAPI
+from .views import JobExportAPI, JobListAPI, ScrapeTriggerAPI, SuggestAPI
 
 urlpatterns = [
     # Map 'api/jobs/'
     path('jobs/', JobListAPI.as_view(), name='job-list'),
 
+    # Map 'api/jobs/export/' (streamed NDJSON / CSV)
+    path('jobs/export/', JobExportAPI.as_view(), name='job-export'),
+
+    # Map 'api/suggest/' (search box typeahead)
+    path('suggest/', SuggestAPI.as_view(), name='job-suggest'),
+
     # Map 'api/scrape/'
     path('scrape/', ScrapeTriggerAPI.as_view(), name='job-scrape'),
 ]
\ No newline at end of file
@@ -1,20 +1,36 @@
 from rest_framework import generics, serializers, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.renderers import JSONRenderer, TemplateHTMLRenderer
+from rest_framework.renderers import TemplateHTMLRenderer
+from django.conf import settings
 from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-from .models import Job
-from .serializers import JobSerializer
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from .models import Job, SEARCH_CONFIG
+from .serializers import JobSerializer, job_values, requested_fields
+from .renderers import CSVRenderer, NDJSONRenderer, ORJSONRenderer
+from .export import csv_chunks, gzip_chunks, ndjson_chunks
 from .tasks import run_scrapers
 # --- UPDATED IMPORTS HERE ---
 from .throttles import FreeTierThrottle, ProTierThrottle, BusinessTierThrottle
 from .filters import JobFilter
+from .pagination import KeysetPagination
+from .response_cache import ResponseCache, query_digest
+from .suggest import suggest_index
+from .cdn import JOB_LIST_TAG, SUGGEST_TAG, job_tag, query_tag
+from .http_cache import apply_http_cache, list_etag, list_last_modified, per_visitor
 
 
 # --- 1. The Job List API ---
+# Conditional GET: an unchanged page is a 304 before any query or cache lookup
+@method_decorator(condition(etag_func=list_etag, last_modified_func=list_last_modified), name='get')
 class JobListAPI(generics.ListAPIView):
     serializer_class = JobSerializer
     # Filter Backend settings
@@ -22,46 +38,100 @@ class JobListAPI(generics.ListAPIView):
     filterset_class = JobFilter
 
     # Allow both JSON (for API) and HTML (for Browser)
-    renderer_classes = [JSONRenderer, TemplateHTMLRenderer]
+    renderer_classes = [ORJSONRenderer, TemplateHTMLRenderer]
+
+    # Build list pages from .values() rows (see job_values); False: the stock serializer path
+    fast_serialization = True
+
+    # Cache-Control of the responses (CACHE_CONTROL setting): 'api' pages may be kept by the CDN
+    http_cache = 'api'
 
     # --- UPDATED THROTTLES HERE ---
     # We list all of them; the code inside them determines which one applies
     throttle_classes = [BusinessTierThrottle, ProTierThrottle, FreeTierThrottle]
 
+    @property
+    def paginator(self):
+        """
+        ?pagination=cursor switches to keyset pages: no count, no OFFSET, and a
+        `next` link to follow. Made for clients that walk every page.
+        """
+        if not hasattr(self, '_paginator') and self.request.query_params.get('pagination') == 'cursor':
+            self._paginator = KeysetPagination()
+        return super().paginator
+
     def get_queryset(self):
         """
         Uses Postgres Full-Text Search if the 'search' parameter is present.
         Otherwise, returns the standard list.
         """
         # Start with all jobs
-        queryset = Job.objects.all().order_by('-posted_at')
+        # Only the columns the response needs: the description alone can be tens of KB per row.
+        # posted_at and id are the sort keys of keyset pages.
+        self.response_fields = requested_fields(self.request.query_params)
+        queryset = Job.objects.only('id', 'posted_at', *self.response_fields)
+
+        # '-id' breaks ties between jobs posted the same day, so pages never overlap
+        queryset = queryset.order_by('-posted_at', '-id')
 
         # Get the 'search' parameter from the URL (e.g., ?search=python developer)
         search_term = self.request.query_params.get('search', None)
 
         if search_term:
-            # 1. Define where to search (Vector)
-            # Search in the title (weight A - most important) and company/skills (B)
-            vector = SearchVector('title', weight='A') + \
-                     SearchVector('company', weight='B') + \
-                     SearchVector('skills', weight='B')
+            # 1. Process the query (Query)
+            # SearchQuery removes stop words (the, a, in) and performs stemming, with the
+            # same configuration that built the stored search_vector
+            query = SearchQuery(search_term, config=SEARCH_CONFIG)
 
-            # 2. Process the query (Query)
-            # SearchQuery automatically removes stop words (the, a, in) and performs stemming
-            query = SearchQuery(search_term)
-
-            # 3. Filter and sort by relevance (Rank)
-            queryset = queryset.annotate(
-                rank=SearchRank(vector, query)
-            ).filter(rank__gte=0.1).order_by('-rank', '-posted_at')
+            # 2. Match first through the GIN index on search_vector (title A, company/skills B,
+            # description D), then rank only the matching rows by relevance
+            queryset = queryset.filter(search_vector=query).annotate(
+                # ts_rank is a float4; as a float8 it survives the round trip through a
+                # keyset cursor exactly, so `rank = <cursor value>` still matches the row
+                rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+            ).order_by('-rank', '-posted_at', '-id')
 
         return queryset
 
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, fields=getattr(self, 'response_fields', None), **kwargs)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # The jobs on this page, for their surrogate keys
+        self.page_job_ids = [row['id'] if isinstance(row, dict) else row.pk for row in page or []]
+        return page
+
+    def fast_list(self):
+        """super().list() without model instances: the same page, from .values() rows."""
+        queryset = self.filter_queryset(self.get_queryset())
+        # Also select the sort keys: keyset pages read the cursor off the last row
+        sort_keys = [key.lstrip('-') for key in queryset.query.order_by]
+        rows = queryset.values(*dict.fromkeys([*self.response_fields, *sort_keys]))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(job_values(page, self.response_fields))
+        return Response(job_values(rows, self.response_fields))
+
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+        # Repeated queries come from the response cache (after the throttles ran),
+        # except a logged-in user's own HTML cards
+        if not per_visitor(request):
+            self.response_cache = ResponseCache(request)
+            cached = self.response_cache.get()
+            if cached is not None:
+                return cached
+
+        if self.fast_serialization:
+            response = self.fast_list()
+        else:
+            response = super().list(request, *args, **kwargs)
 
         # Handle Pagination
         current_results = response.data['results'] if isinstance(response.data, dict) else response.data
+        # Empty results start a scrape below: don't cache them, so the next request can retry
+        self.cacheable = len(current_results) > 0
 
         # --- LOGIC: ZERO RESULTS AUTOMATIC SCRAPER ---
         if len(current_results) == 0:
@@ -86,12 +156,107 @@ class JobListAPI(generics.ListAPIView):
         # If HTMX/Browser, return HTML
         if request.headers.get('HX-Request') == 'true':
             return Response(
-                {'page_obj': current_results},
+                {'jobs': current_results},
                 template_name='core/partials/job_results.html'
             )
 
         return response
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ['Accept', 'HX-Request'])
+        if per_visitor(request):
+            apply_http_cache(response, 'private')
+        elif response.get('X-Cache') == 'STALE':
+            # An old version's body under the validators condition() made for the current one:
+            # a client revalidating them would keep it after the rebuild. Nobody stores it.
+            del response['ETag']
+            del response['Last-Modified']
+            apply_http_cache(response, 'stale')
+        elif 'X-Cache' in response:
+            apply_http_cache(response, self.http_cache)  # A cached copy: its surrogate keys came with it
+        else:
+            tags = [JOB_LIST_TAG, query_tag(query_digest(request))]
+            tags += [job_tag(pk) for pk in getattr(self, 'page_job_ids', [])]
+            apply_http_cache(response, self.http_cache, tags)
+
+        response_cache = getattr(self, 'response_cache', None)
+        if response_cache is not None and 'X-Cache' not in response:
+            response = response_cache.store(response, cacheable=getattr(self, 'cacheable', False))
+        return response
+
+
+class JobExportAPI(JobListAPI):
+    """
+    Every job matching the /api/jobs/ filters, ?search= and ?fields=, in one
+    streamed response instead of thousands of 20-row pages:
+    ?format=ndjson (default) or ?format=csv. Gzipped when the client accepts it.
+    One export costs EXPORT_THROTTLE_COST requests of the caller's daily rate.
+    """
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    pagination_class = None
+    throttle_cost = settings.EXPORT_THROTTLE_COST
+    # A big stream charged EXPORT_THROTTLE_COST requests: never kept by the CDN
+    http_cache = 'private'
+
+    def get(self, request, *args, **kwargs):
+        # Without JobListAPI's conditional GET: its 304 would come after the throttle charged
+        # the whole export, and the gzip and identity streams would share one ETag
+        return self.list(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Server-side cursor: Postgres hands the rows over EXPORT_CHUNK_SIZE at a time
+        rows = queryset.values(*self.response_fields).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+        if request.accepted_renderer.format == 'csv':
+            chunks, extension = csv_chunks(rows, self.response_fields), 'csv'
+        else:
+            chunks, extension = ndjson_chunks(rows, self.response_fields), 'ndjson'
+
+        gzipped = 'gzip' in request.headers.get('Accept-Encoding', '')
+        response = StreamingHttpResponse(
+            gzip_chunks(chunks) if gzipped else chunks,
+            content_type=request.accepted_renderer.media_type,
+        )
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response['Content-Disposition'] = f'attachment; filename="jobs.{extension}"'
+        return response
+
+
+class SuggestAPI(APIView):
+    """
+    Typeahead for the search box: the most frequent titles, companies and skills
+    with a word starting with ?q=, from the in-memory index of jobs.suggest.
+    ?limit= up to SUGGEST_LIMIT. HTMX gets the <option>s of the search box's datalist.
+    """
+    renderer_classes = [ORJSONRenderer, TemplateHTMLRenderer]
+    template_name = 'core/partials/suggestions.html'
+
+    def perform_content_negotiation(self, request, force=False):
+        if request.headers.get('HX-Request') == 'true':
+            return TemplateHTMLRenderer(), TemplateHTMLRenderer.media_type
+        return super().perform_content_negotiation(request, force)
+
+    @extend_schema(parameters=[
+        OpenApiParameter('q', str, description="What has been typed so far"),
+        OpenApiParameter('limit', int, description="At most this many suggestions (default and max: SUGGEST_LIMIT)"),
+    ])
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', 0))
+        except ValueError:
+            limit = 0
+        return Response({'query': query, 'suggestions': suggest_index().lookup(query, limit or None)})
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ['Accept', 'HX-Request'])
+        return apply_http_cache(response, 'suggest', [SUGGEST_TAG])
+
 
 # --- 2. The Scraper Trigger (Manual Endpoint) ---
 
@@ -12,3 +12,6 @@ class JobItem(scrapy.Item):
     salary_min = scrapy.Field()
     salary_max = scrapy.Field()
     currency = scrapy.Field()
+    # Card only: KnownJobMiddleware skipped the detail page of a job checked recently.
+    # The pipeline refreshes the stored job's posting date and rewrites nothing else.
+    refresh_only = scrapy.Field()
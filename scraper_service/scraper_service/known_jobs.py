@@ -0,0 +1,32 @@
+"""
+Database lookups of the jobs we already have, so spiders and middlewares can
+skip work on them. Synchronous ORM code: call it through sync_to_async from the reactor.
+"""
+import hashlib
+
+from django.db.models.functions import Coalesce
+
+from jobs.models import Job
+
+
+def url_digest(url):
+    """8-byte fingerprint of a job URL: keeps a set of 100k known jobs to a few MB."""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def known_urls(urls):
+    """The subset of `urls` already stored, in one query."""
+    return set(Job.objects.filter(url__in=urls).values_list('url', flat=True))
+
+
+def recent_url_digests(since):
+    """
+    Fingerprints of the jobs whose whole posting was read since `since` and that
+    have a description. Jobs stored before checked_at existed count from their creation.
+    """
+    urls = (
+        Job.objects.alias(last_checked=Coalesce('checked_at', 'created_at')).filter(last_checked__gte=since)
+        .exclude(description__isnull=True).exclude(description="")
+        .values_list('url', flat=True)
+    )
+    return {url_digest(url) for url in urls.iterator(chunk_size=5000)}
@@ -3,11 +3,20 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import hashlib
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from jobs.models import FeedSnapshot
+from .known_jobs import recent_url_digests, url_digest
+
 
 class ScraperServiceSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -98,3 +107,143 @@ class ScraperServiceDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class KnownJobMiddleware:
+    """
+    Skips detail-page downloads for jobs we already stored recently.
+
+    Spiders opt in per request by putting the job's URL (as saved in the DB) in
+    request.meta['job_url']. At spider open the fingerprints of every job checked
+    (its whole posting read) in the last KNOWN_JOB_FRESHNESS_DAYS days, with a
+    description, are loaded once; matching detail requests are dropped with
+    IgnoreRequest before they reach the network. Jobs checked longer ago are
+    fetched again so their content stays current.
+    KNOWN_JOB_FRESHNESS_DAYS = 0 disables the middleware.
+
+    A dropped job was still seen on the listing: give its detail request
+    errback=refresh_known_job and the card item in request.meta['item'], and
+    the card goes on to the pipeline, which refreshes its posting date.
+    """
+
+    def __init__(self, stats, freshness_days):
+        self.stats = stats
+        self.freshness_days = freshness_days
+        self.known = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        freshness_days = crawler.settings.getint('KNOWN_JOB_FRESHNESS_DAYS', 0)
+        if freshness_days <= 0:
+            raise NotConfigured
+        middleware = cls(crawler.stats, freshness_days)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        return middleware
+
+    async def spider_opened(self, spider):
+        since = timezone.now() - timedelta(days=self.freshness_days)
+        self.known = await sync_to_async(recent_url_digests)(since)
+        spider.logger.info(f"🗂️ {len(self.known)} jobs stored in the last {self.freshness_days} days will not be fetched again")
+
+    def process_request(self, request, spider=None):
+        job_url = request.meta.get('job_url')
+        if not job_url:
+            return None
+        if url_digest(job_url) in self.known:
+            self.stats.inc_value('known_jobs/skipped')
+            raise IgnoreRequest(f"Known job: {job_url}")
+        self.stats.inc_value('known_jobs/fetched')
+        return None
+
+
+def refresh_known_job(failure):
+    """
+    Errback of detail requests: when KnownJobMiddleware dropped one, passes on
+    the card item (request.meta['item']) as a refresh-only item. Other errors
+    propagate as usual.
+    """
+    item = failure.request.meta.get('item')
+    if not failure.check(IgnoreRequest) or item is None:
+        return failure
+    item['refresh_only'] = True
+    return [item]
+
+
+class ConditionalFeedMiddleware:
+    """
+    Conditional GET for feeds downloaded whole on every run (RSS feeds, JSON API pages).
+
+    Requests with meta['conditional'] send back the ETag / Last-Modified of the
+    last download of their URL (a FeedSnapshot row). A 304, or a 200 whose body
+    hashes the same as last time, is dropped with IgnoreRequest: the spider never
+    parses it, and a paginated feed stops there. Works with any download handler
+    (impersonate included), since it only touches headers and the final response.
+
+    New validators are saved only when the spider finishes cleanly, so a crawl
+    that failed or timed out half-way downloads its feeds in full next time.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.snapshots = {}  # url -> FeedSnapshot of the last run
+        self.pending = {}  # url -> validators of this run's downloads
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler.stats)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    async def spider_opened(self, spider):
+        self.snapshots = await sync_to_async(self.load_snapshots)()
+
+    async def spider_closed(self, spider, reason):
+        if reason == 'finished' and self.pending:
+            await sync_to_async(self.save_snapshots)()
+
+    def load_snapshots(self):
+        return {snapshot.url: snapshot for snapshot in FeedSnapshot.objects.all()}
+
+    def save_snapshots(self):
+        for url, fields in self.pending.items():
+            FeedSnapshot.objects.update_or_create(url=url, defaults=fields)
+
+    def process_request(self, request, spider=None):
+        if not request.meta.get('conditional'):
+            return None
+        self.stats.inc_value('conditional/requests')
+        snapshot = self.snapshots.get(request.url)
+        if snapshot is not None:
+            if snapshot.etag:
+                request.headers['If-None-Match'] = snapshot.etag
+            if snapshot.last_modified:
+                request.headers['If-Modified-Since'] = snapshot.last_modified
+        return None
+
+    def process_response(self, request, response, spider=None):
+        if not request.meta.get('conditional'):
+            return response
+        snapshot = self.snapshots.get(request.url)
+
+        if response.status == 304 and snapshot is not None:
+            self.stats.inc_value('conditional/not_modified')
+            self.stats.inc_value('conditional/bytes_saved', snapshot.body_size)
+            self.stats.inc_value('conditional/parses_saved')
+            raise IgnoreRequest(f"Not modified: {request.url}")
+        if response.status != 200:
+            return response
+
+        body_hash = hashlib.sha256(response.body).hexdigest()
+        self.pending[request.url] = {
+            'etag': response.headers.get('ETag', b'').decode('latin-1')[:500],
+            'last_modified': response.headers.get('Last-Modified', b'').decode('latin-1')[:100],
+            'body_hash': body_hash,
+            'body_size': len(response.body),
+        }
+        if snapshot is not None and snapshot.body_hash == body_hash:
+            # The server ignored our validators (or sends none), but nothing changed
+            self.stats.inc_value('conditional/unchanged_body')
+            self.stats.inc_value('conditional/parses_saved')
+            raise IgnoreRequest(f"Unchanged body: {request.url}")
+        return response
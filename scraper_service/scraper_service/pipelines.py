@@ -1,56 +1,404 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
 from itemadapter import ItemAdapter
-from jobs.models import Job
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from jobs.cdn import JOB_LIST_TAG, SITEMAP_TAG, job_tag, purge
+from jobs.counts import adjust_total_jobs
+from jobs.data_version import bump_data_version
+from jobs.models import Job, make_snippet
 from asgiref.sync import sync_to_async
-from .utils import parse_salary, extract_skills, extract_seniority
+from .utils import analyze_job, content_fingerprint
+
+# Columns rewritten when a scraped URL already exists (created_at is kept as-is)
+UPSERT_FIELDS = [
+    'title', 'company', 'location', 'source', 'posted_at', 'description', 'description_snippet',
+    'skills', 'seniority', 'salary_min', 'salary_max', 'currency', 'content_hash', 'checked_at',
+]
+
+POSTED_AT_FIELD = Job._meta.get_field('posted_at')
+
+logger = logging.getLogger(__name__)
+
+# One analysis pool per process, shared by every crawler running in it
+_analysis_pool = None
+_analysis_pool_users = 0
+
+
+def acquire_analysis_pool(workers):
+    global _analysis_pool, _analysis_pool_users
+    if _analysis_pool is None:
+        # 'spawn' keeps the workers clean: no inherited reactor, DB sockets or thread locks
+        _analysis_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    _analysis_pool_users += 1
+    return _analysis_pool
+
+
+def release_analysis_pool():
+    global _analysis_pool, _analysis_pool_users
+    _analysis_pool_users -= 1
+    if _analysis_pool_users == 0 and _analysis_pool is not None:
+        _analysis_pool.shutdown(wait=False, cancel_futures=True)
+        _analysis_pool = None
 
 
 class ScraperServicePipeline:
+    """
+    Saves scraped jobs to Postgres.
+
+    Two modes, picked by the JOB_UPSERT_BATCH_SIZE setting:
+    - 0: one update_or_create per item (SELECT + UPDATE/INSERT each).
+    - N: items are buffered and flushed as one multi-row
+      INSERT ... ON CONFLICT (url) DO UPDATE when the buffer holds N items,
+      every JOB_UPSERT_FLUSH_INTERVAL seconds (even while no items arrive),
+      or when the spider closes. Flushes run one at a time.
+
+    In both modes a job whose content fingerprint matches the stored one is
+    skipped before analysis, so unchanged postings are never rewritten. If only
+    its posted_at moved (sources that stamp "today" on every scrape), that one
+    column is refreshed, so live postings stay on top and out of the janitor's reach.
+    Refresh-only items (a card whose detail page KnownJobMiddleware skipped) only
+    ever get that refresh. checked_at, when the whole posting was last read, is
+    stamped on every write and, for unchanged jobs, once it is older than
+    KNOWN_JOB_FRESHNESS_DAYS, so the middleware skips them for another window.
+
+    The CPU-heavy analysis runs in a process pool of ANALYSIS_WORKERS processes.
+    At most ANALYSIS_MAX_PENDING jobs are queued in it; further items wait
+    for a slot, while crawling and DB writes carry on in the reactor.
+    """
+
+    def __init__(self, stats=None, batch_size=0, flush_interval=10.0, analysis_workers=0, analysis_max_pending=0,
+                 freshness_days=0):
+        self.stats = stats
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.analysis_workers = analysis_workers
+        self.analysis_max_pending = analysis_max_pending or analysis_workers * 4
+        self.freshness_days = freshness_days
+
+        self.buffer = {}  # url -> cleaned fields (last one wins)
+        self.skipped = 0  # items dropped since the last flush
+        self.last_flush = time.monotonic()
+        self.flush_lock = asyncio.Lock()  # One flush at a time, so the inserted/updated counts are right
+        self.flush_task = None
+
+        self.executor = None
+        self.analysis_slots = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            stats=crawler.stats,
+            batch_size=crawler.settings.getint('JOB_UPSERT_BATCH_SIZE', 0),
+            flush_interval=crawler.settings.getfloat('JOB_UPSERT_FLUSH_INTERVAL', 10.0),
+            analysis_workers=crawler.settings.getint('ANALYSIS_WORKERS', 0),
+            analysis_max_pending=crawler.settings.getint('ANALYSIS_MAX_PENDING', 0),
+            freshness_days=crawler.settings.getint('KNOWN_JOB_FRESHNESS_DAYS', 0),
+        )
+
+    def open_spider(self, spider):
+        if self.analysis_workers:
+            self.executor = acquire_analysis_pool(self.analysis_workers)
+            self.analysis_slots = asyncio.Semaphore(self.analysis_max_pending)
+        if self.batch_size:
+            self.flush_task = asyncio.ensure_future(self.flush_periodically(spider))
+
+    async def close_spider(self, spider):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        if self.batch_size:
+            await self.flush(spider)
+        if self.executor is not None:
+            release_analysis_pool()
+            self.executor = None
+
     async def process_item(self, item, spider):
-        # Run the synchronous Django ORM code in a separate thread
-        await sync_to_async(self.save_job)(item)
+        fields = self.clean_item(item)
+
+        if not self.batch_size:
+            if fields is None:
+                return item  # Skip items without a URL
+            # Run the synchronous Django ORM code in a separate thread
+            stored = await sync_to_async(self.stored_jobs)([fields['url']])
+            previous = stored.get(fields['url'])
+            if previous is None and fields['refresh_only']:
+                self.inc_stat('pipeline/jobs_skipped')  # Deleted since the spider opened: nothing to refresh
+                return item
+            if previous and self.is_unchanged(fields, previous):
+                if self.needs_check(fields, previous):
+                    await sync_to_async(self.mark_checked)([fields['url']])
+                if self.needs_refresh(fields, previous):
+                    await sync_to_async(self.refresh_posted_at)([fields])
+                    await sync_to_async(bump_data_version)()
+                    await sync_to_async(self.purge_edge)(inserted=0, refreshed_ids=[previous[2]], updated_ids=[])
+                    self.inc_stat('pipeline/jobs_refreshed')
+                else:
+                    self.inc_stat('pipeline/jobs_unchanged')
+                return item
+            analysis = await self.analyze(fields)
+            if await sync_to_async(self.save_job)(fields, analysis, exists=previous is not None):
+                await sync_to_async(adjust_total_jobs)(1)
+            await sync_to_async(bump_data_version)()
+            if previous:
+                await sync_to_async(self.purge_edge)(inserted=0, refreshed_ids=[], updated_ids=[previous[2]])
+            else:
+                await sync_to_async(self.purge_edge)(inserted=1, refreshed_ids=[], updated_ids=[])
+            self.inc_stat('pipeline/jobs_updated' if previous else 'pipeline/jobs_inserted')
+            return item
+
+        if fields is None or fields['url'] in self.buffer:
+            # No URL, or the same job twice in one batch (Postgres refuses to
+            # update the same row twice in a single ON CONFLICT statement)
+            self.skipped += 1
+        if fields is not None and not (fields['refresh_only'] and fields['url'] in self.buffer):
+            self.buffer[fields['url']] = fields  # A card never replaces the full posting
+
+        flush_due = time.monotonic() - self.last_flush >= self.flush_interval
+        if len(self.buffer) >= self.batch_size or flush_due:
+            await self.flush(spider)
         return item
 
-    def save_job(self, item):
-        # 1. Safe Extraction with Defaults
-        # We ensure no field is None (except nullable ones) to prevent crashes
+    async def flush_periodically(self, spider):
+        """Flushes a buffer that has waited JOB_UPSERT_FLUSH_INTERVAL, even when no new items arrive."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if time.monotonic() - self.last_flush < self.flush_interval:
+                continue  # A size-triggered flush just ran
+            try:
+                await self.flush(spider)
+            except Exception as e:
+                spider.logger.error(f"❌ Periodic flush failed: {e}")
+
+    async def flush(self, spider):
+        """Writes the buffered jobs in one statement and reports what happened."""
+        # Flushes run one at a time: otherwise two batches holding the same URL
+        # both look it up before either writes, and both count it as inserted
+        async with self.flush_lock:
+            await self.flush_buffer(spider)
+
+    async def flush_buffer(self, spider):
+        if not self.buffer and not self.skipped:
+            return
+
+        # Swap the buffer before awaiting so items arriving meanwhile start a new batch
+        batch, skipped = list(self.buffer.values()), self.skipped
+        self.buffer, self.skipped = {}, 0
+        self.last_flush = time.monotonic()
+
+        stored = await sync_to_async(self.stored_jobs)([fields['url'] for fields in batch])
+        changed, refreshed, checked, gone = [], [], [], 0
+        for fields in batch:
+            previous = stored.get(fields['url'])
+            if previous is None and fields['refresh_only']:
+                gone += 1  # Deleted since the spider opened: nothing to refresh
+            elif not previous or not self.is_unchanged(fields, previous):
+                changed.append(fields)
+            else:
+                if self.needs_check(fields, previous):
+                    checked.append(fields['url'])
+                if self.needs_refresh(fields, previous):
+                    refreshed.append(fields)
+
+        analyses = await asyncio.gather(*(self.analyze(fields) for fields in changed))
+        failed = await sync_to_async(self.save_batch)(changed, analyses)
+        changed = [fields for fields in changed if fields['url'] not in failed]
+        await sync_to_async(self.refresh_posted_at)(refreshed)
+        await sync_to_async(self.mark_checked)(checked)
+
+        skipped += gone
+        updated = sum(1 for fields in changed if fields['url'] in stored)
+        inserted = len(changed) - updated
+        unchanged = len(batch) - len(changed) - len(refreshed) - len(failed) - gone
+        if inserted:
+            # Keep the cached job total (jobs.counts) in step without a recount
+            await sync_to_async(adjust_total_jobs)(inserted)
+        if changed or refreshed:
+            # One bump per flush: cached API responses built before it are stale now
+            await sync_to_async(bump_data_version)()
+            await sync_to_async(self.purge_edge)(
+                inserted,
+                [stored[fields['url']][2] for fields in refreshed],
+                [stored[fields['url']][2] for fields in changed if fields['url'] in stored],
+            )
+
+        spider.logger.info(
+            f"💾 Flushed {len(batch)} jobs: {inserted} inserted, {updated} updated, "
+            f"{len(refreshed)} refreshed, {unchanged} unchanged, {skipped} skipped"
+            + (f", {len(failed)} failed" if failed else "")
+        )
+        self.inc_stat('pipeline/flushes')
+        self.inc_stat('pipeline/jobs_inserted', inserted)
+        self.inc_stat('pipeline/jobs_updated', updated)
+        self.inc_stat('pipeline/jobs_refreshed', len(refreshed))
+        self.inc_stat('pipeline/jobs_unchanged', unchanged)
+        self.inc_stat('pipeline/jobs_skipped', skipped)
+        self.inc_stat('pipeline/jobs_failed', len(failed))
+
+    def inc_stat(self, key, count=1):
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
+
+    async def analyze(self, fields):
+        """Skills, Salary, Seniority for one job, off the reactor thread."""
+        args = (fields['title'], fields['company'], fields['description'])
+        if self.executor is None:
+            return await sync_to_async(analyze_job, thread_sensitive=False)(*args)
+
+        # Backpressure: wait for a free slot instead of queueing unbounded work
+        async with self.analysis_slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, analyze_job, *args)
+
+    def clean_item(self, item):
+        """
+        Safe Extraction with Defaults.
+        We ensure no field is None (except nullable ones) to prevent crashes.
+        Returns None for items without a URL.
+        """
         url = item.get('url')
         if not url:
-            return None  # Skip items without a URL
-
-        title = item.get('title') or "Unknown Title"
-        company = item.get('company') or "Unknown Company"
-        description = item.get('description') or ""
-        location = item.get('location') or "Remote"
-        source = item.get('source') or "Unknown"
-
-        # 2. Analysis (Skills, Salary, Seniority)
-        # We analyze the FULL text before truncating it
-        text_to_scan = f"{title} {company} {description}"
-
-        min_sal, max_sal, curr = parse_salary(text_to_scan)
-        skills_found = extract_skills(text_to_scan)
-        seniority_level = extract_seniority(title, description)
-
-        # 3. Database Save with Safety Truncation
-        # We slice strings [:Limit] to match your Database Model limits.
-        # URL -> 2000 chars
-        # Title/Company/Location -> 500 chars
-        # Source/Seniority -> 50 chars
-
-        job, created = Job.objects.update_or_create(
-            url=url[:2000],  # Critical fix for long Glassdoor URLs
-            defaults={
-                'title': title[:500],
-                'company': company[:500],
-                'location': location[:500],
-                'source': source[:50],
-                'posted_at': item.get('posted_at'),
-                'description': description,  # TextField usually handles unlimited text
-                'skills': skills_found,
-                'seniority': seniority_level[:50],
-                'salary_min': min_sal,
-                'salary_max': max_sal,
-                'currency': curr,
-            }
+            return None
+
+        fields = {
+            'url': url[:2000],  # Critical fix for long Glassdoor URLs
+            'title': item.get('title') or "Unknown Title",
+            'company': item.get('company') or "Unknown Company",
+            'description': item.get('description') or "",
+            'location': item.get('location') or "Remote",
+            'source': item.get('source') or "Unknown",
+            # Normalized to a date, so it compares equal to the stored value
+            'posted_at': POSTED_AT_FIELD.to_python(item.get('posted_at')),
+            'refresh_only': bool(item.get('refresh_only')),
+        }
+        fields['content_hash'] = content_fingerprint(
+            fields['title'], fields['company'], fields['location'], fields['description']
+        )
+        return fields
+
+    def build_defaults(self, fields, analysis):
+        """
+        Safety Truncation. The analysis ran on the FULL text; here we slice
+        strings [:Limit] to match the Database Model limits:
+        Title/Company/Location -> 500 chars, Source/Seniority -> 50 chars.
+        """
+        return {
+            'title': fields['title'][:500],
+            'company': fields['company'][:500],
+            'location': fields['location'][:500],
+            'source': fields['source'][:50],
+            'posted_at': fields['posted_at'],
+            'description': fields['description'],  # TextField usually handles unlimited text
+            'description_snippet': make_snippet(fields['description']),
+            'skills': analysis['skills'],
+            'seniority': analysis['seniority'][:50],
+            'salary_min': analysis['salary_min'],
+            'salary_max': analysis['salary_max'],
+            'currency': analysis['currency'],
+            'content_hash': fields['content_hash'],
+            'checked_at': timezone.now(),
+        }
+
+    def stored_jobs(self, urls):
+        """url -> (content_hash, posted_at, id, checked_at) for the jobs we already have."""
+        rows = (
+            Job.objects.filter(url__in=urls)
+            .values_list('url', 'content_hash', 'posted_at', 'id', Coalesce('checked_at', 'created_at'))
         )
-        return job
\ No newline at end of file
+        return {url: tuple(row) for url, *row in rows}
+
+    def is_unchanged(self, fields, previous):
+        """Nothing to rewrite: same content, or just the card of a stored job."""
+        return fields['refresh_only'] or fields['content_hash'] == previous[0]
+
+    def needs_refresh(self, fields, previous):
+        """Same content, but the source reports a new posting date."""
+        return fields['posted_at'] is not None and fields['posted_at'] != previous[1]
+
+    def needs_check(self, fields, previous):
+        """The whole posting was read again, and the stored check has run out."""
+        return (
+            bool(self.freshness_days) and not fields['refresh_only']
+            and previous[3] < timezone.now() - timedelta(days=self.freshness_days)
+        )
+
+    def purge_edge(self, inserted, refreshed_ids, updated_ids):
+        """
+        Purges the CDN copies the write made stale (jobs.cdn): new or re-dated
+        jobs may enter any list page and the sitemap, an edited job the pages showing it.
+        """
+        tags = {job_tag(pk) for pk in [*refreshed_ids, *updated_ids]}
+        if inserted or refreshed_ids:
+            tags |= {JOB_LIST_TAG, SITEMAP_TAG}
+        purge(tags)
+
+    def mark_checked(self, urls):
+        """Re-read, unchanged jobs: KnownJobMiddleware may skip their detail pages again."""
+        if urls:
+            Job.objects.filter(url__in=urls).update(checked_at=timezone.now())
+
+    def refresh_posted_at(self, batch):
+        """Metadata-only change: one narrow UPDATE posted_at per distinct date (usually just today)."""
+        urls_by_date = {}
+        for fields in batch:
+            urls_by_date.setdefault(fields['posted_at'], []).append(fields['url'])
+        for posted_at, urls in urls_by_date.items():
+            Job.objects.filter(url__in=urls).update(posted_at=posted_at)
+
+    def save_job(self, fields, analysis, exists):
+        """
+        Per-item path: the lookup in process_item already told us whether the
+        URL exists, so this is a single INSERT or UPDATE. True if it inserted.
+        """
+        defaults = self.build_defaults(fields, analysis)
+        if exists and Job.objects.filter(url=fields['url']).update(**defaults):
+            return False
+        try:
+            with transaction.atomic():
+                Job.objects.create(url=fields['url'], **defaults)
+            return True
+        except IntegrityError:
+            # Another crawl inserted the same URL since our lookup
+            Job.objects.filter(url=fields['url']).update(**defaults)
+            return False
+
+    def save_batch(self, batch, analyses):
+        """
+        Bulk path: one INSERT ... ON CONFLICT (url) DO UPDATE for the whole batch.
+        Returns the URLs that could not be written.
+
+        Rows go in URL order, so concurrent crawls upserting overlapping URLs lock
+        them in the same order instead of deadlocking. A failed batch (a deadlock
+        anyway, one row Postgres refuses) is retried once, then written row by
+        row: only the rows that still fail are lost, and they are logged.
+        """
+        if not batch:
+            return set()
+
+        rows = sorted(zip(batch, analyses), key=lambda row: row[0]['url'])
+        for attempt in (1, 2):
+            try:
+                with transaction.atomic():
+                    Job.objects.bulk_create(
+                        [Job(url=fields['url'], **self.build_defaults(fields, analysis)) for fields, analysis in rows],
+                        update_conflicts=True,
+                        unique_fields=['url'],
+                        update_fields=UPSERT_FIELDS,
+                    )
+                return set()
+            except (DatabaseError, ValueError) as e:
+                logger.warning(f"⚠️ Upsert of {len(rows)} jobs failed (attempt {attempt}): {e}")
+
+        failed = set()
+        for fields, analysis in rows:
+            try:
+                with transaction.atomic():
+                    self.save_job(fields, analysis, exists=True)
+            except (DatabaseError, ValueError) as e:
+                failed.add(fields['url'])
+                logger.error(f"❌ Job {fields['url']} not saved: {e}")
+        return failed
@@ -0,0 +1,127 @@
+"""
+Runs many crawls in ONE process: one CrawlerProcess, one reactor, one django.setup().
+
+    python -m scraper_service.runner crawls.json results.json
+
+crawls.json is a list of crawls to run side by side:
+    {"name": "LI:Python-Remote", "spider": "linkedin",
+     "kwargs": {"keyword": "Python", "location": "Remote"}, "timeout": 120}
+
+`timeout` is the crawl's own time budget (CLOSESPIDER_TIMEOUT): the spider is
+closed gracefully when it runs out, and whatever it scraped is kept.
+Spiders listed in CONCURRENT_CRAWLS_PER_SPIDER only run that many crawls at
+once, the rest wait for a free slot.
+
+results.json receives one result per crawl, in the same order:
+    {"name": ..., "spider": ..., "items": 118, "errors": 0, "inserted": 40,
+     "updated": 3, "refreshed": 60, "unchanged": 15, "finish_reason": "finished",
+     "duration": 95.2, "error": null}
+"""
+import json
+import logging
+import sys
+import time
+
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+from twisted.internet.defer import DeferredList, DeferredSemaphore, succeed
+
+logger = logging.getLogger(__name__)
+
+
+def crawl_stats(crawler):
+    if crawler is None:  # The crawler could not even be created
+        return {}
+    try:
+        return crawler.stats.get_stats()
+    except RuntimeError:  # The crawl failed before it started
+        return {}
+
+
+def crawl_result(crawl, crawler, started, error=None):
+    stats = crawl_stats(crawler)
+    return {
+        'name': crawl['name'],
+        'spider': crawl['spider'],
+        'items': stats.get('item_scraped_count', 0),
+        'errors': stats.get('log_count/ERROR', 0),
+        'inserted': stats.get('pipeline/jobs_inserted', 0),
+        'updated': stats.get('pipeline/jobs_updated', 0),
+        'refreshed': stats.get('pipeline/jobs_refreshed', 0),
+        'unchanged': stats.get('pipeline/jobs_unchanged', 0),
+        'finish_reason': stats.get('finish_reason', 'error' if error else None),
+        'duration': round(time.monotonic() - started, 1),
+        'error': error,
+    }
+
+
+def run_crawls(crawls, settings=None):
+    """Runs every crawl concurrently in this process and returns their results (blocking)."""
+    settings = settings or get_project_settings()
+    process = CrawlerProcess(settings)
+    slots = {
+        spider: DeferredSemaphore(limit)
+        for spider, limit in settings.getdict('CONCURRENT_CRAWLS_PER_SPIDER').items()
+    }
+    results = [None] * len(crawls)
+
+    def start(index, crawl):
+        started = time.monotonic()
+        crawler = None
+
+        def finished(_):
+            results[index] = crawl_result(crawl, crawler, started)
+            logger.info(f"✅ {crawl['name']} finished: {results[index]['items']} items "
+                        f"in {results[index]['duration']}s ({results[index]['finish_reason']})")
+
+        def failed(failure):
+            results[index] = crawl_result(crawl, crawler, started, error=failure.getErrorMessage())
+            logger.error(f"❌ {crawl['name']} failed: {failure.getErrorMessage()}")
+
+        try:
+            crawler = process.create_crawler(crawl['spider'])
+            if crawl.get('timeout'):
+                crawler.settings.set('CLOSESPIDER_TIMEOUT', crawl['timeout'], priority='cmdline')
+            logger.info(f"🚀 Starting {crawl['name']}")
+            crawling = process.crawl(crawler, **crawl.get('kwargs', {}))
+        except Exception as e:
+            # An unknown spider, bad kwargs...: this crawl fails, the others go on
+            results[index] = crawl_result(crawl, crawler, started, error=repr(e))
+            logger.error(f"❌ {crawl['name']} could not start: {e!r}")
+            return succeed(None)
+        return crawling.addCallbacks(finished, failed)
+
+    pending = []
+    for index, crawl in enumerate(crawls):
+        slot = slots.get(crawl['spider'])
+        pending.append(slot.run(start, index, crawl) if slot else start(index, crawl))
+
+    # Crawls waiting for a slot are not known to the process yet, so stop the
+    # reactor ourselves once every crawl is done instead of using process.join()
+    from twisted.internet import reactor
+    DeferredList(pending).addBoth(lambda _: reactor.stop())
+    process.start(stop_after_crawl=False)
+    # A crawl whose Deferred never fired (the reactor died under it) still gets a result
+    return [result or crawl_result(crawl, None, time.monotonic(), error="did not run")
+            for crawl, result in zip(crawls, results)]
+
+
+def main():
+    crawls_path, results_path = sys.argv[1:3]
+    with open(crawls_path, encoding='utf-8') as f:
+        crawls = json.load(f)
+
+    settings = get_project_settings()
+    # Keep the worker logs readable: one process now logs for every crawl
+    settings.set('LOG_LEVEL', 'INFO', priority='project')
+
+    started = time.monotonic()
+    results = run_crawls(crawls, settings)
+    logger.info(f"🏁 {len(crawls)} crawls done in {time.monotonic() - started:.0f}s")
+
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+
+
+if __name__ == '__main__':
+    main()
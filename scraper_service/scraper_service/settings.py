@@ -13,8 +13,34 @@ NEWSPIDER_MODULE = "scraper_service.spiders"
 
 # 2. Concurrency & Politeness
 ROBOTSTXT_OBEY = False
+# Per-domain profiles: public APIs and feeds go fast, scraped HTML boards stay polite.
+# The slot key is the request's hostname. The delay is also that domain's floor for
+# AdaptiveThrottle (see throttle.py), which only ever slows a domain down from it.
+DOWNLOAD_SLOTS = {
+    # Public APIs / feeds
+    "www.themuse.com": {"concurrency": 4, "delay": 0.25},
+    "remoteok.com": {"concurrency": 2, "delay": 1},
+    "weworkremotely.com": {"concurrency": 2, "delay": 1},
+    "www.python.org": {"concurrency": 2, "delay": 1},
+    # Scraped HTML behind anti-bot protection
+    "www.linkedin.com": {"concurrency": 1, "delay": 3},
+    "www.glassdoor.com": {"concurrency": 1, "delay": 3},
+    "www.indeed.com": {"concurrency": 1, "delay": 3},
+}
+# Any other domain: one request at a time, 3 seconds apart
+CONCURRENT_REQUESTS_PER_DOMAIN = 1
 DOWNLOAD_DELAY = 3
-CONCURRENT_REQUESTS = 1
+CONCURRENT_REQUESTS = 16
+
+# Latency feedback and 429/403/503 backoff per domain, honouring Retry-After
+THROTTLE_ENABLED = True
+THROTTLE_MAX_DELAY = 60
+THROTTLE_BACKOFF_HTTP_CODES = [429, 403, 503]
+THROTTLE_RECOVERY = 0.2  # Share of the gap to the latency target closed per response
+THROTTLE_FLOOR_STEP = 0.2  # Each backoff raises the domain's floor by 20% for the rest of the crawl
+EXTENSIONS = {
+    "scraper_service.throttle.AdaptiveThrottle": 500,
+}
 
 # 3. Output
 FEED_EXPORT_ENCODING = "utf-8"
@@ -31,9 +57,17 @@ DOWNLOADER_MIDDLEWARES = {
     # Disable RandomUserAgent (conflicts with impersonate)
     'scrapy_user_agents.middlewares.RandomUserAgentMiddleware': None,
 
+    # Drop detail requests for jobs we checked recently (see KNOWN_JOB_FRESHNESS_DAYS)
+    'scraper_service.middlewares.KnownJobMiddleware': 50,
+
+    # If-None-Match / If-Modified-Since for feeds (requests with meta['conditional'])
+    'scraper_service.middlewares.ConditionalFeedMiddleware': 560,
+
     # Enable Retry
     'scrapy.downloadermiddlewares.retry.RetryMiddleware': 550,
 }
+# Retry blocks too: the retry goes out after the throttle's backoff delay
+RETRY_HTTP_CODES = [500, 502, 503, 504, 522, 524, 408, 429, 403]
 
 # 6. Impersonate Settings
 DOWNLOAD_HANDLERS = {
@@ -45,4 +79,33 @@ TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 # 7. Pipelines
 ITEM_PIPELINES = {
     "scraper_service.pipelines.ScraperServicePipeline": 300,
-}
\ No newline at end of file
+}
+
+# Buffered upserts: jobs are written as one multi-row INSERT ... ON CONFLICT (url)
+# every JOB_UPSERT_BATCH_SIZE items or JOB_UPSERT_FLUSH_INTERVAL seconds.
+# Set JOB_UPSERT_BATCH_SIZE = 0 to go back to one update_or_create per item.
+JOB_UPSERT_BATCH_SIZE = 200
+JOB_UPSERT_FLUSH_INTERVAL = 10
+
+# Analysis stage: salary/skills/seniority extraction runs in a process pool of this many
+# workers, shared by every crawl of the process, so long HTML descriptions don't hold the
+# GIL of the reactor that 20 bulk crawls share. 0 = analyse in a worker thread instead.
+ANALYSIS_WORKERS = 2
+# Jobs allowed to wait in the pool at once; further items block until a slot frees up.
+ANALYSIS_MAX_PENDING = 8
+
+# Bulk runner (scraper_service.runner): every crawl of a bulk run shares one process.
+# Spiders listed here run at most this many crawls at once; the rest wait for a slot.
+# LinkedIn blocks an IP that opens 15 searches at the same time.
+CONCURRENT_CRAWLS_PER_SPIDER = {
+    "linkedin": 3,
+}
+
+# Incremental crawls: LinkedIn checks each results page against the jobs we already
+# have (one query per page) and stops paginating after this many pages in a row
+# without a new job. 0 = always crawl up to MAX_PAGES.
+INCREMENTAL_STALE_PAGES = 2
+
+# Detail pages (LinkedIn, Glassdoor, Indeed) of jobs checked (read in full) in the last N days
+# are not downloaded again: their card only refreshes the posting date. 0 = always fetch them.
+KNOWN_JOB_FRESHNESS_DAYS = 7
@@ -3,6 +3,7 @@ import json
 import re
 from datetime import datetime
 from ..items import JobItem
+from ..middlewares import refresh_known_job
 from ..utils import parse_relative_date
 
 
@@ -81,11 +82,17 @@ class GlassdoorSpider(scrapy.Spider):
 
             if url:
                 url = response.urljoin(url)
+                # What the card tells us, in case KnownJobMiddleware skips the detail page
+                card = JobItem(url=url, source="Glassdoor",
+                               posted_at=parse_relative_date(date_text) if date_text else datetime.now().date())
                 yield scrapy.Request(
                     url,
                     callback=self.parse_detail,
+                    errback=refresh_known_job,
                     meta={
                         'listing_url': url,
+                        'job_url': url,  # Skipped by KnownJobMiddleware if checked recently
+                        'item': card,
                         'card_date_text': date_text,
                         'impersonate': 'safari15_5'
                     }
@@ -2,6 +2,7 @@ import scrapy
 import re
 from urllib.parse import urlencode
 from ..items import JobItem
+from ..middlewares import refresh_known_job
 from datetime import datetime
 
 
@@ -60,10 +61,13 @@ class IndeedSpider(scrapy.Spider):
             if jk:
                 # Go to the CLEAN desktop view for details (easier to parse)
                 job_url = f"https://www.indeed.com/viewjob?jk={jk}"
+                # Listed today: the card alone refreshes a known job whose detail page is skipped
+                card = JobItem(url=job_url, source="Indeed", posted_at=datetime.now().date())
                 yield scrapy.Request(
                     job_url,
                     callback=self.parse_detail,
-                    meta={'impersonate': 'chrome100'}
+                    errback=refresh_known_job,
+                    meta={'listing_url': job_url, 'job_url': job_url, 'item': card, 'impersonate': 'chrome100'}
                 )
 
     def parse_detail(self, response):
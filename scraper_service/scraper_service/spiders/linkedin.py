@@ -1,6 +1,9 @@
 import scrapy
+from asgiref.sync import sync_to_async
 from ..utils import parse_relative_date
 from ..items import JobItem
+from ..known_jobs import known_urls
+from ..middlewares import refresh_known_job
 
 
 class LinkedInSpider(scrapy.Spider):
@@ -9,6 +12,11 @@ class LinkedInSpider(scrapy.Spider):
     # LinkedIn Guest API usually caps at 1000 results (40 pages * 25 jobs)
     MAX_PAGES = 40
 
+    @property
+    def stale_pages_limit(self):
+        """Incremental mode: stop after this many pages in a row with no new job. 0 = crawl every page."""
+        return self.settings.getint('INCREMENTAL_STALE_PAGES', 0)
+
     def start_requests(self):
         keyword = getattr(self, 'keyword', 'Python')
         location = getattr(self, 'location', 'Europe')
@@ -28,13 +36,14 @@ class LinkedInSpider(scrapy.Spider):
             }
         )
 
-    def parse_list(self, response):
+    async def parse_list(self, response):
         # 1. Parse the Job Cards
         jobs = response.css("li")
         job_count = len(jobs)
 
         self.logger.info(f"📄 Page {response.meta['page_num']} loaded. Found {job_count} jobs.")
 
+        cards = []
         for job in jobs:
             title = job.css("h3.base-search-card__title::text").get()
             company = job.css("h4.base-search-card__subtitle a::text").get()
@@ -63,37 +72,31 @@ class LinkedInSpider(scrapy.Spider):
             item['salary_min'] = None
             item['salary_max'] = None
             item['currency'] = None
+            cards.append((item, raw_url))
 
-            # --- Extract Description ---
-            try:
-                # URL structure: .../view/JOB_ID/...
-                if "view/" in raw_url:
-                    slug = raw_url.split("view/")[1].split("/")[0].split("?")[0]
-                    # Sometimes slug is "123456" or "python-dev-123456"
-                    job_id = slug.split('-')[-1]
-                else:
-                    job_id = None
-
-                if job_id and job_id.isdigit():
-                    detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-
-                    # Pass the item to the detail parser
-                    yield scrapy.Request(
-                        url=detail_url,
-                        callback=self.parse_detail,
-                        meta={'item': item, 'impersonate': 'chrome110'}
-                    )
-                else:
-                    item['description'] = ""
-                    yield item
-
-            except (IndexError, ValueError):
-                item['description'] = ""
-                yield item
+        # --- Incremental Check: ONE query for the whole page ---
+        new_count = len(cards)
+        if self.stale_pages_limit and cards:
+            known = await sync_to_async(known_urls)([item['url'] for item, _ in cards])
+            new_count = len(cards) - len(known)
+            self.crawler.stats.inc_value('incremental/new_urls', new_count)
+            self.crawler.stats.inc_value('incremental/known_urls', len(known))
+
+        for item, raw_url in cards:
+            for request_or_item in self.follow_card(item, raw_url):
+                yield request_or_item
 
         # 2. Pagination Logic (The "Infinite" Scroll)
         current_page = response.meta['page_num']
 
+        # Results come newest first: once a few pages in a row hold only jobs
+        # we already have, the rest of the search is older still
+        stale_pages = response.meta.get('stale_pages', 0) + 1 if new_count == 0 else 0
+        if self.stale_pages_limit and stale_pages >= self.stale_pages_limit:
+            self.logger.info(f"⏹️ {stale_pages} pages without new jobs, stopping at page {current_page}.")
+            self.crawler.stats.set_value('incremental/stopped_at_page', current_page)
+            return
+
         # If we found jobs AND we haven't hit the limit, go to next page
         if job_count > 0 and current_page < self.MAX_PAGES:
             next_page = current_page + 1
@@ -110,10 +113,42 @@ class LinkedInSpider(scrapy.Spider):
                     'impersonate': 'chrome110',
                     'keyword': keyword,
                     'location': location,
-                    'page_num': next_page
+                    'page_num': next_page,
+                    'stale_pages': stale_pages,
                 }
             )
 
+    def follow_card(self, item, raw_url):
+        """Requests the card's detail page for the description, or yields the item as-is without one."""
+        # --- Extract Description ---
+        try:
+            # URL structure: .../view/JOB_ID/...
+            if "view/" in raw_url:
+                slug = raw_url.split("view/")[1].split("/")[0].split("?")[0]
+                # Sometimes slug is "123456" or "python-dev-123456"
+                job_id = slug.split('-')[-1]
+            else:
+                job_id = None
+
+            if job_id and job_id.isdigit():
+                detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+
+                # Pass the item to the detail parser
+                # A known job's detail page is skipped, its card still refreshes the stored job
+                yield scrapy.Request(
+                    url=detail_url,
+                    callback=self.parse_detail,
+                    errback=refresh_known_job,
+                    meta={'item': item, 'job_url': item['url'], 'impersonate': 'chrome110'}
+                )
+            else:
+                item['description'] = ""
+                yield item
+
+        except (IndexError, ValueError):
+            item['description'] = ""
+            yield item
+
     def parse_detail(self, response):
         item = response.meta['item']
 
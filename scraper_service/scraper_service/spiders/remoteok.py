@@ -11,7 +11,7 @@ class RemoteOKSpider(scrapy.Spider):
         yield scrapy.Request(
             "https://remoteok.com/rss",
             callback=self.parse,
-            meta={'impersonate': 'chrome110'}
+            meta={'impersonate': 'chrome110', 'conditional': True}
         )
 
     def parse(self, response):
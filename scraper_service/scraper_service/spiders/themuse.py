@@ -16,7 +16,7 @@ class TheMuseSpider(scrapy.Spider):
         yield scrapy.Request(
             url,
             callback=self.parse,
-            meta={'impersonate': 'chrome110'}
+            meta={'impersonate': 'chrome110', 'conditional': True}
         )
 
     def parse(self, response):
@@ -62,5 +62,5 @@ class TheMuseSpider(scrapy.Spider):
             yield scrapy.Request(
                 next_url,
                 callback=self.parse,
-                meta={'impersonate': 'chrome110'}
+                meta={'impersonate': 'chrome110', 'conditional': True}
             )
\ No newline at end of file
@@ -12,7 +12,7 @@ class WWRSpider(scrapy.Spider):
         yield scrapy.Request(
             "https://weworkremotely.com/remote-jobs.rss",
             callback=self.parse,
-            meta={'impersonate': 'chrome110'}  # <--- THIS IS THE FIX
+            meta={'impersonate': 'chrome110', 'conditional': True}  # <--- THIS IS THE FIX
         )
 
     def parse(self, response):
@@ -0,0 +1,99 @@
+"""
+Per-domain adaptive throttling.
+
+Every domain starts from its DOWNLOAD_SLOTS profile (concurrency, delay);
+domains without one get CONCURRENT_REQUESTS_PER_DOMAIN and DOWNLOAD_DELAY.
+AdaptiveThrottle then tunes each domain's delay from its responses:
+
+- Latency feedback, like Scrapy's AutoThrottle: the delay moves toward
+  latency / concurrency, so a slow server gets fewer requests. It never goes
+  below the domain's profile delay (its politeness floor).
+- Backoff on THROTTLE_BACKOFF_HTTP_CODES (429, 403, 503): the delay doubles at
+  once, or jumps to the server's Retry-After if that is longer. The domain's
+  floor also rises by THROTTLE_FLOOR_STEP for the rest of the crawl, so the
+  delay settles just under the server's real limit instead of running into it
+  again and again. Between backoffs, each normal response closes
+  THROTTLE_RECOVERY of the gap to the latency target.
+
+The delay is capped at THROTTLE_MAX_DELAY.
+"""
+import logging
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+logger = logging.getLogger(__name__)
+
+
+def retry_after_seconds(response):
+    """Retry-After in seconds, or None. The HTTP-date form is rare on rate limits and ignored."""
+    value = response.headers.get('Retry-After')
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+
+class AdaptiveThrottle:
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool('THROTTLE_ENABLED'):
+            raise NotConfigured
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.profiles = settings.getdict('DOWNLOAD_SLOTS')
+        self.default_delay = settings.getfloat('DOWNLOAD_DELAY')
+        self.max_delay = settings.getfloat('THROTTLE_MAX_DELAY', 60.0)
+        self.recovery = settings.getfloat('THROTTLE_RECOVERY', 0.2)
+        self.floor_step = settings.getfloat('THROTTLE_FLOOR_STEP', 0.2)
+        self.backoff_codes = set(settings.getlist('THROTTLE_BACKOFF_HTTP_CODES', [429, 403, 503]))
+        self.floors = {}  # slot key -> floor learned from rate limiting
+        crawler.signals.connect(self.response_downloaded, signal=signals.response_downloaded)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def min_delay(self, key):
+        """The domain's profile delay, or the higher floor its rate limits taught us."""
+        profile_delay = float(self.profiles.get(key, {}).get('delay', self.default_delay))
+        return max(profile_delay, self.floors.get(key, 0.0))
+
+    def response_downloaded(self, response, request, spider):
+        key = request.meta.get('download_slot')
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is None:
+            return
+
+        old_delay = slot.delay
+        if response.status in self.backoff_codes:
+            slot.delay = self.backoff_delay(slot.delay, key, retry_after_seconds(response))
+            self.stats.inc_value(f'throttle/backoff/{response.status}')
+            logger.warning(f"🐢 {key} answered {response.status}: delay {old_delay:.2f}s -> {slot.delay:.2f}s")
+        else:
+            latency = request.meta.get('download_latency')
+            if latency is not None:
+                slot.delay = self.latency_delay(slot.delay, key, latency, slot.concurrency, response.status)
+        self.stats.max_value(f'throttle/max_delay/{key}', slot.delay)
+
+    def backoff_delay(self, delay, key, retry_after=None):
+        """Rate limited: double the delay, or wait as long as the server asked if that is longer."""
+        floor = self.min_delay(key)
+        self.floors[key] = min(max(floor * (1 + self.floor_step), 0.05), self.max_delay)
+        new_delay = max(delay * 2, floor or 1.0, retry_after or 0.0)
+        return min(new_delay, self.max_delay)
+
+    def latency_delay(self, delay, key, latency, concurrency, status=200):
+        """AutoThrottle's rule with a gentler speed-up, never below the domain's floor."""
+        # A server answering in `latency` seconds keeps `concurrency` requests
+        # busy if we send one every latency / concurrency seconds
+        target_delay = latency / max(concurrency, 1)
+        # Slow down at once, speed up gradually: after a backoff, jumping straight
+        # back to full speed just runs into the rate limit again
+        new_delay = max(target_delay, delay - (delay - target_delay) * self.recovery)
+        new_delay = min(max(self.min_delay(key), new_delay), self.max_delay)
+
+        # Error pages are small and fast: never let them lower the delay
+        if status != 200 and new_delay <= delay:
+            return delay
+        return new_delay
@@ -1,4 +1,6 @@
+import hashlib
 import re
+from bisect import bisect_left
 from datetime import date, timedelta
 from typing import List, Tuple, Optional, Set
 
@@ -19,17 +21,106 @@ for skill in TECH_KEYWORDS:
         pattern = r'\b' + re.escape(skill.lower()) + r'\b'
     SKILL_PATTERNS.append((skill, re.compile(pattern)))
 
+
+def _trie_regex(words) -> str:
+    """
+    Alternation of `words` shaped as a prefix trie, e.g. java(?:script)?|jira.
+    The regex engine then rejects a position after one or two characters
+    instead of trying every word in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # end-of-word marker
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return emit(trie)
+
+
+# Single-pass skill matching: a word-bounded skill can only match where its first
+# word ("python" for "Python", "react" for "React Native") appears as a whole word.
+# One scan for all first words finds every candidate, and only candidates are
+# confirmed with the skill's own pattern. Skills without a leading word character
+# or without word boundaries (C++, C#, .NET Core) keep their own scan.
+SKILLS_BY_FIRST_WORD = {}
+STANDALONE_SKILL_PATTERNS = []
+for skill, pattern in SKILL_PATTERNS:
+    first_word = re.match(r'\w+', skill.lower())
+    if skill in ["C++", "C#", ".NET"] or not first_word:
+        STANDALONE_SKILL_PATTERNS.append((skill, pattern))
+    else:
+        SKILLS_BY_FIRST_WORD.setdefault(first_word.group(), []).append((skill, pattern))
+
+SKILL_FIRST_WORD_REGEX = re.compile(r'\b(?:' + _trie_regex(SKILLS_BY_FIRST_WORD) + r')\b')
+
 NEGATION_REGEXES = [re.compile(p) for p in NEGATION_PATTERNS]
 
-# Seniority: Compile all patterns
-SENIORITY_PATTERNS = {
-    level: [re.compile(r'\b' + kw + r'\b') for kw in kws]
-    for level, kws in SENIORITY_MAP.items()
-}
+# Seniority: one alternation for every level, one named group per level (s0 = Lead,
+# s1 = Senior, ...). Levels are listed in priority order, so where keywords of two
+# levels match at the same position the higher level wins. The whole pattern is a
+# lookahead, so finditer reports every start position, even inside another match.
+# The leading character class lets most word starts fail before the alternation is tried.
+SENIORITY_LEVELS = list(SENIORITY_MAP)
+SENIORITY_RANKS = {f's{rank}': rank for rank in range(len(SENIORITY_LEVELS))}
+SENIORITY_FIRST_CHARS = ''.join(sorted({kw[0] for kws in SENIORITY_MAP.values() for kw in kws}))
+SENIORITY_REGEX = re.compile(r'\b(?=[' + SENIORITY_FIRST_CHARS + r'])(?=(?:' + '|'.join(
+    f'(?P<s{rank}>' + '|'.join(kws) + ')' for rank, kws in enumerate(SENIORITY_MAP.values())
+) + r')\b)')
+
+# Exclude phrases indicating a supervisor, not the role itself
+SENIORITY_EXCLUSION_REGEX = re.compile(r'(report(ing|s)?\s+to|supervised\s+by)\s+[\w\s]*$')
 
 # Salary Ignore Terms
 SALARY_IGNORE_REGEX = re.compile(r'\b(' + '|'.join(SALARY_IGNORE_TERMS) + r')\b')
 
+# Salary figures: "80-100k", "$80,000 - $120,000" (ranges) and "$120k", "5000" (single numbers)
+SALARY_NUMBER = r'\d{1,3}(?:[,\.]\d{3})*(?:\.\d+)?'
+SALARY_RANGE_REGEX = re.compile(
+    r'([$£€]?\s*' + SALARY_NUMBER + r')\s*([kK])?\s*[-–to]+\s*([$£€]?\s*' + SALARY_NUMBER + r')\s*([kK])?')
+SALARY_SINGLE_REGEX = re.compile(r'([$£€])?\s*(' + SALARY_NUMBER + r')\s*([kK])?')
+SALARY_SYMBOLS_REGEX = re.compile(r'[$£€\s]')
+
+# Money tokenizer: one scan over every digit. A range can only start on a digit
+# whose number ends right before "k - ", " to ", "–$" etc. and a second number;
+# those digits are tagged with the empty `range` group.
+SALARY_DIGIT_REGEX = re.compile(r'\d(?:(?=[\d,\.]*(?<=\d)\s*[kK]?\s*[-–to]+\s*[$£€]?\s*\d)(?P<range>))?')
+
+# The hints are plain substrings (r"p\.m\." included), so escape them
+SALARY_HINTS_REGEX = re.compile('|'.join(re.escape(h) for h in SALARY_HINTS))
+
+# Period suffixes: one optional lookahead per period, so a single match reports
+# every period found in the window. Monthly wins over hourly over daily;
+# yearly suffixes keep the default multiplier of 1 and need no lookup.
+PERIOD_MULTIPLIERS = {'monthly': 12, 'hourly': 2080, 'daily': 260}  # 40h * 52w, 5d * 52w
+SALARY_PERIOD_REGEX = re.compile(''.join(
+    r'(?:(?=[\s\S]*?(?P<' + period + '>' + '|'.join(SALARY_MULTIPLIERS[period]) + ')))?'
+    for period in PERIOD_MULTIPLIERS
+))
+
+
+def find_negations(text_lower: str) -> Tuple[List[int], List[int]]:
+    """
+    Every occurrence of every negation phrase, as parallel (starts, ends)
+    lists sorted by start. Each search restarts one character after the
+    previous hit so self-overlapping phrases ("don't neeDon't need") are not missed.
+    """
+    spans = []
+    for neg in NEGATION_REGEXES:
+        match = neg.search(text_lower)
+        while match:
+            spans.append(match.span())
+            match = neg.search(text_lower, match.start() + 1)
+    spans.sort()
+    return [start for start, _ in spans], [end for _, end in spans]
+
 
 def extract_skills(text: str) -> List[str]:
     """
@@ -41,27 +132,66 @@ def extract_skills(text: str) -> List[str]:
 
     text_lower = text.lower()
     found_skills = set()
-
-    for skill_name, pattern in SKILL_PATTERNS:
-        # Fast search
+    negations = None  # built on the first skill hit, then shared by all of them
+
+    def is_negated(start, end):
+        nonlocal negations
+        if negations is None:
+            negations = find_negations(text_lower)
+        neg_starts, neg_ends = negations
+
+        # Context Window: a negation phrase lying fully within 40 chars before/after
+        ctx_start = max(0, start - 40)
+        ctx_end = min(len(text_lower), end + 40)
+        index = bisect_left(neg_starts, ctx_start)
+        while index < len(neg_starts) and neg_starts[index] < ctx_end:
+            if neg_ends[index] <= ctx_end:
+                return True
+            index += 1
+        return False
+
+    for skill_name, pattern in STANDALONE_SKILL_PATTERNS:
         for match in pattern.finditer(text_lower):
-            start, end = match.span()
-
-            # Context Window: Check 40 chars before/after for negation
-            ctx_start = max(0, start - 40)
-            ctx_end = min(len(text_lower), end + 40)
-            context = text_lower[ctx_start:ctx_end]
-
-            # Check negation
-            if not any(neg.search(context) for neg in NEGATION_REGEXES):
+            if not is_negated(*match.span()):
                 found_skills.add(skill_name)
                 # Once found valid, break loop for this specific skill
-                # (no need to find the same skill twice)
                 break
 
+    # One pass over the text for every other skill. Skill patterns are whole
+    # words, so two matches of the same skill can never overlap and checking
+    # every candidate is the same as the per-skill finditer it replaces.
+    for hit in SKILL_FIRST_WORD_REGEX.finditer(text_lower):
+        for skill_name, pattern in SKILLS_BY_FIRST_WORD[hit.group()]:
+            if skill_name in found_skills:
+                continue  # no need to find the same skill twice
+            match = pattern.match(text_lower, hit.start())
+            if match and not is_negated(*match.span()):
+                found_skills.add(skill_name)
+
     return list(found_skills)
 
 
+def seniority_rank(text_lower: str, check_context: bool = False) -> int:
+    """
+    Rank of the highest level mentioned in `text_lower` (0 = Lead), or
+    len(SENIORITY_LEVELS) when there is none. With `check_context`, mentions
+    preceded by "reporting to" / "supervised by" in the 25 chars before are skipped.
+    """
+    best = len(SENIORITY_LEVELS)
+    for match in SENIORITY_REGEX.finditer(text_lower):
+        rank = SENIORITY_RANKS[match.lastgroup]
+        if rank >= best:
+            continue
+        if check_context:
+            start = match.start()
+            if SENIORITY_EXCLUSION_REGEX.search(text_lower[max(0, start - 25):start]):
+                continue
+        best = rank
+        if best == 0:
+            break  # Nothing outranks Lead
+    return best
+
+
 def extract_seniority(title: str, description: str) -> str:
     """
     Determines seniority. Title has higher priority than description.
@@ -71,28 +201,72 @@ def extract_seniority(title: str, description: str) -> str:
     text_desc = description.lower() if description else ""
 
     # 1. Title Scan (High Confidence)
-    for level, patterns in SENIORITY_PATTERNS.items():
-        for pattern in patterns:
-            if pattern.search(text_title):
-                return level
+    rank = seniority_rank(text_title)
 
     # 2. Description Scan (Lower Confidence + Context Check)
-    # Exclude phrases indicating a supervisor, not the role itself
-    exclusion_pattern = re.compile(r'(report(ing|s)?\s+to|supervised\s+by)\s+[\w\s]*$')
+    if rank == len(SENIORITY_LEVELS):
+        rank = seniority_rank(text_desc, check_context=True)
 
-    for level, patterns in SENIORITY_PATTERNS.items():
-        for pattern in patterns:
-            # Find all matches in description
-            for match in pattern.finditer(text_desc):
-                # Check context 25 chars before the match
-                start = match.start()
-                pre_context = text_desc[max(0, start - 25):start]
+    if rank < len(SENIORITY_LEVELS):
+        return SENIORITY_LEVELS[rank]
+    return "Not Specified"
 
-                # Only accept if NOT preceded by "reporting to"
-                if not exclusion_pattern.search(pre_context):
-                    return level
 
-    return "Not Specified"
+def tokenize_money(text_lower: str) -> Tuple[List[int], List[int]]:
+    """Positions of every digit, and of the digits a salary range can start on."""
+    digits, range_digits = [], []
+    for m in SALARY_DIGIT_REGEX.finditer(text_lower):
+        digits.append(m.start())
+        if m.group('range') is not None:
+            range_digits.append(m.start())
+    return digits, range_digits
+
+
+def find_money_spans(pattern, text_lower: str, anchors: List[int]):
+    """
+    Same matches as pattern.finditer(text_lower) for the salary patterns, but
+    only tried where a match can start: on an anchor digit, or on the currency
+    symbol / whitespace right before it. finditer itself would retry the
+    optional currency/whitespace prefix at every character of the text.
+    """
+    pos = 0
+    for digit in anchors:
+        if digit < pos:
+            continue
+        start = digit
+        while start > pos and text_lower[start - 1].isspace():
+            start -= 1
+        if start > pos and text_lower[start - 1] in '$£€':
+            start -= 1
+        for candidate in range(start, digit + 1):
+            m = pattern.match(text_lower, candidate)
+            if m:
+                yield m
+                pos = m.end()
+                break
+        else:
+            pos = digit + 1
+
+
+def salary_period_multiplier(text_lower: str, pos: int) -> int:
+    """Annualizing factor from the 40 chars after a salary figure ("per month", "/hr", ...)."""
+    periods = SALARY_PERIOD_REGEX.match(text_lower, pos, pos + 40)
+    for period, multiplier in PERIOD_MULTIPLIERS.items():
+        if periods.group(period):
+            return multiplier
+    return 1  # Default to Yearly
+
+
+def parse_salary_number(num_str: str, suffix_k: bool) -> Optional[int]:
+    # Remove commas (100,000 -> 100000), keep dots (1.5 -> 1.5)
+    clean = num_str.replace(',', '')
+    try:
+        val = float(clean)
+        if suffix_k:
+            val *= 1000
+        return int(val)
+    except ValueError:
+        return None
 
 
 def parse_salary(text: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
@@ -121,42 +295,14 @@ def parse_salary(text: str) -> Tuple[Optional[float], Optional[float], Optional[
     elif 'cad' in text_lower:
         currency = "CAD"
 
-    # 2. Helper: Determine multiplier (Yearly vs Monthly vs Hourly)
-    def get_period_multiplier(match_end_pos):
-        # Look ahead 40 chars for "per month", "/hr", etc.
-        suffix = text_lower[match_end_pos:match_end_pos + 40]
-        for period, patterns in SALARY_MULTIPLIERS.items():
-            for pattern in patterns:
-                if re.search(pattern, suffix):
-                    if period == 'monthly':
-                        return 12
-                    elif period == 'hourly':
-                        return 2080  # 40h * 52w
-                    elif period == 'daily':
-                        return 260  # 5d * 52w
-        return 1  # Default to Yearly
-
-    # 3. Helper: Parse number string
-    def parse_num(num_str, suffix_k):
-        # Remove commas (100,000 -> 100000), keep dots (1.5 -> 1.5)
-        clean = num_str.replace(',', '')
-        try:
-            val = float(clean)
-            if suffix_k:
-                val *= 1000
-            return int(val)
-        except ValueError:
-            return None
-
+    # 2. Tokenize: find every digit (and every possible range start) in one scan
+    digits, range_digits = tokenize_money(text_lower)
     candidates = []
 
     # --- PATTERN A: Ranges (e.g. "80-100k", "80k - 100k", "$80,000 - $120,000") ---
-    range_pattern = re.compile(
-        r'([$£€]?\s*\d{1,3}(?:[,\.]\d{3})*(?:\.\d+)?)\s*([kK])?\s*[-–to]+\s*([$£€]?\s*\d{1,3}(?:[,\.]\d{3})*(?:\.\d+)?)\s*([kK])?')
-
-    for m in range_pattern.finditer(text_lower):
-        raw_n1 = re.sub(r'[$£€\s]', '', m.group(1))  # Clean symbols
-        raw_n2 = re.sub(r'[$£€\s]', '', m.group(3))
+    for m in find_money_spans(SALARY_RANGE_REGEX, text_lower, range_digits):
+        raw_n1 = SALARY_SYMBOLS_REGEX.sub('', m.group(1))  # Clean symbols
+        raw_n2 = SALARY_SYMBOLS_REGEX.sub('', m.group(3))
 
         k1 = bool(m.group(2))  # First K?
         k2 = bool(m.group(4))  # Second K?
@@ -164,40 +310,36 @@ def parse_salary(text: str) -> Tuple[Optional[float], Optional[float], Optional[
         # Logic: If "80-100k", apply 'k' to both
         if k2 and not k1: k1 = True
 
-        v1 = parse_num(raw_n1, k1)
-        v2 = parse_num(raw_n2, k2)
+        v1 = parse_salary_number(raw_n1, k1)
+        v2 = parse_salary_number(raw_n2, k2)
 
         if v1 and v2:
-            mult = get_period_multiplier(m.end())
+            mult = salary_period_multiplier(text_lower, m.end())
             candidates.append((v1 * mult, v2 * mult))
 
     # --- PATTERN B: Single Numbers (e.g. "$120k", "5000 / month") ---
     # Only if A didn't find anything or to supplement
-    single_pattern = re.compile(r'([$£€])?\s*(\d{1,3}(?:[,\.]\d{3})*(?:\.\d+)?)\s*([kK])?')
-
-    for m in single_pattern.finditer(text_lower):
+    for m in find_money_spans(SALARY_SINGLE_REGEX, text_lower, digits):
         start, end = m.span()
 
-        # Ignore if followed by invalid terms (e.g. "250,000 users")
-        suffix_window = text_lower[end:end + 20]
-        if SALARY_IGNORE_REGEX.search(suffix_window):
+        # Ignore if followed by invalid terms (e.g. "250,000 users").
+        # Sliced on purpose: the window start counts as a word boundary ("100users")
+        if SALARY_IGNORE_REGEX.search(text_lower[end:end + 20]):
             continue
 
-        raw_val = m.group(2)
         has_k = bool(m.group(3))
         has_curr = bool(m.group(1))
 
         # Valid salary must have a Currency Symbol OR 'k' OR 'salary' keyword nearby
-        window = text_lower[max(0, start - 30):min(len(text_lower), end + 30)]
-        is_valid_context = any(h in window for h in SALARY_HINTS) or has_curr or has_k
+        is_valid_context = has_curr or has_k or SALARY_HINTS_REGEX.search(text_lower, max(0, start - 30), end + 30)
 
         if is_valid_context:
-            val = parse_num(raw_val, has_k)
+            val = parse_salary_number(m.group(2), has_k)
             if val:
-                mult = get_period_multiplier(end)
+                mult = salary_period_multiplier(text_lower, end)
                 candidates.append((val * mult, val * mult))
 
-    # 4. Selection Logic
+    # 3. Selection Logic
     if not candidates:
         return None, None, None
 
@@ -215,6 +357,23 @@ def parse_salary(text: str) -> Tuple[Optional[float], Optional[float], Optional[
     return best[0], best[1], currency
 
 
+def analyze_job(title: str, company: str, description: str) -> dict:
+    """
+    Runs the full text analysis (Salary, Skills, Seniority) for one job.
+    Module-level and free of Django so the pipeline can ship it to a process pool.
+    """
+    text_to_scan = f"{title} {company} {description}"
+    min_sal, max_sal, curr = parse_salary(text_to_scan)
+
+    return {
+        'salary_min': min_sal,
+        'salary_max': max_sal,
+        'currency': curr,
+        'skills': extract_skills(text_to_scan),
+        'seniority': extract_seniority(title, description),
+    }
+
+
 def parse_relative_date(text: str) -> date:
     """
     Parses '3 days ago', '1 week ago', 'just now'.
@@ -241,4 +400,15 @@ def parse_relative_date(text: str) -> date:
         if 'month' in unit:
             return today - timedelta(days=num * 30)
 
-    return today
\ No newline at end of file
+    return today
+
+
+def content_fingerprint(title: str, company: str, location: str, description: str) -> str:
+    """
+    SHA-256 of the job content with whitespace collapsed. Two scrapes of the
+    same posting get the same fingerprint, so the pipeline can skip analysis
+    and the database write when nothing changed. Case is kept: a recased
+    title or a "usd" corrected to "USD" is a change worth writing.
+    """
+    parts = (' '.join((value or '').split()) for value in (title, company, location, description))
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()